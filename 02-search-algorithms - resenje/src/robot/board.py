@@ -1,3 +1,19 @@
+# moguci smerovi kretanja (desno, levo, dole, gore)
+ACTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+# dijagonalni smerovi kretanja
+DIAGONAL_ACTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+# dijagonalni, pa horizontalni i vertikalni smerovi kretanja
+ALL_ACTIONS = DIAGONAL_ACTIONS + ACTIONS
+# akcije sahovskog konja
+KNIGHT_ACTIONS = ((1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1))
+
+# sirina okvira od zidova oko prevedene table - dovoljna za najduzi potez (skok konja)
+PADDING = 2
+
+# elementi kojih na tabli ima mnogo - za njih se ne vodi indeks pozicija
+DENSE_ELEMENTS = ('.', 'w')
+
+
 class Board:
     """
     Klasa koja implementira strukturu table.
@@ -23,6 +39,12 @@ class Board:
         self.data = [['.'] * cols for _ in range(rows)]
         self.text = [[''] * cols for _ in range(rows)]
         self.teleport = False
+        # prevedena tabla (videti compile), pravi se po potrebi
+        self.passable = None
+        self.width = 0
+        self.neighbor_tables = dict()
+        # indeks pozicija elemenata (kod elementa -> set pozicija), pravi se po potrebi
+        self.positions = None
 
     def load_from_file(self, file_path):
         """
@@ -36,6 +58,13 @@ class Board:
             self.data.append(list(row))
             row = board_f.readline().strip('\n')
         board_f.close()
+        # dimenzije table odredjuje sadrzaj fajla
+        if self.data and (len(self.data) != self.rows or len(self.data[0]) != self.cols):
+            self.rows = len(self.data)
+            self.cols = len(self.data[0])
+            self.text = [[''] * self.cols for _ in range(self.rows)]
+        self.passable = None
+        self.positions = None
 
     def save_to_file(self, file_path):
         """
@@ -58,7 +87,7 @@ class Board:
             idx = self.elems.index(self.data[row][col])
             idx += 1
             idx %= len(self.elems)
-            self.data[row][col] = self.elems[idx]
+            self.set_cell(row, col, self.elems[idx])
 
     def switch_cell_backwards(self, row, col):
         """
@@ -71,7 +100,25 @@ class Board:
             idx -= 1
             if idx < 0:
                 idx = len(self.elems) - 1
-            self.data[row][col] = self.elems[idx]
+            self.set_cell(row, col, self.elems[idx])
+
+    def set_cell(self, row, col, element):
+        """
+        Upis elementa u celiju. Sve izmene sadrzaja table treba da idu preko ove metode,
+        kako bi indeks pozicija i prevedena tabla ostali azurni.
+        :param row: red celije.
+        :param col: kolona celije.
+        :param element: kod elementa.
+        """
+        old_element = self.data[row][col]
+        if old_element == 'w' or element == 'w':
+            self.passable = None
+        if self.positions is not None:
+            if old_element in self.positions:
+                self.positions[old_element].discard((row, col))
+            if element not in DENSE_ELEMENTS:
+                self.positions.setdefault(element, set()).add((row, col))
+        self.data[row][col] = element
 
     def clear(self):
         """
@@ -81,13 +128,35 @@ class Board:
             for col in range(self.cols):
                 self.data[row][col] = '.'
                 self.text[row][col] = ''
+        self.passable = None
+        self.positions = dict()
+
+    def get_positions(self, element):
+        """
+        Set pozicija elementa iz indeksa pozicija. Indeks se pravi jednim prolaskom kroz tablu,
+        pri prvom pozivu, a posle se samo azurira u set_cell.
+        :param element: kod elementa (koji nije u DENSE_ELEMENTS).
+        :returns: set(tuple(int, int))
+        """
+        if self.positions is None:
+            self.positions = dict()
+            for row in range(self.rows):
+                for col in range(self.cols):
+                    cell = self.data[row][col]
+                    if cell not in DENSE_ELEMENTS:
+                        self.positions.setdefault(cell, set()).add((row, col))
+        return self.positions.get(element, set())
 
     def find_position(self, element):
         """
         Pronalazenje specificnog elementa unutar table.
+        Ako ih ima vise, vraca se prvi (red po red).
         :param element: kod elementa.
         :returns: tuple(int, int)
         """
+        if element not in DENSE_ELEMENTS:
+            positions = self.get_positions(element)
+            return min(positions) if positions else (None, None)
         for row in range(self.rows):
             for col in range(self.cols):
                 if self.data[row][col] == element:
@@ -100,6 +169,8 @@ class Board:
         :param element: kod elementa.
         :returns: list(tuple(int, int))
         """
+        if element not in DENSE_ELEMENTS:
+            return sorted(self.get_positions(element))
         positions = []
         for row in range(self.rows):
             for col in range(self.cols):
@@ -115,23 +186,79 @@ class Board:
             self.teleport = False
             teleport_position = self.find_position('y')
             if (teleport_position[0] != None):
-                self.data[position[0]][position[1]] = '.'
-                self.data[teleport_position[0]][teleport_position[1]] = 'r'
+                self.set_cell(position[0], position[1], '.')
+                self.set_cell(teleport_position[0], teleport_position[1], 'r')
                 return position[0], position[1], teleport_position[0], teleport_position[1]
         if all([p is not None for p in position]):
             d_row, d_col = Board.get_direction_keyboard(direction)
             new_row = position[0] + d_row
             new_col = position[1] + d_col
             if 0 <= new_row < self.rows and 0 <= new_col < self.cols and self.data[new_row][new_col] != 'w':
-                self.data[position[0]][position[1]] = '.'
+                self.set_cell(position[0], position[1], '.')
                 new_position = new_row, new_col
                 if self.data[new_position[0]][new_position[1]] == 'y':
                     self.teleport = True
-                self.data[new_position[0]][new_position[1]] = 'r'
+                self.set_cell(new_position[0], new_position[1], 'r')
         
                 
         return position[0], position[1], new_position[0], new_position[1]
     
+    def get_cell_index(self, row, col):
+        """
+        Redni broj celije u tabli (red po red).
+        :param row: red celije.
+        :param col: kolona celije.
+        :returns: int
+        """
+        return row * self.cols + col
+
+    def get_index_bits(self):
+        """
+        Broj bitova potreban za redni broj bilo koje celije table.
+        Iznad ovih bitova stanja mogu pakovati svoje dodatne informacije.
+        :returns: int
+        """
+        return (self.rows * self.cols).bit_length()
+
+    def compile(self):
+        """
+        Prevodjenje table u niz prohodnosti (bytearray) sa okvirom od zidova oko table.
+        Celija (row, col) se nalazi na indeksu (row + PADDING) * width + col + PADDING, pa se sused
+        dobija samo dodavanjem pomeraja akcije, bez provere granica table.
+        Tabele suseda se prave iznova nakon svakog prevodjenja.
+        """
+        self.width = self.cols + 2 * PADDING
+        self.passable = bytearray(self.width * (self.rows + 2 * PADDING))
+        for row in range(self.rows):
+            start = (row + PADDING) * self.width + PADDING
+            self.passable[start:start + self.cols] = bytes(cell != 'w' for cell in self.data[row])
+        self.neighbor_tables = dict()
+
+    def get_legal_moves(self, position, actions):
+        """
+        Legalni potezi iz zadate pozicije - potezi koji ne izlaze van table i ne udaraju u zid.
+        Potezi se racunaju jednom po celiji i skupu akcija i pamte u tabeli suseda.
+        :param position: (int, int) - pozicija.
+        :param actions: tuple - skup akcija (ACTIONS, ALL_ACTIONS, KNIGHT_ACTIONS...).
+        :returns: tuple(((int, int), (int, int))) - nove pozicije i akcije koje do njih vode.
+        """
+        if self.passable is None:
+            self.compile()
+        table = self.neighbor_tables.get(actions)
+        if table is None:
+            # pomeraji akcija u prevedenoj tabli i prazna tabela suseda (popunjava se po potrebi)
+            offsets = tuple((action, action[0] * self.width + action[1]) for action in actions)
+            table = self.neighbor_tables[actions] = (offsets, [None] * (self.rows * self.cols))
+        offsets, moves = table
+        row, col = position
+        index = row * self.cols + col
+        if moves[index] is None:
+            start = (row + PADDING) * self.width + col + PADDING
+            passable = self.passable
+            moves[index] = tuple(((row + action[0], col + action[1]), action)
+                                 for action, offset in offsets if passable[start + offset])
+        return moves[index]
+
     def is_out_of_bounds(self, row, col):
         return row < 0 or row >= self.rows or col < 0 or col >=self.cols
     
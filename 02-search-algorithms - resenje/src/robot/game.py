@@ -16,7 +16,10 @@ search_class_map = {
     "BFS": BreadthFirstSearch,
     "DFS": DepthFirstSearch,
     "IDFS": IterativeDepthFirstSearch,
+    "IDA*": IterativeDeepeningAStarSearch,
     "UCS": UniformCostSearch,
+    "BiBFS": BidirectionalBreadthFirstSearch,
+    "BiUCS": BidirectionalUniformCostSearch,
     "GS": GreedySearch,
     "A*": AStarSearch 
 }
@@ -288,9 +291,11 @@ class RobotGame:
         end = time.perf_counter()
 
         print('-'*15, 'DONE', '-'*15)
-        print('Time: {0} ms'.format(end - start))
+        print('Time: {0} ms'.format((end - start) * 1000))
         print('Processed nodes: {0}'.format(len(self.processed)))
         print('States left: {0}'.format(len(states)))
+        if hasattr(search, 'iterations'):
+            print('Iterations: {0}'.format(len(search.iterations)))
         if self.path is None:
             # nije bilo resenja
             print('-'*15, 'NO SOLUTION', '-'*15)
@@ -320,9 +325,9 @@ class RobotGame:
         else:
             t += ',' + f
             f = '.'
-        self.board.data[from_position[0]][from_position[1]] = f
+        self.board.set_cell(from_position[0], from_position[1], f)
         self.update_board(from_position[0], from_position[1])
-        self.board.data[to_position[0]][to_position[1]] = t
+        self.board.set_cell(to_position[0], to_position[1], t)
         self.update_board(to_position[0], to_position[1])
         self.root.update()
 
@@ -2,6 +2,9 @@ from __future__ import print_function
 
 from collections import deque
 from abc import *
+import time
+
+from frontier import SelectFrontier, PriorityFrontier
 
 
 class Search(object):
@@ -9,8 +12,17 @@ class Search(object):
     Apstraktna klasa za pretragu.
     """
 
-    def __init__(self, board):
+    def __init__(self, board, reference=False):
         self.board = board
+        self.reference = reference  # ako je True, koristi se originalni (linearni) odabir stanja - za poredjenje
+
+    def create_frontier(self):
+        """
+        Pravljenje strukture u kojoj se cuvaju stanja koja cekaju na obradu.
+        Podrazumevano je to deque nad kojim se poziva select_state.
+        :return: Frontier
+        """
+        return SelectFrontier(self.select_state)
 
     def search(self, initial_state):
         """
@@ -21,19 +33,20 @@ class Search(object):
         """
         # inicijalizacija pretrage
         initial_state = initial_state(self.board)  # pocetno stanje
-        states_list = deque([initial_state])  # deque - "brza" lista u Python-u
-        states_set = {initial_state.unique_hash()}  # set - za brzu pretragu stanja
+        states_list = self.create_frontier()  # stanja koja cekaju na obradu
+        states_list.push(initial_state)
+        states_set = {initial_state.get_state_key()}  # set - za brzu pretragu stanja
 
         processed_list = deque([])  # deque procesiranih stanja
         processed_set = set()  # set procesiranih stanja
 
         # pretraga
         while len(states_list) > 0:  # dok ima stanja za obradu
-            curr_state = self.select_state(states_list)  # preuzmi sledece stanje za obradu
-            states_set.remove(curr_state.unique_hash())  # izbaci stanja iz seta stanja
+            curr_state = states_list.pop()  # preuzmi sledece stanje za obradu
+            states_set.remove(curr_state.get_state_key())  # izbaci stanja iz seta stanja
 
             processed_list.append(curr_state)  # ubaci stanje u listu procesiranih stanja
-            processed_set.add(curr_state.unique_hash())  # ubaci stanje u set procesiranih stanja
+            processed_set.add(curr_state.get_state_key())  # ubaci stanje u set procesiranih stanja
 
             if curr_state.is_final_state():  # ako je krajnje stanje
                 # rekonsturisi putanju
@@ -44,12 +57,13 @@ class Search(object):
             new_states = curr_state.get_next_states()
             # iz liste sledecih mogucih stanja izbaci ona koja su vec u listi i koja su vec procesirana
             new_states = [new_state for new_state in new_states if
-                          new_state.unique_hash() not in processed_set and
-                          new_state.unique_hash() not in states_set]
+                          new_state.get_state_key() not in processed_set and
+                          new_state.get_state_key() not in states_set]
             # dodaj sledeca moguca stanja na kraj liste stanja
-            states_list.extend(new_states)
+            for new_state in new_states:
+                states_list.push(new_state)
             # dodaj sledeca moguca stanja u set stanja
-            states_set.update([new_state.unique_hash() for new_state in new_states])
+            states_set.update([new_state.get_state_key() for new_state in new_states])
         return None, processed_list, states_list
 
     @staticmethod
@@ -84,42 +98,149 @@ class DepthFirstSearch(Search):
         return states.pop()
 
 
-class MaxDepthException(Exception):
-    def __init__(self):
-        self.message = 'Nema vise stanja za obradu. Stigli smo do maksimalne definisane dubine.'
-        super().__init__(self.message)        
-
 class IterativeDepthFirstSearch(Search):
-    def __init__(self, board):
-        super().__init__(board)
+    """
+    Iterativna pretraga u dubinu (IDDFS).
+    Pretraga u dubinu se ponavlja sa granicom vecom u svakoj iteraciji, sve dok se ne pronadje resenje.
+    Umesto rekurzije koristi se eksplicitni stek (stanje, iterator sledecih stanja), pa se pamti samo
+    trenutna putanja - memorija je O(dubina), a dubina nije ogranicena dubinom rekurzije Python-a.
+    Stanja koja su vec na trenutnoj putanji se preskacu (ciklusi).
+    Sa transpositions=True pamti se i najmanja cena sa kojom je stanje dostignuto u trenutnoj iteraciji,
+    pa se ista stanja ne obradjuju ponovo kroz skuplje putanje - to trosi memoriju srazmernu broju stanja,
+    ali na tablama sprecava eksponencijalan broj putanja. Sa transpositions=False memorija je strogo O(dubina).
+    Statistika svake iteracije se cuva u listi iterations.
+    Parametar reference nema uticaja - originalna varijanta (rekurzivno pokretanje cele pretrage) je zamenjena.
+    """
+
+    def __init__(self, board, reference=False, transpositions=True):
+        super().__init__(board, reference)
         self.max_depth = 1
-    
+        self.transpositions = transpositions
+        self.iterations = []  # statistika po iteracijama: granica, broj procesiranih stanja, trajanje
+
     def search(self, initial_state):
         ''' Override-ujemo podrazumevanu pretragu.
-        Pretragu pokrećemo iznova svaki put sa novom maksimalnom dubinom povećanom za 1 
-        (rekurzivno se poziva).'''
-        try:
-            return super().search(initial_state)
-        # u slučaju da smo stigli do maksimalne dubine i nismo pronašli rešenje, povećavamo dubinu pretrage i pokrećemo pretragu iznova
-        except MaxDepthException:
-            self.max_depth += 1
-            return self.search(initial_state)
-    
-    def select_state(self, states):
-        # pretražujemo sva stanja do određene dubine
-        # sva stanja koja su preduboka samo izbacujemo iz liste stanja
-        while states:
-            state = states.pop() # isto kao i DFS
-            if state.depth <= self.max_depth:
-                return state
+        Pretragu u dubinu pokrecemo iznova, u petlji, svaki put sa novom (vecom) granicom.
+        Vraca se lista procesiranih stanja iz poslednje iteracije.'''
+        initial_state = initial_state(self.board)  # pocetno stanje
+        self.iterations = []
+        limit = self.get_limit_value(initial_state)
+        while True:
+            self.max_depth = limit
+            start = time.perf_counter()
+            final_state, processed_list, next_limit = self.limited_search(initial_state, limit)
+            self.iterations.append({'limit': limit, 'processed': len(processed_list),
+                                    'time': time.perf_counter() - start})
+            if final_state is not None:
+                return Search.reconstruct_path(final_state), processed_list, deque()
+            # ako nijedno stanje nije odbaceno zbog granice, nema vise stanja za obradu - nema resenja
+            if next_limit == float('inf'):
+                return None, processed_list, deque()
+            limit = next_limit
+
+    def limited_search(self, initial_state, limit):
+        """
+        Jedna iteracija - pretraga u dubinu do zadate granice.
 
-        # Ako nismo uspeli da nadjemo sledeće stanje u okviru definisane dubine `max_depth`, to znači da nema više stanja za obradu. 
-        # Kada se desi greška, znači da smo stigli do maksimalne dubine, a nismo pronašli rešenje.
-        raise MaxDepthException()
+        :param initial_state: pocetno stanje
+        :param limit: granica - stanja cija je vrednost (get_limit_value) veca od granice se ne obradjuju
+        :return: krajnje stanje (ili None), procesirana stanja, najmanja vrednost veca od granice
+        """
+        processed_list = deque([])
+        next_limit = float('inf')  # granica za sledecu iteraciju
+        path_keys = {initial_state.get_state_key()}  # kljucevi stanja na trenutnoj putanji
+        best_costs = dict()  # (kljuc stanja, akcija) -> najmanja cena sa kojom je dostignuto (transpozicije)
+        stack = [[initial_state, None]]  # trenutna putanja: [stanje, iterator sledecih stanja]
+        while stack:
+            top = stack[-1]
+            curr_state, next_states = top
+            if next_states is None:  # stanje se obradjuje prvi put
+                processed_list.append(curr_state)
+                if curr_state.is_final_state():
+                    return curr_state, processed_list, next_limit
+                next_states = top[1] = iter(curr_state.get_next_states())
+
+            new_state = next(next_states, None)
+            if new_state is None:  # obradjena su sva sledeca stanja - vracamo se nazad
+                stack.pop()
+                path_keys.discard(curr_state.get_state_key())
+                continue
+
+            new_key = new_state.get_state_key()
+            if new_key in path_keys:  # ciklus
+                continue
+            value = self.get_limit_value(new_state)
+            if value > limit:
+                next_limit = min(next_limit, value)
+                continue
+            if self.transpositions:
+                # cena narednih poteza moze zavisiti i od akcije kojom se doslo u stanje (npr. cena okreta),
+                # pa se putanje porede samo ako su dosle u stanje istom akcijom
+                transposition = (new_key, getattr(new_state, 'action', None))
+                cost = self.get_path_cost(new_state)
+                if best_costs.get(transposition, float('inf')) <= cost:
+                    continue
+                best_costs[transposition] = cost
+            path_keys.add(new_key)
+            stack.append([new_state, None])
+        return None, processed_list, next_limit
+
+    def get_limit_value(self, state):
+        """
+        Vrednost stanja koja se poredi sa granicom iteracije - za IDDFS je to dubina.
+        :return: float
+        """
+        return state.depth
+
+    def get_path_cost(self, state):
+        """
+        Cena putanje do stanja, za poredjenje razlicitih putanja do istog stanja - za IDDFS je to dubina.
+        :return: float
+        """
+        return state.depth
 
 
+class IterativeDeepeningAStarSearch(IterativeDepthFirstSearch):
+    """
+    IDA* - iterativna pretraga u dubinu gde je granica vrednost f = g + h (videti AStarSearch).
+    Prva granica je f pocetnog stanja, a svaka sledeca najmanja vrednost f koja je premasila prethodnu granicu.
+    """
+
+    def get_limit_value(self, state):
+        return state.get_current_cost() + state.get_cost_estimate()
+
+    def get_path_cost(self, state):
+        return state.get_current_cost()
+
+
+class PrioritySearch(Search):
+    """
+    Apstraktna klasa za vodjene pretrage (UCS, GS, A*).
+    Stanja se cuvaju u heap-u po prioritetu, pa je odabir sledeceg stanja O(log n).
+    Sa reference=True koristi se originalni linearni odabir preko select_state.
+    """
+
+    def create_frontier(self):
+        if self.reference:
+            return super().create_frontier()
+        return PriorityFrontier(self.get_priority)
+
+    @abstractmethod
+    def get_priority(self, state):
+        """
+        Apstraktna metoda koja vraca prioritet stanja - stanje sa najmanjim prioritetom se prvo obradjuje.
+        Mora odgovarati kriterijumu iz select_state.
+
+        :param state: stanje za koje se racuna prioritet
+        :return: float
+        """
+        pass
+
+
+class UniformCostSearch(PrioritySearch):
+    def get_priority(self, state):
+        return state.get_current_cost()
 
-class UniformCostSearch(Search):
     def select_state(self, states):
         min_cost = float('inf')
         min_cost_state = None
@@ -133,7 +254,10 @@ class UniformCostSearch(Search):
         return min_cost_state
 
 
-class GreedySearch(Search):
+class GreedySearch(PrioritySearch):
+    def get_priority(self, state):
+        return state.get_cost_estimate()
+
     def select_state(self, states):
         # TODO 4 - Implementirati pohlepnu pretragu (GS).
         min_cost = float('inf')
@@ -148,7 +272,10 @@ class GreedySearch(Search):
         return min_cost_state
 
 
-class AStarSearch(Search):
+class AStarSearch(PrioritySearch):
+    def get_priority(self, state):
+        return state.get_current_cost() + state.get_cost_estimate()
+
     def select_state(self, states):
         # TODO 5 - Implementirati A*
         min_cost = float('inf')
@@ -164,4 +291,102 @@ class AStarSearch(Search):
         states.remove(min_cost_state)
         return min_cost_state
 
-# napomena: traženje stanja sa najmanjim ključem može i kraće da se napiše koristeći min(states, key=) sintaksu.
\ No newline at end of file
+# napomena: traženje stanja sa najmanjim ključem može i kraće da se napiše koristeći min(states, key=) sintaksu.
+
+class BidirectionalSearch(PrioritySearch):
+    """
+    Apstraktna klasa za dvosmernu pretragu.
+    Pretraga istovremeno napreduje od pocetne pozicije i, unazad, od pozicije cilja, dok se dve pretrage ne sretnu.
+    Uvek se prosiruje strana sa manje stanja koja cekaju na obradu.
+    Pretraga se zavrsava kada zbir najmanjih prioriteta na obe strane nije manji od cene najboljeg pronadjenog
+    susreta - tada nijedan drugi susret ne moze biti bolji, pa je resenje optimalno i kod razlicitih cena poteza.
+
+    Pretpostavlja se da je cilj jedna pozicija, da su potezi reverzibilni i da potez ima istu cenu u oba smera
+    (kao kod RobotState u ovoj vezbi). Ako na tabli nema cilja, ili je reference=True, koristi se obicna pretraga.
+    """
+
+    def search(self, initial_state):
+        state_class = initial_state
+        initial_state = state_class(self.board)  # pocetno stanje
+        if self.reference or None in initial_state.goal_position:
+            return super().search(state_class)
+        # stanje za pretragu unazad - krece od cilja, a cilj mu je pocetna pozicija
+        goal_state = state_class(self.board, None, initial_state.goal_position, initial_state.position)
+
+        roots = (initial_state, goal_state)
+        frontiers = tuple(self.create_frontier() for _ in roots)  # stanja koja cekaju na obradu, za obe strane
+        reached = tuple({root.get_state_key(): root} for root in roots)  # kljuc -> najbolje dostignuto stanje
+        processed = (set(), set())  # kljucevi procesiranih stanja, za obe strane
+        processed_list = deque([])  # deque procesiranih stanja (obe strane, redom obrade)
+        for frontier, root in zip(frontiers, roots):
+            frontier.push(root)
+
+        best_cost = float('inf')  # cena najboljeg susreta
+        meeting = None  # (stanje sa prednje strane, stanje sa zadnje strane) najboljeg susreta
+        if initial_state.get_state_key() == goal_state.get_state_key():
+            best_cost = self.get_priority(initial_state) + self.get_priority(goal_state)
+            meeting = roots
+
+        # pretraga
+        while len(frontiers[0]) > 0 and len(frontiers[1]) > 0:
+            if frontiers[0].peek_priority() + frontiers[1].peek_priority() >= best_cost:
+                break  # nijedan drugi susret ne moze biti bolji od pronadjenog
+
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1  # prosiruje se manja strana
+            other = 1 - side
+            curr_state = frontiers[side].pop()
+            processed[side].add(curr_state.get_state_key())
+            processed_list.append(curr_state)
+
+            for new_state in curr_state.get_next_states():
+                new_key = new_state.get_state_key()
+                if new_key in processed[side]:
+                    continue
+                old_state = reached[side].get(new_key)
+                if old_state is not None and self.get_priority(old_state) <= self.get_priority(new_state):
+                    continue
+                reached[side][new_key] = new_state
+                frontiers[side].push(new_state)  # menja eventualno skuplje isto stanje u frontier-u
+
+                # da li je stanje vec dostignuto sa druge strane - susret
+                other_state = reached[other].get(new_key)
+                if other_state is not None:
+                    cost = self.get_priority(new_state) + self.get_priority(other_state)
+                    if cost < best_cost:
+                        best_cost = cost
+                        meeting = (new_state, other_state) if side == 0 else (other_state, new_state)
+
+        states_list = deque(list(frontiers[0]) + list(frontiers[1]))
+        if meeting is None:
+            return None, processed_list, states_list
+        return Search.reconstruct_path(self.join_paths(*meeting)), processed_list, states_list
+
+    def join_paths(self, forward_state, backward_state):
+        """
+        Spajanje putanja dve strane u susretu: na stanje sa prednje strane se redom nadovezuju
+        pozicije sa zadnje strane (od susreta do cilja), pa se dobija krajnje stanje ciji roditelji
+        cine celu putanju, kao kod obicne pretrage.
+
+        :param forward_state: stanje u susretu, dostignuto od pocetne pozicije
+        :param backward_state: stanje u susretu, dostignuto od cilja
+        :return: krajnje stanje
+        """
+        state = forward_state
+        backward_state = backward_state.parent
+        while backward_state is not None:
+            state = state.__class__(self.board, state, backward_state.position, state.goal_position)
+            backward_state = backward_state.parent
+        return state
+
+    def select_state(self, states):
+        return min(states, key=self.get_priority)
+
+
+class BidirectionalBreadthFirstSearch(BidirectionalSearch):
+    def get_priority(self, state):
+        return state.depth
+
+
+class BidirectionalUniformCostSearch(BidirectionalSearch):
+    def get_priority(self, state):
+        return state.get_current_cost()
@@ -1,5 +1,5 @@
 from abc import *
-from board import Board
+from board import Board, ACTIONS
 
 
 class State(object):
@@ -7,6 +7,9 @@ class State(object):
     Apstraktna klasa koja opisuje stanje pretrage.
     """
 
+    # stanja se prave za svaki generisani cvor pretrage, pa umesto __dict__-a koriste __slots__
+    __slots__ = ('board', 'parent', 'position', 'goal_position', 'checkpoints', 'teleports', 'teleport', 'depth')
+
     @abstractmethod
     def __init__(self, board: Board, parent=None, position=None, goal_position=None,  checkpoints=None, teleports=None, teleport=False):
         """
@@ -33,9 +36,11 @@ class State(object):
             self.teleports = teleports
 
         if self.parent is None:  # ako nema roditeljsko stanje, onda je ovo inicijalno stanje
-            self.position = board.find_position(
+            # pocetna i krajnja pozicija se mogu i zadati (npr. za pretragu unazad, od cilja),
+            # a ako nisu zadate, traze se na tabli
+            self.position = position if position is not None else board.find_position(
                 self.get_agent_code())  # pronadji pocetnu poziciju
-            self.goal_position = board.find_position(
+            self.goal_position = goal_position if goal_position is not None else board.find_position(
                 self.get_agent_goal_code())  # pronadji krajnju poziciju
         else:  # ako ima roditeljsko stanje, samo sacuvaj vrednosti parametara
             self.position = position
@@ -90,6 +95,15 @@ class State(object):
         """
         pass
     
+    def get_state_key(self):
+        """
+        Kljuc stanja koji pretraga koristi u setovima i recnicima stanja.
+        Mora biti jedinstven za stanje, isto kao i unique_hash. Podrazumevano je to sam unique_hash,
+        a konkretna stanja mogu vratiti kompaktan ceo broj koji se izracuna jednom, u konstruktoru.
+        :return: int ili str
+        """
+        return self.unique_hash()
+
     @abstractmethod
     def get_cost_estimate(self):
         """
@@ -111,8 +125,10 @@ class State(object):
 
 
 class RobotState(State):
+    __slots__ = ('cost', 'key')
 
-    def __init__(self, board: Board, parent: State=None, position: tuple=None, goal_position: tuple=None):
+    def __init__(self, board: Board, parent: State=None, position: tuple=None, goal_position: tuple=None,
+                 checkpoints: tuple=None, teleports: tuple=None, teleport: bool=False):
         super(self.__class__, self).__init__(board, parent, position,
                                              goal_position, checkpoints, teleports, teleport)
         # posle pozivanja super konstruktora, mogu se dodavati "custom" stvari vezani za stanje
@@ -135,25 +151,22 @@ class RobotState(State):
             next_position = self.teleports[0]
             self.teleport = True
 
+        # kompaktan kljuc stanja - redni broj polja
+        self.key = self.board.get_cell_index(*self.position)
+
     def get_legal_positions(self):
         # moguci smerovi kretanja robota (desno, levo, dole, gore)
-        actions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-
-        row, col = self.position  # trenutno pozicija
-        new_positions = []
-        for d_row, d_col in actions:  # za sve moguce smerove
-            new_row = row + d_row  # nova pozicija po redu
-            new_col = col + d_col  # nova pozicija po koloni
-            # ako nova pozicija nije van table i ako nije zid ('w'), ubaci u listu legalnih pozicija
-            if not self.board.is_out_of_bounds(new_row, new_col) and not self.board.hits_wall(new_row, new_col):
-                new_positions.append((new_row, new_col))
-        return new_positions
+        # legalni potezi se citaju iz prevedene table (videti Board.get_legal_moves)
+        return [new_position for new_position, _ in self.board.get_legal_moves(self.position, ACTIONS)]
 
     def is_final_state(self):
         return self.position == self.goal_position
 
     def unique_hash(self):
         return str(self.position)
+
+    def get_state_key(self):
+        return self.key
     
     def get_cost_estimate(self):
         # TODO 4 - Implementirati heuristiku 
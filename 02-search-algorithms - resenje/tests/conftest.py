@@ -0,0 +1,5 @@
+import os
+import sys
+
+# moduli vezbe (board, search, state...) su u src/robot i uvoze se kao kod pokretanja python main.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'robot'))
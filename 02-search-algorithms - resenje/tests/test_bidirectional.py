@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from board import Board
+from search import (BreadthFirstSearch, UniformCostSearch, BidirectionalBreadthFirstSearch,
+                    BidirectionalUniformCostSearch)
+from state import RobotState
+
+
+def generate_board(rows, cols, density, seed):
+    """
+    Tabla sa zidovima (svako polje je zid sa verovatnocom density), robotom i ciljem.
+    """
+    rng = random.Random(seed)
+    board = Board(rows, cols)
+    cells = [(row, col) for row in range(rows) for col in range(cols)]
+    (robot_row, robot_col), (goal_row, goal_col) = rng.sample(cells, 2)
+    board.set_cell(robot_row, robot_col, 'r')
+    board.set_cell(goal_row, goal_col, 'g')
+    for row, col in cells:
+        if board.data[row][col] == '.' and rng.random() < density:
+            board.set_cell(row, col, 'w')
+    return board
+
+
+def check_path(board, path):
+    """
+    Putanja ide od robota do cilja, korak po korak, preko polja bez zidova.
+    """
+    assert path[0] == board.find_position('r')
+    assert path[-1] == board.find_position('g')
+    for (row, col), (next_row, next_col) in zip(path, path[1:]):
+        assert abs(next_row - row) + abs(next_col - col) == 1
+        assert board.data[next_row][next_col] != 'w'
+
+
+BOARDS = [(size, density, seed) for size in (5, 12) for density in (0.0, 0.2, 0.35) for seed in range(6)]
+
+
+@pytest.mark.parametrize('size, density, seed', BOARDS)
+@pytest.mark.parametrize('search_class, reference_class', [
+    (BidirectionalBreadthFirstSearch, BreadthFirstSearch),
+    (BidirectionalUniformCostSearch, UniformCostSearch),
+])
+def test_bidirectional_matches_one_way_search(size, density, seed, search_class, reference_class):
+    board = generate_board(size, size, density, seed)
+    path, processed, states = search_class(board).search(RobotState)
+    expected = reference_class(board).search(RobotState)[0]
+    if expected is None:
+        assert path is None
+        return
+    path, expected = list(path), list(expected)
+    check_path(board, path)
+    assert len(path) == len(expected)
+
+
+def test_bidirectional_without_goal():
+    board = generate_board(8, 8, 0.2, 0)
+    board.set_cell(*board.find_position('g'), '.')
+    for search_class in (BidirectionalBreadthFirstSearch, BidirectionalUniformCostSearch):
+        assert search_class(board).search(RobotState)[0] is None
+
+
+def test_bidirectional_robot_next_to_goal():
+    board = Board(3, 3)
+    board.set_cell(1, 1, 'r')
+    board.set_cell(1, 2, 'g')
+    for search_class in (BidirectionalBreadthFirstSearch, BidirectionalUniformCostSearch):
+        assert list(search_class(board).search(RobotState)[0]) == [(1, 1), (1, 2)]
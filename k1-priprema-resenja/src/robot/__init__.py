@@ -0,0 +1,43 @@
+"""
+Pretrage nad tablom kao paket koji se moze koristiti i bez graficke aplikacije.
+Uvoz paketa ne ucitava tkinter ni Pillow - RobotGame (i sa njim tkinter i Pillow) se uvozi
+tek kada se prvi put zatrazi.
+
+Primer (iz direktorijuma src):
+    import robot
+    path, processed, states = robot.solve('robot/boards/zadatak.brd', 'A*')
+"""
+from .analysis import HEAT_MODES, get_expansion_heat, get_positions
+from .board import (Board, ByteGrid, TextGrid, convert_board_file, ACTIONS, DIAGONAL_ACTIONS, ALL_ACTIONS,
+                    KNIGHT_ACTIONS)
+from .cache import PathCache, load_board
+from .replay import Replay
+from .search import (Search, SearchEvent, SearchCancelledException, UnsupportedStateException, SearchBudget,
+                     SearchOutcome, PredecessorMap, BreadthFirstSearch, DepthFirstSearch, IterativeDepthFirstSearch,
+                     IterativeDeepeningAStarSearch, PrioritySearch, UniformCostSearch, GreedySearch, AStarSearch,
+                     JumpPointSearch, DStarLiteSearch, search_class_map, get_search_class_map)
+from .state import State, RobotState, PositionState, state_class_map
+
+
+def solve(board, algorithm='A*', state_class=RobotState, budget=None):
+    """
+    Pretraga bez graficke aplikacije.
+    :param board: Board ili str - tabla ili putanja fajla table (dimenzije odredjuje fajl, a uz fajl
+        se koristi i kes prevedene table, videti cache.load_board).
+    :param algorithm: str ili klasa pretrage - naziv iz search_class_map ili implementacija klase Search.
+    :param state_class: klasa inicijalnog stanja.
+    :param budget: SearchBudget - ogranicenja pretrage (path je None ako je pretraga zaustavljena).
+    :return: path, processed_list, states_list
+    """
+    if isinstance(board, str):
+        board = load_board(board)
+    search_class = search_class_map[algorithm] if isinstance(algorithm, str) else algorithm
+    return search_class(board).search(state_class, budget)
+
+
+def __getattr__(name):
+    # graficka aplikacija se uvozi tek na zahtev
+    if name == 'RobotGame':
+        from .game import RobotGame
+        return RobotGame
+    raise AttributeError('module {0!r} has no attribute {1!r}'.format(__name__, name))
@@ -0,0 +1,62 @@
+from array import array
+
+
+# Analiza rezultata pretrage po celijama table, za prikaz preko table (videti renderer.BoardRenderer).
+# Rezultat je niz bajtova sa jednom vrednoscu po celiji (red po red, kao Board.get_cell_index),
+# racunat jednim prolaskom kroz procesirana stanja, pa se cela tabla prikazuje odjednom.
+# Vrednost 0 znaci da celija nije procesirana, a vrednosti 1-255 su intenzitet (1 najmanji, 255 najveci).
+
+HEAT_MODES = ('order', 'count')
+
+
+def get_expansion_heat(board, processed, mode='order'):
+    """
+    Intenzitet obrade celija.
+    :param board: Board - tabla na kojoj je izvrsena pretraga.
+    :param processed: iterable(State) - procesirana stanja, redom obrade (processed_list).
+    :param mode: str - 'order' (kada je celija prvi put procesirana - ranije je manji intenzitet)
+        ili 'count' (koliko puta je celija procesirana, npr. sa razlicitim kutijama ili u vise iteracija).
+    :returns: bytearray
+    """
+    if mode not in HEAT_MODES:
+        raise ValueError('Nepoznat nacin prikaza: {0}'.format(mode))
+    cols = board.cols
+    size = board.rows * cols
+    values = array('l', [0]) * size  # redni broj prve obrade + 1, ili broj obrada
+    count = 0
+    for state in processed:
+        row, col = state.position
+        index = row * cols + col
+        count += 1
+        if mode == 'count':
+            values[index] += 1
+        elif not values[index]:
+            values[index] = count
+    return scale_heat(values)
+
+
+def scale_heat(values):
+    """
+    Svodjenje vrednosti po celijama (0 - celija nije procesirana) na intenzitete 1-255.
+    :param values: array - vrednost za svaku celiju.
+    :returns: bytearray
+    """
+    heat = bytearray(len(values))
+    low = min((value for value in values if value), default=0)
+    high = max(values, default=0)
+    if not high:
+        return heat
+    span = max(high - low, 1)
+    for index, value in enumerate(values):
+        if value:
+            heat[index] = 1 + (value - low) * 254 // span
+    return heat
+
+
+def get_positions(states):
+    """
+    Pozicije stanja (npr. frontier-a - states_list, ili putanje).
+    :param states: iterable(State)
+    :returns: set((int, int))
+    """
+    return {state.position for state in states}
@@ -0,0 +1,136 @@
+"""
+Pokretanje pretraga bez graficke aplikacije, nad vise tabli i vise algoritama odjednom.
+Svaki posao (tabla, algoritam) se izvrsava u posebnom procesu (ProcessPoolExecutor), a rezultat
+svakog posla se ispisuje cim je gotov, kao jedan JSON red.
+
+Primer:
+    python batch.py boards -a BFS UCS A* -j 4 -o rezultati.jsonl
+    python batch.py boards --state Position -a A* JPS
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import glob
+import json
+import os
+import sys
+import time
+
+try:
+    from .cache import load_board
+    from .search import search_class_map, SearchBudget
+    from .state import state_class_map
+except ImportError:  # pokrenuto kao skripta (python batch.py)
+    from cache import load_board
+    from search import search_class_map, SearchBudget
+    from state import state_class_map
+
+
+def find_board_files(paths, pattern='*.brd'):
+    """
+    Spisak fajlova tabli - zadati fajlovi i fajlovi iz zadatih direktorijuma koji odgovaraju sablonu.
+    :param paths: list(str) - putanje fajlova i direktorijuma.
+    :param pattern: str - sablon imena fajla tabli u direktorijumu.
+    :returns: list(str)
+    """
+    board_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            board_files.extend(sorted(glob.glob(os.path.join(path, pattern))))
+        else:
+            board_files.append(path)
+    return board_files
+
+
+def solve(board_file, algorithm, budget=None, state='Robot'):
+    """
+    Jedan posao - ucitavanje table i pretraga zadatim algoritmom.
+    Izvrsava se u procesu iz pool-a, pa vraca samo recnik sa rezultatom (a ne stanja).
+    :param board_file: str - putanja fajla table.
+    :param algorithm: str - naziv pretrage (kljuc iz search_class_map).
+    :param budget: SearchBudget - ogranicenja pretrage (videti Search.search).
+    :param state: str - naziv stanja (kljuc iz state_class_map).
+    :returns: dict
+    """
+    result = {'board': board_file, 'algorithm': algorithm, 'state': state}
+    try:
+        board = load_board(board_file)  # dimenzije table odredjuje fajl, uz kes prevedene table
+        search = search_class_map[algorithm](board)
+        start = time.perf_counter()
+        path, processed, states = search.search(state_class_map[state], budget)
+        result['time_ms'] = (time.perf_counter() - start) * 1000
+        result['reason'] = search.outcome.reason
+        result['found'] = path is not None
+        result['path_length'] = len(path) if path is not None else None
+        result['cost'] = path[-1].get_current_cost() if path else None
+        result['processed'] = len(processed)
+        result['frontier'] = len(states)
+        if hasattr(search, 'iterations'):
+            result['iterations'] = len(search.iterations)
+        best_state = search.outcome.best_state
+        if path is None and best_state is not None:  # zaustavljena pretraga - najbolje procesirano stanje
+            result['best_position'] = best_state.position
+            result['best_h'] = best_state.get_cost_estimate()
+    except Exception as e:  # greska u jednom poslu ne prekida ostale
+        result['error'] = '{0}: {1}'.format(type(e).__name__, e)
+    return result
+
+
+def run(board_files, algorithms, output, workers=None, budget=None, state='Robot'):
+    """
+    Pokretanje svih poslova (svaka tabla sa svakim algoritmom) u pool-u procesa.
+    Rezultati se upisuju redom kojim se poslovi zavrsavaju.
+    :param output: fajl (tekstualni) u koji se upisuju JSON redovi.
+    :param workers: int - broj procesa (podrazumevano broj procesora).
+    :param budget: SearchBudget - ogranicenja svake pretrage.
+    :param state: str - naziv stanja sa kojim se pokrecu pretrage.
+    :returns: int - broj poslova koji su se zavrsili greskom
+    """
+    errors = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(solve, board_file, algorithm, budget, state)
+                   for board_file in board_files for algorithm in algorithms]
+        for future in as_completed(futures):
+            result = future.result()
+            errors += 'error' in result
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pretrage nad vise tabli, rezultati kao JSON redovi.')
+    parser.add_argument('paths', nargs='+', help='fajlovi tabli ili direktorijumi sa tablama')
+    parser.add_argument('-a', '--algorithms', nargs='+', default=['BFS', 'DFS', 'IDFS', 'UCS', 'GS', 'A*'],
+                        choices=list(search_class_map.keys()), metavar='ALGORITHM',
+                        help='pretrage koje se pokrecu: ' + ', '.join(search_class_map.keys()))
+    parser.add_argument('--state', default='Robot', choices=list(state_class_map.keys()),
+                        help='stanje (agent) sa kojim se pokrecu pretrage')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='broj procesa (podrazumevano broj procesora)')
+    parser.add_argument('-p', '--pattern', default='*.brd', help='sablon imena fajla tabli u direktorijumu')
+    parser.add_argument('-o', '--output', default=None, help='izlazni fajl (podrazumevano standardni izlaz)')
+    parser.add_argument('--max-expansions', type=int, default=None, help='najveci broj procesiranih stanja')
+    parser.add_argument('--time-limit', type=float, default=None, help='najvise vremena po pretrazi (u sekundama)')
+    parser.add_argument('--max-frontier', type=int, default=None, help='najveci broj stanja koja cekaju na obradu')
+    parser.add_argument('--max-closed', type=int, default=None, help='najveci broj zapamcenih obradjenih stanja')
+    args = parser.parse_args(argv)
+    limits = (args.max_expansions, args.time_limit, args.max_frontier, args.max_closed)
+    budget = SearchBudget(*limits) if any(limit is not None for limit in limits) else None
+
+    state_class = state_class_map[args.state]
+    unsupported = [name for name in args.algorithms if not search_class_map[name].supports(state_class)]
+    if unsupported:
+        parser.error('pretrage ne podrzavaju stanje {0}: {1}'.format(args.state, ', '.join(unsupported)))
+
+    board_files = find_board_files(args.paths, args.pattern)
+    if not board_files:
+        parser.error('nije pronadjena nijedna tabla')
+    if args.output is None:
+        errors = run(board_files, args.algorithms, sys.stdout, args.jobs, budget, args.state)
+    else:
+        with open(args.output, 'w') as output:
+            errors = run(board_files, args.algorithms, output, args.jobs, budget, args.state)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
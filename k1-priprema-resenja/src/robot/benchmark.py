@@ -0,0 +1,290 @@
+"""
+Merenje performansi pretraga nad generisanim tablama.
+Table se generisu iz zadatog seed-a (otvorene table sa zidovima, lavirinti i table sa udaljenim kutijama),
+pa su merenja ponovljiva. Svaka pretraga (podrazumevano sve koje rade sa zadatim stanjem, --state, osim IDFS
+i IDA*) se pokrece nad svakom tablom: prvo jedno pokretanje za zagrevanje, pa zadati broj merenih ponavljanja,
+i jos jedno pokretanje uz tracemalloc za najvece zauzece memorije.
+
+Rezultati se mogu snimiti kao baseline (JSON), a kasnija merenja porediti sa njim - merenje koje je
+sporije ili trosi vise memorije od dozvoljenog praga, ili obradjuje vise stanja, se prijavljuje kao regresija.
+
+Primer:
+    python benchmark.py --save-baseline baseline.json
+    python benchmark.py --baseline baseline.json --threshold 0.25
+    python benchmark.py --state Position -a A* JPS
+"""
+import argparse
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+try:
+    from .board import Board
+    from .search import search_class_map, get_search_class_map, BreadthFirstSearch
+    from .state import RobotState, state_class_map
+except ImportError:  # pokrenuto kao skripta (python benchmark.py)
+    from board import Board
+    from search import search_class_map, get_search_class_map, BreadthFirstSearch
+    from state import RobotState, state_class_map
+
+
+BOARD_KINDS = ('open', 'maze', 'checkpoint')
+# pretrage koje se podrazumevano ne mere - iterativne pretrage (IDFS, IDA*) traju desetine sekundi i vise
+# po pokretanju na nekim tablama 15x15 i 30x30 (mogu se zadati preko --algorithms)
+SLOW_ALGORITHMS = ('IDFS', 'IDA*')
+
+
+def get_default_algorithms(state_class):
+    """
+    Pretrage koje se podrazumevano mere - sve koje rade sa zadatim stanjem, osim SLOW_ALGORITHMS.
+    :returns: list(str)
+    """
+    return [name for name in get_search_class_map(state_class) if name not in SLOW_ALGORITHMS]
+
+
+
+def generate_walls(rng, rows, cols, density):
+    """
+    Otvorena tabla - svako polje je zid sa verovatnocom density.
+    :returns: list(list(str))
+    """
+    return [['w' if rng.random() < density else '.' for _ in range(cols)] for _ in range(rows)]
+
+
+def generate_maze(rng, rows, cols, density):
+    """
+    Lavirint (randomized DFS nad poljima sa neparnim koordinatama), u kom se zatim
+    sa verovatnocom 1 - density ruse zidovi, pa lavirint ima i ciklusa.
+    :returns: list(list(str))
+    """
+    data = [['w'] * cols for _ in range(rows)]
+    start = (1 % rows, 1 % cols)
+    data[start[0]][start[1]] = '.'
+    stack = [start]
+    while stack:
+        row, col = stack[-1]
+        neighbors = [(row + d_row, col + d_col) for d_row, d_col in ((0, 2), (0, -2), (2, 0), (-2, 0))
+                     if 0 <= row + d_row < rows and 0 <= col + d_col < cols
+                     and data[row + d_row][col + d_col] == 'w']
+        if not neighbors:
+            stack.pop()
+            continue
+        next_row, next_col = rng.choice(neighbors)
+        data[(row + next_row) // 2][(col + next_col) // 2] = '.'
+        data[next_row][next_col] = '.'
+        stack.append((next_row, next_col))
+    for row in range(rows):
+        for col in range(cols):
+            if data[row][col] == 'w' and rng.random() > density:
+                data[row][col] = '.'
+    return data
+
+
+def generate_board(kind, rows, cols, density, seed, solvable=True, max_attempts=100):
+    """
+    Generisanje table zadate vrste. Na tabli su uvek robot, cilj i dve kutije u razlicitim kolonama
+    (RobotState prvo kupi desnu kutiju, pa do leve ide potezima konja). Na tabli 'checkpoint' je desna kutija
+    u desnoj, a leva u levoj cetvrtini table, pa je deo puta potezima konja dug.
+    :param kind: str - 'open', 'maze' ili 'checkpoint'.
+    :param seed: int - seed generatora, ista vrednost daje istu tablu.
+    :param solvable: bool - ako je True, table se generisu dok se ne dobije tabla koja ima resenje
+        (na tablama bez resenja iterativne pretrage obilaze ceo prostor stanja za svaku granicu).
+    :returns: Board
+    """
+    if kind not in BOARD_KINDS:
+        raise ValueError('Nepoznata vrsta table: {0}'.format(kind))
+    rng = random.Random('{0}-{1}-{2}-{3}-{4}'.format(kind, rows, cols, density, seed))
+    for _ in range(max_attempts):
+        board = generate_board_data(rng, kind, rows, cols, density)
+        if not solvable or BreadthFirstSearch(board).search(RobotState)[0] is not None:
+            return board
+    raise ValueError('Nije generisana tabla sa resenjem: {0} {1}x{2}, {3}.'.format(kind, rows, cols, density))
+
+
+def generate_board_data(rng, kind, rows, cols, density):
+    """
+    Jedan pokusaj generisanja table (videti generate_board).
+    :returns: Board
+    """
+    if kind == 'maze':
+        data = generate_maze(rng, rows, cols, density)
+    else:
+        data = generate_walls(rng, rows, cols, density)
+    free = [(row, col) for row in range(rows) for col in range(cols) if data[row][col] == '.']
+    # kutije moraju biti u razlicitim kolonama, inace RobotState ne razlikuje levu i desnu kutiju
+    last_col = max((col for _, col in free), default=0)
+    if kind == 'checkpoint':
+        left = [(row, col) for row, col in free if col < cols // 4]
+    else:
+        left = [(row, col) for row, col in free if col < last_col]
+    left_box = rng.choice(left) if left else None
+    right = []
+    if left_box is not None:
+        min_col = max(left_box[1] + 1, cols - cols // 4 if kind == 'checkpoint' else 0)
+        right = [(row, col) for row, col in free if col >= min_col]
+    if len(free) < 4 or left_box is None or not right:
+        raise ValueError('Tabla {0}x{1} nema dovoljno slobodnih polja.'.format(rows, cols))
+    right_box = rng.choice(right)
+    rest = [position for position in free if position != right_box and position != left_box]
+    for element, (row, col) in zip(['r', 'g', 'b', 'b'], rng.sample(rest, 2) + [right_box, left_box]):
+        data[row][col] = element
+
+    board = Board(rows, cols)
+    for row in range(rows):
+        for col in range(cols):
+            if data[row][col] != '.':
+                board.set_cell(row, col, data[row][col])
+    return board
+
+
+def run_search(board, algorithm, state_class=RobotState):
+    """
+    Jedno pokretanje pretrage.
+    :param state_class: klasa inicijalnog stanja.
+    :returns: (float, path, processed_list, states_list) - trajanje u sekundama i rezultat pretrage
+    """
+    search = search_class_map[algorithm](board)
+    gc.collect()
+    start = time.perf_counter()
+    path, processed, states = search.search(state_class)
+    return time.perf_counter() - start, path, processed, states
+
+
+def measure(board, algorithm, repeats=5, warmup=1, state_class=RobotState):
+    """
+    Merenje jedne pretrage nad jednom tablom.
+    :param repeats: int - broj merenih pokretanja.
+    :param warmup: int - broj pokretanja pre merenja (npr. popunjavanje tabli suseda i heuristika).
+    :param state_class: klasa inicijalnog stanja.
+    :returns: dict
+    """
+    for _ in range(warmup):
+        run_search(board, algorithm, state_class)
+    times = []
+    for _ in range(repeats):
+        duration, path, processed, states = run_search(board, algorithm, state_class)
+        times.append(duration)
+
+    # najvece zauzece memorije se meri posebnim pokretanjem, jer tracemalloc usporava pretragu
+    tracemalloc.start()
+    run_search(board, algorithm, state_class)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    median = statistics.median(times)
+    # putanja se racuna kao resenje samo ako je poslednje stanje krajnje - pretraga koja ne postuje pravila
+    # stanja ne sme se porediti sa ostalima kao da je nasla resenje
+    found = bool(path) and path[-1].is_final_state()
+    result = {
+        'found': found,
+        'path_length': len(path) if found else None,
+        'cost': path[-1].get_current_cost() if found else None,
+        'processed': len(processed),
+        'frontier': len(states),
+        'min_ms': min(times) * 1000,
+        'median_ms': median * 1000,
+        'mean_ms': statistics.mean(times) * 1000,
+        'stdev_ms': statistics.stdev(times) * 1000 if len(times) > 1 else 0.0,
+        'expansions_per_sec': len(processed) / median if median > 0 else None,
+        'peak_kb': peak / 1024,
+    }
+    if path and not found:
+        result['invalid_path'] = True  # pretraga je vratila putanju koja se ne zavrsava krajnjim stanjem
+    return result
+
+
+def compare(result, baseline, threshold):
+    """
+    Poredjenje merenja sa baseline-om.
+    :param threshold: float - dozvoljeno relativno povecanje vremena i memorije (npr. 0.2 = 20%).
+    :returns: list(str) - opisi regresija (prazna lista ako ih nema)
+    """
+    regressions = []
+    for name in ('median_ms', 'peak_kb'):
+        old, new = baseline.get(name), result.get(name)
+        if old and new is not None and new > old * (1 + threshold):
+            regressions.append('{0} {1:.2f} -> {2:.2f} (+{3:.0%})'.format(name, old, new, new / old - 1))
+    # broj obradjenih stanja ne zavisi od racunara, pa se poredi bez praga
+    if baseline.get('found') and not result['found']:
+        regressions.append('found -> not found')
+    if baseline.get('processed') is not None and result['processed'] > baseline['processed']:
+        regressions.append('processed {0} -> {1}'.format(baseline['processed'], result['processed']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Merenje performansi pretraga nad generisanim tablama.')
+    parser.add_argument('-a', '--algorithms', nargs='+', default=None,
+                        choices=list(search_class_map.keys()), metavar='ALGORITHM',
+                        help='pretrage koje se mere: ' + ', '.join(search_class_map.keys()) +
+                             ' (podrazumevano sve koje rade sa stanjem, osim ' + ', '.join(SLOW_ALGORITHMS) + ')')
+    parser.add_argument('--state', default='Robot', choices=list(state_class_map.keys()),
+                        help='stanje (agent) sa kojim se pokrecu pretrage')
+    parser.add_argument('-k', '--kinds', nargs='+', default=list(BOARD_KINDS), choices=BOARD_KINDS,
+                        help='vrste tabli')
+    parser.add_argument('-s', '--sizes', nargs='+', type=int, default=[15, 30], help='velicine (kvadratnih) tabli')
+    parser.add_argument('-d', '--densities', nargs='+', type=float, default=[0.1, 0.3], help='gustine zidova')
+    parser.add_argument('--seed', type=int, default=0, help='seed generisanja tabli')
+    parser.add_argument('-r', '--repeats', type=int, default=5, help='broj merenih pokretanja')
+    parser.add_argument('-w', '--warmup', type=int, default=1, help='broj pokretanja pre merenja')
+    parser.add_argument('-o', '--output', default=None, help='fajl za rezultate (JSON)')
+    parser.add_argument('--baseline', default=None, help='baseline (JSON) sa kojim se porede rezultati')
+    parser.add_argument('--save-baseline', default=None, help='snimanje rezultata kao baseline (JSON)')
+    parser.add_argument('-t', '--threshold', type=float, default=0.2,
+                        help='dozvoljeno relativno povecanje vremena i memorije u odnosu na baseline')
+    args = parser.parse_args(argv)
+    state_class = state_class_map[args.state]
+    if args.algorithms is None:
+        args.algorithms = get_default_algorithms(state_class)
+    unsupported = [name for name in args.algorithms if not search_class_map[name].supports(state_class)]
+    if unsupported:
+        parser.error('pretrage ne podrzavaju stanje {0}: {1}'.format(args.state, ', '.join(unsupported)))
+
+    baseline = dict()
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = dict()
+    regressions = 0
+    print('{0:<28} {1:<7} {2:>10} {3:>10} {4:>10} {5:>12} {6:>10}'.format(
+        'board', 'alg', 'median ms', 'stdev ms', 'processed', 'exp/sec', 'peak KB'))
+    for kind in args.kinds:
+        for size in args.sizes:
+            for density in args.densities:
+                board_name = '{0}-{1}x{1}-{2}-{3}'.format(kind, size, density, args.seed)
+                board = generate_board(kind, size, size, density, args.seed)
+                for algorithm in args.algorithms:
+                    result = measure(board, algorithm, args.repeats, args.warmup, state_class)
+                    case = '{0}/{1}'.format(board_name, algorithm)
+                    if args.state != 'Robot':  # merenja sa drugim stanjem se ne porede sa merenjima RobotState
+                        case = '{0}/{1}/{2}'.format(board_name, args.state, algorithm)
+                    results[case] = result
+                    line = '{0:<28} {1:<7} {2:>10.2f} {3:>10.2f} {4:>10} {5:>12.0f} {6:>10.1f}'.format(
+                        board_name, algorithm, result['median_ms'], result['stdev_ms'], result['processed'],
+                        result['expansions_per_sec'] or 0, result['peak_kb'])
+                    if result.get('invalid_path'):
+                        line += '  INVALID PATH'
+                    if case in baseline:
+                        case_regressions = compare(result, baseline[case], args.threshold)
+                        if case_regressions:
+                            regressions += 1
+                            line += '  REGRESSION: ' + '; '.join(case_regressions)
+                    print(line)
+                    sys.stdout.flush()
+
+    for file_path in (args.output, args.save_baseline):
+        if file_path:
+            with open(file_path, 'w') as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+    if args.baseline:
+        print('Regressions: {0}'.format(regressions))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,189 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+# moguci smerovi kretanja (desno, levo, dole, gore)
+ACTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+# dijagonalni smerovi kretanja
+DIAGONAL_ACTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+# dijagonalni, pa horizontalni i vertikalni smerovi kretanja
+ALL_ACTIONS = DIAGONAL_ACTIONS + ACTIONS
+# akcije sahovskog konja
+KNIGHT_ACTIONS = ((1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1))
+
+# sirina okvira od zidova oko prevedene table - dovoljna za najduzi potez (skok konja)
+PADDING = 2
+
+# elementi kojih na tabli ima mnogo - za njih se ne vodi indeks pozicija
+DENSE_ELEMENTS = ('.', 'w')
+
+# binarni format table (.brdb): zaglavlje (oznaka formata, verzija, broj redova, broj kolona),
+# pa jedan bajt (ASCII kod elementa) po celiji, red po red
+BINARY_MAGIC = b'BRDB'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sHII')
+BINARY_EXTENSION = '.brdb'
+
+# tabela za bytes.translate: kod zida -> 0, svi ostali kodovi -> 1 (prohodna celija)
+PASSABLE_CODES = bytes(code != ord('w') for code in range(256))
+
+
+class ByteGrid(object):
+    """
+    Elementi table kao niz bajtova - jedan bajt (ASCII kod elementa) po celiji, red po red.
+    Niz moze biti bytearray ili mmap ucitanog binarnog fajla (videti Board.load_from_binary_file) - tada se
+    tabla cita direktno iz fajla, a kopira se u bytearray tek pri prvoj izmeni.
+    Pristup je isti kao kod liste listi (grid[row][col]), a elementi od vise znakova (npr. 'b,r' koje
+    upisuje prikaz pretrage u game.py) se cuvaju posebno, dok je u nizu samo njihov prvi znak.
+    """
+
+    def __init__(self, rows, cols, buffer=None, offset=0):
+        """
+        :param buffer: bytearray ili mmap - niz kodova (podrazumevano prazna tabla).
+        :param offset: int - pocetak tabele u nizu (npr. posle zaglavlja fajla).
+        """
+        self.rows = rows
+        self.cols = cols
+        self.buffer = bytearray(b'.') * (rows * cols) if buffer is None else buffer
+        self.offset = offset
+        self.overlays = dict()  # redni broj celije -> element od vise znakova
+
+    def get(self, row, col):
+        index = row * self.cols + col
+        if self.overlays and index in self.overlays:
+            return self.overlays[index]
+        return chr(self.buffer[self.offset + index])
+
+    def set(self, row, col, element):
+        if not isinstance(self.buffer, bytearray):  # kopiranje pri prvoj izmeni
+            self.buffer = bytearray(self.get_bytes())
+            self.offset = 0
+        index = row * self.cols + col
+        if len(element) != 1:
+            self.overlays[index] = element
+        else:
+            self.overlays.pop(index, None)
+        self.buffer[index] = ord(element[0])
+
+    def get_row_bytes(self, row):
+        """
+        Kodovi elemenata jednog reda.
+        :returns: bytes ili bytearray
+        """
+        start = self.offset + row * self.cols
+        return self.buffer[start:start + self.cols]
+
+    def get_bytes(self):
+        """
+        Kodovi elemenata cele table (kopija).
+        :returns: bytes ili bytearray
+        """
+        return self.buffer[self.offset:self.offset + self.rows * self.cols]
+
+    def get_view(self):
+        """
+        Kodovi elemenata cele table, bez kopiranja.
+        :returns: memoryview
+        """
+        return memoryview(self.buffer)[self.offset:self.offset + self.rows * self.cols]
+
+    def find(self, element, start=0):
+        """
+        Redni broj prve celije sa elementom, pocevsi od celije start (-1 ako je nema).
+        Pretraga se izvrsava nad nizom bajtova (bytearray.find, mmap.find).
+        :returns: int
+        """
+        end = self.offset + self.rows * self.cols
+        index = self.buffer.find(element.encode('ascii'), self.offset + start, end)
+        return index - self.offset if index >= 0 else -1
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self.rows
+        if not 0 <= row < self.rows:
+            raise IndexError('Red van table: {0}'.format(row))
+        return ByteGridRow(self, row)
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        return (ByteGridRow(self, row) for row in range(self.rows))
+
+
+class ByteGridRow(object):
+    """
+    Jedan red ByteGrid-a, za pristup grid[row][col].
+    """
+    __slots__ = ('grid', 'row')
+
+    def __init__(self, grid, row):
+        self.grid = grid
+        self.row = row
+
+    def __getitem__(self, col):
+        if col < 0:
+            col += self.grid.cols
+        if not 0 <= col < self.grid.cols:
+            raise IndexError('Kolona van table: {0}'.format(col))
+        return self.grid.get(self.row, col)
+
+    def __setitem__(self, col, element):
+        if not 0 <= col < self.grid.cols:
+            raise IndexError('Kolona van table: {0}'.format(col))
+        self.grid.set(self.row, col, element)
+
+    def __len__(self):
+        return self.grid.cols
+
+    def __iter__(self):
+        return (self.grid.get(self.row, col) for col in range(self.grid.cols))
+
+
+class TextGrid(object):
+    """
+    Tekstovi celija table (npr. redni brojevi polja na putanji). Red se pravi tek pri prvom pristupu,
+    pa velike table na kojima se tekst ne koristi (pretrage bez graficke aplikacije) ne zauzimaju memoriju.
+    """
+
+    def __init__(self, rows, cols):
+        self.cols = cols
+        self.rows = [None] * rows
+
+    def __getitem__(self, row):
+        texts = self.rows[row]
+        if texts is None:
+            texts = self.rows[row] = [''] * self.cols
+        return texts
+
+    def get_texts(self):
+        """
+        Neprazni tekstovi celija (samo iz redova koji su napravljeni).
+        :returns: generator((int, int, str)) - red, kolona i tekst
+        """
+        for row, texts in enumerate(self.rows):
+            if texts is not None:
+                for col, text in enumerate(texts):
+                    if text:
+                        yield row, col, text
+
+    def __len__(self):
+        return len(self.rows)
+
+
+def convert_board_file(source_path, target_path):
+    """
+    Prevodjenje fajla table iz jednog formata u drugi (.brd <-> .brdb), prema ekstenzijama fajlova.
+    :param source_path: str - putanja fajla koji se prevodi.
+    :param target_path: str - putanja novog fajla.
+    """
+    board = Board()
+    board.load_from_file(source_path)
+    board.save_to_file(target_path)
+
+
 class Board:
     """
     Klasa koja implementira strukturu table.
@@ -21,22 +207,81 @@ class Board:
             'y',
             'f'
             ]
-        self.data = [['.'] * cols for _ in range(rows)]
-        self.text = [[''] * cols for _ in range(rows)]
+        self.data = ByteGrid(rows, cols)
+        self.text = TextGrid(rows, cols)
         self.teleport = False
+        # prevedena tabla (videti compile), pravi se po potrebi
+        self.passable = None
+        self.width = 0
+        self.neighbor_tables = dict()
+        # tabele tacnih udaljenosti ((cilj, akcije) -> tabela, videti heuristics.get_true_distance_table),
+        # vaze dok se prevedena tabla ne napravi ponovo
+        self.distance_fields = dict()
+        # indeks pozicija elemenata (kod elementa -> set pozicija), pravi se po potrebi
+        self.positions = None
+        # evidencija izmena za inkrementalne pretrage: redni broj sadrzaja table (povecava se kada se
+        # tabla zameni u celini - ucitavanje, brisanje) i celije kojima se od tada menjala prohodnost.
+        # Celije se pamte tek kada ih neka pretraga prati (track_wall_changes), a brisu se kada ih
+        # pretraga preuzme (videti take_wall_changes), pa evidencija ne raste dok se tabla menja.
+        self.generation = 0
+        self.track_wall_changes = False
+        self.wall_changes = []
+        self.wall_changes_taken = 0  # broj izmena iz ove generacije koje su preuzete i obrisane
+        # otisak sadrzaja table (videti get_fingerprint), racuna se po potrebi
+        self.fingerprint = None
 
     def load_from_file(self, file_path):
         """
-        Ucitavanje table iz fajla.
+        Ucitavanje table iz fajla. Fajl sa ekstenzijom .brdb se ucitava kao binarni (videti load_from_binary_file).
+        Tekstualni fajl se cita odjednom, a redovi se spajaju u jedan niz bajtova.
         :param file_path: putanja fajla.
         """
-        board_f = open(file_path, 'r')
-        row = board_f.readline().strip('\n')
-        self.data = []
-        while row != '':
-            self.data.append(list(row))
-            row = board_f.readline().strip('\n')
-        board_f.close()
+        if file_path.endswith(BINARY_EXTENSION):
+            return self.load_from_binary_file(file_path)
+        with open(file_path, 'rb') as board_f:
+            lines = board_f.read().splitlines()
+        # tabla se zavrsava prvim praznim redom
+        rows = lines.index(b'') if b'' in lines else len(lines)
+        cols = len(lines[0]) if rows else self.cols
+        if any(len(line) != cols for line in lines[:rows]):
+            raise ValueError('Redovi table u fajlu {0} nisu iste duzine.'.format(file_path))
+        if rows:
+            self.set_data(ByteGrid(rows, cols, bytearray(b''.join(lines[:rows]))))
+        else:
+            self.set_data(ByteGrid(self.rows, self.cols))
+
+    def load_from_binary_file(self, file_path):
+        """
+        Ucitavanje table iz binarnog fajla (.brdb) preko mmap-a - tabla se cita direktno iz fajla,
+        bez kopiranja, sve do prve izmene.
+        :param file_path: putanja fajla.
+        """
+        with open(file_path, 'rb') as board_f:
+            buffer = mmap.mmap(board_f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(buffer) < BINARY_HEADER.size:
+            raise ValueError('Fajl {0} nije binarni fajl table.'.format(file_path))
+        magic, version, rows, cols = BINARY_HEADER.unpack_from(buffer)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError('Fajl {0} nije binarni fajl table (verzije {1}).'.format(file_path, BINARY_VERSION))
+        if len(buffer) < BINARY_HEADER.size + rows * cols:
+            raise ValueError('Binarni fajl table {0} je nepotpun.'.format(file_path))
+        self.set_data(ByteGrid(rows, cols, buffer, BINARY_HEADER.size))
+
+    def set_data(self, data):
+        """
+        Zamena celog sadrzaja table (dimenzije table odredjuje data).
+        :param data: ByteGrid - elementi table.
+        """
+        self.data = data
+        self.rows = data.rows
+        self.cols = data.cols
+        self.text = TextGrid(self.rows, self.cols)
+        self.passable = None
+        self.positions = None
+        self.generation += 1
+        self.wall_changes = []
+        self.wall_changes_taken = 0
+        self.fingerprint = None
 
     def save_to_file(self, file_path):
         """
@@ -44,10 +289,32 @@ class Board:
         :param file_path: putanja fajla.
         """
         if file_path:
-            f = open(file_path, 'w')
-            for row in range(self.rows):
-                f.write(''.join(self.data[row]) + '\n')
-            f.close()
+            if file_path.endswith(BINARY_EXTENSION):
+                return self.save_to_binary_file(file_path)
+            with open(file_path, 'wb') as f:
+                for row in range(self.rows):
+                    f.write(self.data.get_row_bytes(row) + b'\n')
+
+    def save_to_binary_file(self, file_path):
+        """
+        Snimanje table u binarni fajl (.brdb).
+        :param file_path: putanja fajla.
+        """
+        # upis u privremeni fajl pa zamena - tabla moze biti ucitana (mmap) bas iz fajla koji se menja;
+        # svaki upis ima svoj privremeni fajl (mkstemp, isto kao cache.save_compiled_board)
+        fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(file_path) + '.', suffix='.tmp',
+                                         dir=os.path.dirname(file_path) or '.')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, self.rows, self.cols))
+                f.write(self.data.get_view())
+            os.replace(temp_path, file_path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
 
     def switch_cell(self, row, col):
         """
@@ -59,7 +326,7 @@ class Board:
             idx = self.elems.index(self.data[row][col])
             idx += 1
             idx %= len(self.elems)
-            self.data[row][col] = self.elems[idx]
+            self.set_cell(row, col, self.elems[idx])
 
     def switch_cell_backwards(self, row, col):
         """
@@ -72,28 +339,98 @@ class Board:
             idx -= 1
             if idx < 0:
                 idx = len(self.elems) - 1
-            self.data[row][col] = self.elems[idx]
+            self.set_cell(row, col, self.elems[idx])
+
+    def set_cell(self, row, col, element):
+        """
+        Upis elementa u celiju. Sve izmene sadrzaja table treba da idu preko ove metode,
+        kako bi indeks pozicija i prevedena tabla ostali azurni.
+        :param row: red celije.
+        :param col: kolona celije.
+        :param element: kod elementa.
+        """
+        old_element = self.data[row][col]
+        self.fingerprint = None
+        if old_element == 'w' or element == 'w':
+            self.passable = None
+            if old_element != element and self.track_wall_changes:
+                self.wall_changes.append((row, col))
+        if self.positions is not None:
+            if old_element in self.positions:
+                self.positions[old_element].discard((row, col))
+            if element not in DENSE_ELEMENTS:
+                self.positions.setdefault(element, set()).add((row, col))
+        self.data.set(row, col, element)
+
+    def take_wall_changes(self, index):
+        """
+        Preuzimanje izmena zidova za inkrementalnu pretragu (npr. DStarLiteSearch) - vracaju se izmene od
+        redne izmene index, a sve zapamcene izmene se brisu. Ako je deo tih izmena vec preuzela druga
+        pretraga, izmene se ne mogu vratiti, pa pretraga treba da napravi svoje tabele iznova.
+        :param index: int - broj izmena iz ove generacije koje je pretraga vec obradila.
+        :returns: (list ili None, int) - izmene (None ako nisu sve sacuvane) i broj izmena posle preuzimanja
+        """
+        start = index - self.wall_changes_taken
+        changes = self.wall_changes[start:] if start >= 0 else None
+        self.wall_changes_taken += len(self.wall_changes)
+        self.wall_changes = []
+        return changes, self.wall_changes_taken
 
     def clear(self):
         """
         Ciscenje sadrzaja cele table.
         """
-        for row in range(self.rows):
-            for col in range(self.cols):
-                self.data[row][col] = '.'
-                self.text[row][col] = ''
+        self.data = ByteGrid(self.rows, self.cols)
+        self.text = TextGrid(self.rows, self.cols)
+        self.passable = None
+        self.positions = dict()
+        self.generation += 1
+        self.wall_changes = []
+        self.wall_changes_taken = 0
+        self.fingerprint = None
+
+    def clear_text(self):
+        """
+        Brisanje tekstova svih celija.
+        """
+        self.text = TextGrid(self.rows, self.cols)
+
+    def get_positions(self, element):
+        """
+        Set pozicija elementa iz indeksa pozicija. Indeks se pravi jednim prolaskom kroz tablu,
+        pri prvom pozivu, a posle se samo azurira u set_cell.
+        :param element: kod elementa (koji nije u DENSE_ELEMENTS).
+        :returns: set(tuple(int, int))
+        """
+        if self.positions is None:
+            self.positions = dict()
+            # kodovi elemenata koji se pojavljuju na tabli, osim cestih, pa pretraga niza za svaki od njih
+            dense = ''.join(DENSE_ELEMENTS).encode('ascii')
+            for code in set(self.data.get_bytes().translate(None, dense)):
+                cell = chr(code)
+                positions = self.positions[cell] = set()
+                index = self.data.find(cell)
+                while index >= 0:
+                    positions.add(divmod(index, self.cols))
+                    index = self.data.find(cell, index + 1)
+            for index, cell in self.data.overlays.items():
+                position = divmod(index, self.cols)
+                self.positions.get(cell[0], set()).discard(position)
+                self.positions.setdefault(cell, set()).add(position)
+        return self.positions.get(element, set())
 
     def find_position(self, element):
         """
         Pronalazenje specificnog elementa unutar table.
+        Ako ih ima vise, vraca se prvi (red po red).
         :param element: kod elementa.
         :returns: tuple(int, int)
         """
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if self.data[row][col] == element:
-                    return row, col
-        return None, None
+        if element not in DENSE_ELEMENTS:
+            positions = self.get_positions(element)
+            return min(positions) if positions else (None, None)
+        index = self.data.find(element)
+        return divmod(index, self.cols) if index >= 0 else (None, None)
     
     def find_all_positions(self, element):
         """
@@ -101,11 +438,13 @@ class Board:
         :param element: kod elementa.
         :returns: list(tuple(int, int))
         """
+        if element not in DENSE_ELEMENTS:
+            return sorted(self.get_positions(element))
         positions = []
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if self.data[row][col] == element:
-                    positions.append((row, col))
+        index = self.data.find(element)
+        while index >= 0:
+            positions.append(divmod(index, self.cols))
+            index = self.data.find(element, index + 1)
         return positions
 
     def move_player_keyboard(self, direction):
@@ -117,28 +456,101 @@ class Board:
             self.teleport = False
             teleport_position = self.find_position('y')
             if (teleport_position[0] != None):
-                self.data[position[0]][position[1]] = '.'
-                self.data[teleport_position[0]][teleport_position[1]] = 'r'
+                self.set_cell(position[0], position[1], '.')
+                self.set_cell(teleport_position[0], teleport_position[1], 'r')
                 return position[0], position[1], teleport_position[0], teleport_position[1]
         if all([p is not None for p in position]):
             d_row, d_col = Board.get_direction_keyboard(direction)
             new_row = position[0] + d_row
             new_col = position[1] + d_col
             if 0 <= new_row < self.rows and 0 <= new_col < self.cols and self.data[new_row][new_col] != 'w':
-                self.data[position[0]][position[1]] = '.'
+                self.set_cell(position[0], position[1], '.')
                 new_position = new_row, new_col
                 if self.data[new_position[0]][new_position[1]] == 'y':
                     self.teleport = True
-                self.data[new_position[0]][new_position[1]] = 'r'
+                self.set_cell(new_position[0], new_position[1], 'r')
         
                 
         return position[0], position[1], new_position[0], new_position[1]
     
+    def get_fingerprint(self):
+        """
+        Otisak (hash) sadrzaja table - iste table imaju isti otisak.
+        Racuna se jednom i pamti dok se tabla ne izmeni.
+        :returns: str
+        """
+        if self.fingerprint is None:
+            content = hashlib.sha1('{0}x{1}\n'.format(self.rows, self.cols).encode('ascii'))
+            content.update(self.data.get_view())
+            for index, element in sorted(self.data.overlays.items()):
+                content.update('\n{0}:{1}'.format(index, element).encode('utf-8'))
+            self.fingerprint = content.hexdigest()
+        return self.fingerprint
+
+    def get_cell_index(self, row, col):
+        """
+        Redni broj celije u tabli (red po red).
+        :param row: red celije.
+        :param col: kolona celije.
+        :returns: int
+        """
+        return row * self.cols + col
+
+    def get_index_bits(self):
+        """
+        Broj bitova potreban za redni broj bilo koje celije table.
+        Iznad ovih bitova stanja mogu pakovati svoje dodatne informacije.
+        :returns: int
+        """
+        return (self.rows * self.cols).bit_length()
+
+    def compile(self):
+        """
+        Prevodjenje table u niz prohodnosti (bytearray) sa okvirom od zidova oko table.
+        Celija (row, col) se nalazi na indeksu (row + PADDING) * width + col + PADDING, pa se sused
+        dobija samo dodavanjem pomeraja akcije, bez provere granica table.
+        Tabele suseda i tabele udaljenosti se prave iznova nakon svakog prevodjenja.
+        """
+        self.width = self.cols + 2 * PADDING
+        self.passable = bytearray(self.width * (self.rows + 2 * PADDING))
+        for row in range(self.rows):
+            start = (row + PADDING) * self.width + PADDING
+            self.passable[start:start + self.cols] = self.data.get_row_bytes(row).translate(PASSABLE_CODES)
+        self.neighbor_tables = dict()
+        self.distance_fields = dict()
+
+    def get_legal_moves(self, position, actions):
+        """
+        Legalni potezi iz zadate pozicije - potezi koji ne izlaze van table i ne udaraju u zid.
+        Potezi se racunaju jednom po celiji i skupu akcija i pamte u tabeli suseda.
+        :param position: (int, int) - pozicija.
+        :param actions: tuple - skup akcija (ACTIONS, ALL_ACTIONS, KNIGHT_ACTIONS...).
+        :returns: tuple(((int, int), (int, int))) - nove pozicije i akcije koje do njih vode.
+        """
+        if self.passable is None:
+            self.compile()
+        table = self.neighbor_tables.get(actions)
+        if table is None:
+            # pomeraji akcija u prevedenoj tabli i prazna tabela suseda (popunjava se po potrebi)
+            offsets = tuple((action, action[0] * self.width + action[1]) for action in actions)
+            table = self.neighbor_tables[actions] = (offsets, [None] * (self.rows * self.cols))
+        offsets, moves = table
+        row, col = position
+        index = row * self.cols + col
+        if moves[index] is None:
+            start = (row + PADDING) * self.width + col + PADDING
+            passable = self.passable
+            moves[index] = tuple(((row + action[0], col + action[1]), action)
+                                 for action, offset in offsets if passable[start + offset])
+        return moves[index]
+
     def is_out_of_bounds(self, row, col):
         return row < 0 or row >= self.rows or col < 0 or col >=self.cols
     
     def hits_wall(self, row, col):
-        return self.data[row][col] == 'w'
+        if self.passable is not None:  # citanje iz prevedene table, bez pristupa elementima
+            return not self.passable[(row + PADDING) * self.width + col + PADDING]
+        return self.data.get(row, col) == 'w'
 
     @staticmethod
     def get_direction_keyboard(direction):
@@ -0,0 +1,280 @@
+from collections import OrderedDict
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+try:
+    from .board import Board, PADDING, ACTIONS
+    from .heuristics import get_true_distance_table
+except ImportError:  # pokrenuto iz direktorijuma robot (python main.py)
+    from board import Board, PADDING, ACTIONS
+    from heuristics import get_true_distance_table
+
+
+# Kes prevedene table na disku: fajl pored fajla table (zadatak.brd -> zadatak.brd.cache) sa prevedenom
+# tablom (Board.passable), indeksom pozicija elemenata i tabelama tacnih udaljenosti (Board.distance_fields).
+# Format: zaglavlje (COMPILED_HEADER - oznaka formata, verzija, otisak table, duzina opisa), opis sadrzaja
+# kao JSON, pa nizovi bajtova i float-ova, svaki poravnat na 8 bajtova. Fajl se ucitava preko mmap-a,
+# pa prevedena tabla i tabele udaljenosti ostaju u fajlu (memoryview nad mmap-om) i ne kopiraju se.
+COMPILED_MAGIC = b'BRDC'
+COMPILED_VERSION = 1
+COMPILED_HEADER = struct.Struct('<4sH20sI')  # oznaka, verzija, otisak (sha1), duzina JSON opisa
+COMPILED_ALIGN = 8
+
+
+class PathCache(object):
+    """
+    Kes rezultata pretraga, sa izbacivanjem najdavnije koriscenog rezultata (LRU) kada se popuni.
+    Kljuc je otisak sadrzaja table (Board.get_fingerprint), klasa stanja i klasa pretrage sa svojim podesavanjima
+    (State.get_config, Search.get_config) i pocetna i krajnja pozicija, pa isti upit nad istom tablom vraca
+    zapamceni rezultat bez ponovne pretrage.
+    Uz rezultat se pamti i statistika pretrage (broj procesiranih stanja, iteracije, ishod), koja se kod
+    pogotka prepisuje u objekat pretrage, pa on izgleda isto kao da je pretraga izvrsena.
+    Rezultati se pamte i vracaju kao torke (videti freeze_result), pa se mogu deliti izmedju upita.
+    """
+
+    def __init__(self, maxsize=32):
+        """
+        :param maxsize: int - najveci broj zapamcenih rezultata.
+        """
+        self.maxsize = maxsize
+        # kljuc -> ((path, processed_list, states_list), statistika pretrage), od najdavnije koriscenog
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def search(self, search, initial_state):
+        """
+        Pretraga preko kesa - ako je isti upit vec izvrsen, vraca se zapamceni rezultat.
+        :param search: Search - objekat pretrage.
+        :param initial_state: klasa inicijalnog stanja.
+        :return: path, processed_list, states_list - torke (path je None ako nema resenja)
+        """
+        key = self.get_key(search, initial_state)
+        entry = self.results.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.results.move_to_end(key)
+            result, stats = entry
+            self.restore_stats(search, result, stats)
+            return result
+        self.misses += 1
+        result = self.freeze_result(search.search(initial_state))
+        self.results[key] = (result, self.get_stats(search))
+        if len(self.results) > self.maxsize:
+            self.results.popitem(last=False)
+        return result
+
+    def get_key(self, search, initial_state):
+        """
+        Kljuc upita. Pocetna i krajnja pozicija se citaju iz indeksa pozicija table, bez pravljenja stanja.
+        :return: tuple
+        """
+        board = search.board
+        return (board.get_fingerprint(), initial_state, initial_state.get_config(), search.__class__,
+                search.get_config(), board.find_position('r'), board.find_position('g'))
+
+    @staticmethod
+    def freeze_result(result):
+        """
+        Rezultat pretrage kao torke - liste i red stanja pretrage se ne dele sa kesom, pa izmena rezultata
+        (ili ponovno pokretanje istog objekta pretrage) ne menja zapamceni rezultat.
+        :return: path, processed_list, states_list
+        """
+        path, processed, states = result
+        return (tuple(path) if path is not None else None, tuple(processed) if processed is not None else None,
+                tuple(states))
+
+    @staticmethod
+    def get_stats(search):
+        """
+        Statistika izvrsene pretrage koja se pamti uz rezultat.
+        :return: dict
+        """
+        stats = {'processed_count': search.processed_count, 'outcome': search.outcome}
+        if hasattr(search, 'iterations'):
+            stats['iterations'] = list(search.iterations)
+        return stats
+
+    @staticmethod
+    def restore_stats(search, result, stats):
+        """
+        Prepisivanje zapamcenog rezultata i statistike u objekat pretrage (kod pogotka).
+        """
+        search.path, search.processed_list, search.states_list = result
+        search.processed_count = stats['processed_count']
+        search.outcome = stats['outcome']
+        if 'iterations' in stats:
+            search.iterations = list(stats['iterations'])
+
+    def clear(self):
+        self.results.clear()
+
+    def __len__(self):
+        return len(self.results)
+
+    def __repr__(self):
+        return 'PathCache(size={0}/{1}, hits={2}, misses={3})'.format(
+            len(self.results), self.maxsize, self.hits, self.misses)
+
+
+def get_compiled_path(file_path):
+    """
+    Putanja kesa prevedene table za fajl table.
+    :returns: str
+    """
+    return file_path + '.cache'
+
+
+def save_compiled_board(board, file_path):
+    """
+    Snimanje prevedene table, indeksa pozicija i tabela udaljenosti u kes na disku.
+    Ako tabla ima cilj, uz ostale tabele udaljenosti se uvek snima i tabela udaljenosti do cilja.
+    :param board: Board - tabla.
+    :param file_path: str - putanja kesa (videti get_compiled_path).
+    """
+    goal_position = board.find_position('g')
+    if None not in goal_position:
+        get_true_distance_table(board, goal_position, ACTIONS)
+    elif board.passable is None:
+        board.compile()
+
+    sections = []  # delovi fajla posle opisa, redom
+    offset = 0
+
+    def add_section(data):
+        nonlocal offset
+        start = offset
+        size = len(data)
+        sections.append(data)
+        offset += size
+        gap = -offset % COMPILED_ALIGN
+        if gap:
+            sections.append(bytes(gap))
+            offset += gap
+        return [start, size]
+
+    index = {
+        'rows': board.rows,
+        'cols': board.cols,
+        'padding': PADDING,
+        'passable': add_section(bytes(board.passable)),
+        'positions': {element: sorted(board.get_positions(element)) for element in sorted(board.positions)},
+        'fields': [{'target': target, 'actions': actions, 'table': add_section(bytes(table))}
+                   for (target, actions), table in board.distance_fields.items()],
+    }
+    description = json.dumps(index).encode('utf-8')
+    description += b' ' * (-(COMPILED_HEADER.size + len(description)) % COMPILED_ALIGN)  # JSON dozvoljava razmake
+    header = COMPILED_HEADER.pack(COMPILED_MAGIC, COMPILED_VERSION, bytes.fromhex(board.get_fingerprint()),
+                                  len(description))
+    # upis u privremeni fajl pa zamena, da drugi proces nikad ne procita napola upisan kes - svaki upis ima
+    # svoj privremeni fajl (mkstemp), pa se ni procesi koji istovremeno snimaju kes iste table ne mesaju
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(file_path) + '.', suffix='.tmp',
+                                     dir=os.path.dirname(file_path) or '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(description)
+            for data in sections:
+                f.write(data)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_compiled_board(board, file_path):
+    """
+    Ucitavanje kesa prevedene table u tablu, bez kopiranja (mmap).
+    Kes se prihvata samo ako je napravljen za isti sadrzaj table (isti otisak, videti Board.get_fingerprint)
+    i ako je ispravan (videti read_compiled_board) - inace se vraca False, pa se tabla prevodi iznova.
+    :param board: Board - tabla ucitana iz fajla table.
+    :param file_path: str - putanja kesa (videti get_compiled_path).
+    :returns: bool - True ako je kes ucitan
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # kes ne postoji ili je prazan
+        return False
+    try:
+        passable, positions, fields = read_compiled_board(board, data)
+    except (ValueError, TypeError, KeyError, AttributeError, struct.error):  # kes je ostecen (npr. skracen)
+        passable = None
+    if passable is None:  # kes je ostecen ili napravljen za drugi sadrzaj table
+        data.close()
+        return False
+    board.passable = passable
+    board.width = board.cols + 2 * PADDING
+    board.neighbor_tables = dict()
+    board.positions = positions
+    board.distance_fields = fields
+    return True
+
+
+def read_compiled_board(board, data):
+    """
+    Citanje kesa prevedene table iz mmap-a, uz proveru da su svi delovi fajla unutar fajla i odgovarajuce velicine.
+    :param board: Board - tabla za koju se kes cita.
+    :param data: mmap - sadrzaj kesa.
+    :returns: (memoryview, dict, dict) - prevedena tabla, indeks pozicija i tabele udaljenosti,
+        ili (None, None, None) ako kes nije napravljen za isti sadrzaj table
+    :raises ValueError, TypeError, KeyError, AttributeError, struct.error: ako je kes ostecen
+    """
+    magic, version, fingerprint, description_size = COMPILED_HEADER.unpack_from(data)
+    if magic != COMPILED_MAGIC or version != COMPILED_VERSION or fingerprint.hex() != board.get_fingerprint():
+        return None, None, None
+    start = COMPILED_HEADER.size
+    if start + description_size > len(data):
+        raise ValueError('Opis kesa izlazi van fajla.')
+    index = json.loads(data[start:start + description_size].decode('utf-8'))
+    if index['padding'] != PADDING or index['rows'] != board.rows or index['cols'] != board.cols:
+        return None, None, None
+    start += description_size
+    size = (board.rows + 2 * PADDING) * (board.cols + 2 * PADDING)  # velicina prevedene table
+    field_size = board.rows * board.cols * 8  # velicina tabele udaljenosti (float-ovi, bez okvira)
+
+    def check_section(section, expected_size):
+        offset, length = section
+        if not (isinstance(offset, int) and isinstance(length, int)):
+            raise TypeError('Neispravan opis dela kesa.')
+        if offset < 0 or length != expected_size or start + offset + length > len(data):
+            raise ValueError('Deo kesa izlazi van fajla ili nije odgovarajuce velicine.')
+        return start + offset, start + offset + length
+
+    # sve granice se proveravaju pre pravljenja pogleda (memoryview) na mmap
+    passable_bounds = check_section(index['passable'], size)
+    field_bounds = [((tuple(field['target']), tuple(map(tuple, field['actions']))),
+                     check_section(field['table'], field_size))
+                    for field in index['fields']]
+    positions = {element: set(map(tuple, element_positions))
+                 for element, element_positions in index['positions'].items()}
+    view = memoryview(data)
+    passable = view[passable_bounds[0]:passable_bounds[1]]
+    fields = {key: view[begin:end].cast('d') for key, (begin, end) in field_bounds}
+    return passable, positions, fields
+
+
+def load_board(file_path, board=None):
+    """
+    Ucitavanje table iz fajla, zajedno sa kesom prevedene table ako postoji i odgovara sadrzaju table.
+    Ako kes ne postoji ili je zastareo, tabla se prevodi i kes se snima iznova.
+    :param file_path: str - putanja fajla table.
+    :param board: Board - tabla u koju se ucitava (podrazumevano nova tabla).
+    :returns: Board
+    """
+    if board is None:
+        board = Board()
+    board.load_from_file(file_path)
+    compiled_path = get_compiled_path(file_path)
+    if not load_compiled_board(board, compiled_path):
+        try:
+            save_compiled_board(board, compiled_path)
+        except OSError:  # npr. direktorijum table je samo za citanje - tabla radi i bez kesa
+            pass
+    return board
@@ -0,0 +1,136 @@
+from collections import deque
+from abc import *
+import heapq
+import itertools
+
+
+class Frontier(object):
+    """
+    Apstraktna klasa za skup stanja koja cekaju na obradu (frontier).
+    Pretraga preko nje dodaje, uzima i izbacuje stanja, ne znajuci kako su stanja zapravo smestena.
+    """
+
+    @abstractmethod
+    def push(self, state):
+        """
+        Dodavanje stanja u frontier.
+        :param state: State - stanje koje ceka na obradu.
+        """
+        pass
+
+    @abstractmethod
+    def pop(self):
+        """
+        Uzimanje sledeceg stanja za obradu.
+        :return: State
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, state):
+        """
+        Izbacivanje stanja iz frontier-a (npr. kada je pronadjeno isto stanje sa manjom cenom).
+        :param state: State - stanje koje se izbacuje.
+        """
+        pass
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    @abstractmethod
+    def __iter__(self):
+        pass
+
+
+class SelectFrontier(Frontier):
+    """
+    Frontier nad obicnim deque-om, gde se sledece stanje bira funkcijom select_state pretrage.
+    Ovo je originalni (referentni) nacin rada - odabir je linearan u broju stanja.
+    Izbacena stanja se ne brisu iz deque-a (to bi bilo linearno), vec se samo oznace i preskacu kada ih
+    select_state odabere (lazy deletion, isto kao kod PriorityFrontier).
+    """
+
+    def __init__(self, select_state):
+        self.states = deque()
+        self.select_state = select_state
+        self.removed = set()  # id-jevi izbacenih stanja koja su jos u deque-u
+
+    def push(self, state):
+        self.states.append(state)
+
+    def pop(self):
+        removed = self.removed
+        while True:
+            state = self.select_state(self.states)
+            if not removed or id(state) not in removed:
+                return state
+            removed.discard(id(state))  # stanje je izaslo iz deque-a, pa se id vise ne prati
+
+    def remove(self, state):
+        # izbaceno stanje ostaje u deque-u dok ga select_state ne odabere, pa se njegov id ne moze ponovo dodeliti
+        self.removed.add(id(state))
+
+    def __len__(self):
+        return len(self.states) - len(self.removed)
+
+    def __iter__(self):
+        removed = self.removed
+        return (state for state in self.states if id(state) not in removed)
+
+
+class PriorityFrontier(Frontier):
+    """
+    Frontier implementiran kao binarni heap (heapq), za vodjene pretrage.
+    Stanje sa najmanjim prioritetom se uzima u O(log n) umesto linearnog prolaska kroz sva stanja.
+    Kod jednakih prioriteta prednost ima stanje koje je ranije dodato (isto kao i kod linearnog odabira).
+    Izbacena stanja se ne brisu iz heap-a odmah, vec se samo oznace i preskacu prilikom uzimanja (lazy deletion).
+    """
+
+    REMOVED = None  # oznaka za izbaceno stanje unutar heap-a
+
+    def __init__(self, priority, key=None):
+        """
+        :param priority: funkcija koja za stanje vraca prioritet (manji prioritet = ranija obrada).
+        :param key: funkcija koja za stanje vraca jedinstveni kljuc (podrazumevano get_state_key).
+        """
+        self.priority = priority
+        self.key = key if key is not None else (lambda state: state.get_state_key())
+        self.heap = []  # elementi heap-a: [prioritet, redni broj, stanje]
+        self.entries = dict()  # kljuc stanja -> element heap-a
+        self.counter = itertools.count()  # redni broj dodavanja, za stabilno razresavanje jednakih prioriteta
+
+    def push(self, state):
+        key = self.key(state)
+        if key in self.entries:  # stanje sa istim kljucem je zamenjeno novim
+            self.entries.pop(key)[-1] = PriorityFrontier.REMOVED
+        entry = [self.priority(state), next(self.counter), state]
+        self.entries[key] = entry
+        heapq.heappush(self.heap, entry)
+
+    def pop(self):
+        while self.heap:
+            state = heapq.heappop(self.heap)[-1]
+            if state is not PriorityFrontier.REMOVED:
+                del self.entries[self.key(state)]
+                return state
+        raise KeyError('Frontier je prazan.')
+
+    def remove(self, state):
+        entry = self.entries.pop(self.key(state))
+        entry[-1] = PriorityFrontier.REMOVED
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return (entry[-1] for entry in self.entries.values())
+
+    def peek_priority(self):
+        """
+        Prioritet sledeceg stanja za obradu, bez uzimanja stanja iz frontier-a.
+        :return: float (float('inf') ako je frontier prazan)
+        """
+        while self.heap and self.heap[0][-1] is PriorityFrontier.REMOVED:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else float('inf')
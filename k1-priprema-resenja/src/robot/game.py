@@ -1,54 +1,61 @@
 import tkinter as tk
 from tkinter import filedialog
 import tkinter.font as tkFont
-import os
 import sys
+import threading
 import time
-from PIL import Image, ImageTk  # pip install --upgrade Pillow
-
-from board import Board
-from search import *
-from state import *
-
-
-
-search_class_map = {
-    "BFS": BreadthFirstSearch,
-    "DFS": DepthFirstSearch,
-    "IDFS": IterativeDepthFirstSearch,
-    "UCS": UniformCostSearch,
-    "GS": GreedySearch,
-    "A*": AStarSearch 
-}
-
-
-# mapiranje sadrzaja table na boju celije
-board_to_colors = {
-    '.': 'white',
-    'w': 'gray',
-    'g': 'orangered',
-    'b': 'blue',
-    'y': 'yellow'
-    }
-# mapiranje sadrzaja table na ikonicu
-board_to_icons = {
-    'r': 'robot.png',
-    'f': 'fire.png'
-}
+from PIL import ImageTk  # pip install --upgrade Pillow
+
+try:
+    from .analysis import HEAT_MODES, get_expansion_heat, get_positions
+    from .board import Board
+    from .cache import PathCache, load_board
+    from .renderer import BoardRenderer, MARK_VISITED, MARK_PATH, MARK_FRONTIER
+    from .replay import Replay
+    from .search import *
+    from .state import *
+except ImportError:  # pokrenuto iz direktorijuma robot (python main.py)
+    from analysis import HEAT_MODES, get_expansion_heat, get_positions
+    from board import Board
+    from cache import PathCache, load_board
+    from renderer import BoardRenderer, MARK_VISITED, MARK_PATH, MARK_FRONTIER
+    from replay import Replay
+    from search import *
+    from state import *
+
+
+# vrste fajlova tabli u dijalozima za ucitavanje i snimanje (.brdb - binarni format, videti Board.save_to_binary_file)
+BOARD_FILETYPES = (('board files', '*.brd'), ('binary board files', '*.brdb'), ('All files', '*.*'))
+# najveca pocetna velicina prikaza table (u pikselima) - veca tabla se prikazuje umanjeno, uz zoom i pomeranje
+MAX_VIEWPORT = 800
+# faktor uvecanja za jedan korak tockica misa
+ZOOM_FACTOR = 1.25
+# period (ms) provere pretrage koja se izvrsava u pozadini (videti poll_search)
+POLL_INTERVAL = 50
+# period (ms) iscrtavanja reprodukcije pretrage i najvise vremena (s) za citanje dogadjaja po iscrtavanju
+REPLAY_INTERVAL = 30
+REPLAY_BUDGET = 0.015
+# podrazumevana brzina reprodukcije (procesiranih stanja u sekundi) i najveca brzina na klizacu
+REPLAY_SPEED = 5
+MAX_REPLAY_SPEED = 2000
 
 
 class RobotGame:
 
-    def __init__(self, rows=20, cols=20, board_file_path='boards/board.brd', default_search="BFS"):
+    def __init__(self, rows=20, cols=20, board_file_path='boards/board.brd', default_search="BFS",
+                 default_state="Robot"):
         
         self.rows = rows  # broj redova table
         self.cols = cols  # broj kolona table
         self.cell_size = 40  # velicina celije
         self.board = Board(rows=self.rows, cols=self.cols)
-
-
-        self.grid_elem_ids = [[[]] * self.cols for _ in range(self.rows)]
-        self.grid_text_ids = [[[]] * self.cols for _ in range(self.rows)]
+        # tabla se iscrtava kao jedna slika (videti BoardRenderer), prikazana u jednom elementu canvas-a
+        width = min(self.cols * self.cell_size, MAX_VIEWPORT) + 1
+        height = min(self.rows * self.cell_size, MAX_VIEWPORT) + 1
+        self.renderer = BoardRenderer(self.board, width, height, self.cell_size)
+        self.board_image = None  # ImageTk.PhotoImage prikazane slike
+        self.redraw_job = None  # zakazano iscrtavanje (videti schedule_redraw)
+        self.pan_start = None  # poslednja tacka pri pomeranju prikaza misem
 
 
         self.root = tk.Tk()
@@ -58,29 +65,39 @@ class RobotGame:
         self.ui2 = tk.Frame(self.root, bg='white')
 
 
-        self.canvas = tk.Canvas(self.root, width=self.cols * self.cell_size + 1, height=self.rows * self.cell_size + 1,
+        self.canvas = tk.Canvas(self.root, width=width, height=height,
                         highlightthickness=0, bd=0, bg='white')
-        
-
-        self.canvas.icons = dict()
-        self.icons = dict()
-        for f in os.listdir('icons'):
-            icon = Image.open(os.path.join('icons', f))
-            icon = icon.resize((self.cell_size - 2, self.cell_size - 2), Image.LANCZOS)  # resize icon to fit cell
-            icon = ImageTk.PhotoImage(icon)
-            self.icons[f] = icon
+        self.canvas_image = self.canvas.create_image(0, 0, anchor=tk.NW)
 
         self.search_class_text = tk.StringVar(self.ui)
         self.search_class_text.set(default_search)
+        # kog "agenta" koristiti (state_class_map) - od njega zavisi koje se pretrage nude (videti set_state_class)
+        self.state_class_text = tk.StringVar(self.ui)
+        self.state_class_text.set(default_state)
+        self.state_class_text.trace_add('write', self.set_state_class)
+        # prikaz analize poslednje pretrage (videti show_overlay): intenzitet obrade celija ili samo oznake
+        self.overlay_text = tk.StringVar(self.ui)
+        self.overlay_text.set(HEAT_MODES[0])
+        self.overlay_text.trace_add('write', self.show_overlay)
 
 
         # create buttons
-        search_option = tk.OptionMenu(self.ui, self.search_class_text, *search_class_map.keys())
+        self.search_option = search_option = tk.OptionMenu(self.ui, self.search_class_text,
+                                                           *get_search_class_map(self.get_state_class()).keys())
+        state_option = tk.OptionMenu(self.ui, self.state_class_text, *state_class_map.keys())
+        overlay_option = tk.OptionMenu(self.ui, self.overlay_text, 'none', *HEAT_MODES)
         start_button = tk.Button(self.ui, text='SEARCH', width=10, command=self.do_search)
         restart_button = tk.Button(self.ui, text='RESET', width=10, command=self.reset)
         clear_button = tk.Button(self.ui, text='CLEAR ALL', width=10, command=self.clear)
         debug_button = tk.Button(self.ui, text='DEBUG', width=10, command=self.debug)
-        stat_report = tk.Label(self.root, text='      ', bg='white', justify=tk.LEFT, relief=tk.GROOVE,
+        cancel_button = tk.Button(self.ui, text='CANCEL', width=10, command=self.cancel_search)
+        pause_button = tk.Button(self.ui, text='PAUSE', width=10, command=self.pause_replay)
+        self.speed_scale = tk.Scale(self.ui, label='Speed', from_=1, to=MAX_REPLAY_SPEED, orient=tk.HORIZONTAL,
+                                    command=self.set_replay_speed)
+        self.speed_scale.set(REPLAY_SPEED)
+        self.seek_scale = tk.Scale(self.ui, label='Frame', from_=0, to=0, orient=tk.HORIZONTAL,
+                                   command=self.seek_replay)
+        self.stat_report = stat_report = tk.Label(self.root, text='      ', bg='white', justify=tk.LEFT, relief=tk.GROOVE,
                             font=tkFont.Font(weight='bold'))
         
 
@@ -90,24 +107,47 @@ class RobotGame:
         clear_button.grid(row=3, column=0, padx=10, pady=10)
         restart_button.grid(row=4, column=0, padx=10, pady=10)
         debug_button.grid(row=5, column=0, padx=10, pady=10)
+        cancel_button.grid(row=6, column=0, padx=10, pady=10)
+        pause_button.grid(row=7, column=0, padx=10, pady=10)
+        self.speed_scale.grid(row=8, column=0, padx=10, pady=10)
+        self.seek_scale.grid(row=9, column=0, padx=10, pady=10)
+        overlay_option.grid(row=10, column=0, padx=10, pady=10)
+        state_option.grid(row=11, column=0, padx=10, pady=10)
 
 
-        self.display_board()
         self.canvas.bind('<Button-1>', self.switch_cell)  # bind left mouse click event to function switch_cell
         self.canvas.bind('<Button-2>', self.switch_cell_backwards)  # bind middle mouse click event to function switch_cell_backwards (right click on macOS)
         self.canvas.bind('<Button-3>', self.switch_cell_backwards)  # bind right mouse click event to function switch_cell_backwards
         self.root.bind('<Key>', self.key)  # bind keyboard event to function key
+        self.canvas.bind('<Shift-Button-1>', self.start_pan)  # pomeranje prikaza: Shift + prevlacenje misem
+        self.canvas.bind('<Shift-B1-Motion>', self.pan)
+        self.canvas.bind('<MouseWheel>', self.zoom)  # zoom: tockic misa (Windows, macOS)
+        self.canvas.bind('<Button-4>', self.zoom)  # zoom: tockic misa (Linux)
+        self.canvas.bind('<Button-5>', self.zoom)
+        self.canvas.bind('<Configure>', self.resize)
         self.ui.pack(side=tk.RIGHT, expand=tk.YES, fill=tk.BOTH)
         self.canvas.pack(side=tk.TOP, expand=tk.YES, fill=tk.BOTH)
         self.ui2.pack(side=tk.LEFT, expand=tk.YES, fill=tk.BOTH, anchor=tk.W)
         stat_report.pack(side=tk.RIGHT, expand=tk.NO, fill=tk.NONE)
 
 
-        self.load_board(board_file_path)
-
-
         self.processed = None
         self.path = None
+        self.result = None  # rezultat poslednje pretrage: path, processed_list, states_list
+        self.result_search = None  # objekat pretrage koja je dala rezultat (videti replan)
+        self.searches = dict()  # klasa pretrage -> objekat inkrementalne pretrage (videti get_search)
+        self.path_cache = PathCache()  # rezultati prethodnih pretraga (isti upit nad istom tablom)
+        # pretraga koja se izvrsava u pozadini (videti do_search): nit, objekat pretrage, pocetak i rezultat
+        self.worker = None
+        self.running_search = None
+        self.search_start = None
+        self.search_result = None
+        # reprodukcija pretrage (videti debug): Replay i zakazani korak
+        self.replay = None
+        self.replay_job = None
+
+
+        self.load_board(board_file_path)
 
     def run(self):
         self.root.mainloop()
@@ -116,150 +156,128 @@ class RobotGame:
     def load_board_from_file(self, filename=None):
         if filename is None:
             filename = filedialog.askopenfilename(defaultextension='.brd',
-                                                    filetypes=(('board files', '*.brd'), ('All files', '*.*')),
+                                                    filetypes=BOARD_FILETYPES,
                                                     initialdir="./boards")
-        self.board.load_from_file(filename)
+        load_board(filename, self.board)
         return filename
 
 
     def save_board_to_file(self):
         filename = filedialog.asksaveasfilename(defaultextension='.brd',
-                                                filetypes=(('board files', '*.brd'), ('All files', '*.*')))
+                                                filetypes=BOARD_FILETYPES)
         self.board.save_to_file(filename)
 
 
     def load_board(self, from_file=None):      # filename passed when reopening (resetting) same file
+        if self.is_searching():
+            return
         self.load_board_from_file(from_file)
+        self.renderer.clear_marks()
+        self.renderer.fit()
         self.display_board()
 
 
     def clear(self):
+        if self.is_searching():
+            return
         self.board.clear()
+        self.renderer.clear_marks()
         self.display_board()
 
 
     def reset(self):
-        for row in range(self.rows):
-            for col in range(self.cols):
-                self.delete_texts(row, col)
+        if self.is_searching():  # rezultat pretrage koja je u toku bi se iscrtao preko ociscene table
+            return
+        self.board.clear_text()
+        self.result = None
+        self.renderer.clear_marks()
+        self.renderer.set_heat(None)
         self.display_board()
 
 
     def key(self, event):
+        if self.is_searching():
+            return
         k = event.keysym.lower()
         row, col, new_row, new_col = self.board.move_player_keyboard(k)
-        state = RobotState(self.board, action=(new_row - row, new_col - col))
+        state = self.get_state_class()(self.board, action=(new_row - row, new_col - col))
         print(f'g: {state.get_current_cost():.2f} | h: {state.get_cost_estimate():.2f}')
 
         if self.board.find_position('r') != (None, None):
             self.update_board(row, col)
             self.update_board(new_row, new_col)
+            self.replan()
 
 
     def switch_cell(self, event, row=None, col=None):
         if row is None and col is None:
-            cx = event.x
-            cy = event.y
-            col = cx // self.cell_size  # column
-            row = cy // self.cell_size  # row
+            cell = self.renderer.get_cell(event.x, event.y)
+            if cell is None:  # klik van table
+                return
+            row, col = cell
+        if self.is_searching():
+            return
         self.board.switch_cell(row, col)
         self.update_board(row, col)
+        self.replan()
 
     def switch_cell_backwards(self, event, row=None, col=None):
         if row is None and col is None:
-            cx = event.x
-            cy = event.y
-            col = cx // self.cell_size  # column
-            row = cy // self.cell_size  # row
+            cell = self.renderer.get_cell(event.x, event.y)
+            if cell is None:  # klik van table
+                return
+            row, col = cell
+        if self.is_searching():
+            return
         self.board.switch_cell_backwards(row, col)
         self.update_board(row, col)
+        self.replan()
 
 
     def update_board(self, row, col):
-        data = self.board.data
-        text = self.board.text
-        self.delete_elems(row, col)
-        elem = data[row][col]
-        d, i = elem, elem
-        if ',' in elem:
-            s = elem.split(',')
-            d = s[0]
-            i = s[1]
-
-        if d in board_to_colors:
-            self.draw_rectangle(row, col, board_to_colors[d])
-        if i in board_to_icons:
-            icon = self.icons[board_to_icons[i]]
-            self.draw_icon(row, col, icon)
-
-        if len(text[row][col]) > 0:
-            self.draw_text(row, col, text[row][col])
-        else:
-            self.delete_texts(row, col)
-
-
-    def get_cell_rectangle(self, row, col):
-        return col * self.cell_size, row * self.cell_size, (col + 1) * self.cell_size, (row + 1) * self.cell_size
+        # celija se ne iscrtava posebno - izmene se skupljaju i cela slika prikaza se iscrtava jednom
+        self.schedule_redraw()
 
 
-    def draw_rectangle(self, row, col, color, width=1):
-        rect = self.get_cell_rectangle(row, col)
-        elem_id = self.canvas.create_rectangle(rect, width=width, fill=color, outline='gray')
-        self.save_elem_id(elem_id, row, col)
+    def schedule_redraw(self):
+        """
+        Zakazivanje iscrtavanja prikaza kada glavna nit zavrsi tekuci dogadjaj, pa se vise izmena
+        (npr. sve celije putanje) iscrtava odjednom.
+        """
+        if self.redraw_job is None:
+            self.redraw_job = self.root.after_idle(self.redraw)
 
 
-    def draw_text(self, row, col, text):
-        rect = self.get_cell_rectangle(row, col)
-        l = tk.Label(self.canvas, text=text)
-        l.bind('<Button-1>', lambda event: self.switch_cell(event, row, col))
-        elem_id = self.canvas.create_window(rect[0] + self.cell_size/2, rect[1] + self.cell_size/2, height=self.cell_size/3, window=l)
-        self.save_elem_id(elem_id, row, col)
-        self.save_text_id(elem_id, row, col)
+    def redraw(self):
+        self.redraw_job = None
+        self.board_image = ImageTk.PhotoImage(self.renderer.render())
+        self.canvas.itemconfig(self.canvas_image, image=self.board_image)
 
 
-    def draw_icon(self, row, col, icon):
-        rect = self.get_cell_rectangle(row, col)
-        elem_id = self.canvas.create_image(rect[0]+2, rect[1]+2, image=icon, anchor=tk.NW)
-        self.canvas.icons[elem_id] = icon
-        self.save_elem_id(elem_id, row, col)
-
-
-    def save_elem_id(self, elem_id, row, col):
-        if len(self.grid_elem_ids[row][col]) == 0:
-            self.grid_elem_ids[row][col] = []
-        self.grid_elem_ids[row][col].append(elem_id)
+    def display_board(self):
+        self.schedule_redraw()
 
 
-    def save_text_id(self, elem_id, row, col):
-        if len(self.grid_text_ids[row][col]) == 0:
-            self.grid_text_ids[row][col] = []
-        self.grid_text_ids[row][col].append(elem_id)
+    def start_pan(self, event):
+        self.pan_start = (event.x, event.y)
 
 
-    def delete_elems(self, row, col): 
-        if 0 <= row < self.rows and 0 <= col < self.cols:
-            for elem_id in self.grid_elem_ids[row][col]:
-                self.canvas.delete(elem_id)
-                if elem_id in self.canvas.icons:
-                    del self.canvas.icons[elem_id]
-            self.grid_elem_ids[row][col] = []
+    def pan(self, event):
+        if self.pan_start is not None:
+            self.renderer.pan(self.pan_start[0] - event.x, self.pan_start[1] - event.y)
+            self.pan_start = (event.x, event.y)
+            self.schedule_redraw()
 
 
-    def delete_texts(self, row, col):
-        if 0 <= row < self.rows and 0 <= col < self.cols:
-            for elem_id in self.grid_text_ids[row][col]:
-                self.canvas.delete(elem_id)
-                if elem_id in self.canvas.icons:
-                    del self.canvas.icons[elem_id]
-            self.grid_text_ids[row][col] = []
-            self.board.text[row][col] = ''
+    def zoom(self, event):
+        zoom_in = event.num == 4 or getattr(event, 'delta', 0) > 0
+        self.renderer.zoom(ZOOM_FACTOR if zoom_in else 1 / ZOOM_FACTOR, event.x, event.y)
+        self.schedule_redraw()
 
 
-    def display_board(self):
-        self.canvas.delete(tk.ALL)
-        for row in range(len(self.board.data)):
-            for col in range(len(self.board.data[0])):
-                self.update_board(row, col)
+    def resize(self, event):
+        self.renderer.set_viewport(event.width, event.height)
+        self.schedule_redraw()
 
 
     def make_menu(self, win):
@@ -277,22 +295,127 @@ class RobotGame:
 
 
 
+    def get_state_class(self):
+        return state_class_map[self.state_class_text.get()]
+
+    def set_state_class(self, *args):
+        """
+        Promena agenta - u meniju pretraga ostaju samo pretrage koje ga podrzavaju (videti Search.supports).
+        """
+        names = list(get_search_class_map(self.get_state_class()))
+        menu = self.search_option['menu']
+        menu.delete(0, tk.END)
+        for name in names:
+            menu.add_command(label=name, command=tk._setit(self.search_class_text, name))
+        if self.search_class_text.get() not in names:
+            self.search_class_text.set(names[0])
+
     def get_search_class(self):
-        return search_class_map[self.search_class_text.get()]
+        return get_search_class_map(self.get_state_class())[self.search_class_text.get()]
+
+    def get_search(self):
+        """
+        Objekat izabrane pretrage. Inkrementalne pretrage (npr. D* Lite) cuvaju tabele izmedju pokretanja,
+        pa se za njih koristi isti objekat, koji posle izmena table ponovo obradjuje samo ono sto je izmenjeno.
+        """
+        search_class = self.get_search_class()
+        if not getattr(search_class, 'incremental', False):
+            return search_class(self.board)
+        search = self.searches.get(search_class)
+        if search is None:
+            search = self.searches[search_class] = search_class(self.board)
+        return search
+
+    def replan(self):
+        """
+        Posle izmene table (zid, robot, cilj) se ponovo pokrece inkrementalna pretraga koja je dala prikazani
+        rezultat (npr. D* Lite) - ona obradjuje samo ono sto je izmenjeno, pa se putanja azurira odmah.
+        """
+        if self.result is not None and self.result_search is self.searches.get(self.get_search_class()):
+            self.do_search()
+
+    def is_searching(self):
+        """
+        Da li se pretraga izvrsava u pozadini ili reprodukuje - tada se tabla ne sme menjati.
+        """
+        return self.worker is not None or self.replay is not None
 
     # funkcija koja se poziva na dugme SEARCH
     def do_search(self):
+        """
+        Pokretanje pretrage u posebnoj niti, da prozor ne bi bio blokiran dok pretraga traje.
+        Napredak i kraj pretrage se proveravaju periodicno iz glavne niti (videti poll_search).
+        """
+        if self.is_searching():
+            return
         self.reset()
         # koju strategiju pretrage koristiti
-        search_class = self.get_search_class()
-        search = search_class(self.board)
+        search = self.get_search()
+        search.cancelled = False
         # kog "agenta" koristiti
-        initial_state = RobotState
+        initial_state = self.get_state_class()
 
         # pokreni pretragu, meri vreme izvrsavanja
-        start = time.perf_counter()
-        path, self.processed, states = search.search(initial_state)
-        end = time.perf_counter()
+        self.running_search = search
+        self.search_result = None
+        self.search_start = time.perf_counter()
+        self.worker = threading.Thread(target=self.run_search, args=(search, initial_state), daemon=True)
+        self.worker.start()
+        self.stat_report.config(text='Searching...')
+        self.root.after(POLL_INTERVAL, self.poll_search)
+
+    def run_search(self, search, initial_state):
+        """
+        Izvrsava se u niti pretrage - ne pristupa tkinter-u, vec samo ostavlja rezultat u search_result.
+        """
+        try:
+            result = self.path_cache.search(search, initial_state)
+            self.search_result = ('done', result, time.perf_counter())
+        except SearchCancelledException as e:
+            self.search_result = ('cancelled', e, time.perf_counter())
+        except Exception as e:
+            self.search_result = ('error', e, time.perf_counter())
+
+    def poll_search(self):
+        """
+        Periodicna provera pretrage iz glavne niti (root.after) - prikaz napretka, a po zavrsetku i rezultata.
+        """
+        search = self.running_search
+        if self.worker.is_alive():
+            self.stat_report.config(text='Processed: {0}'.format(search.processed_count))
+            self.root.after(POLL_INTERVAL, self.poll_search)
+            return
+        self.worker = None
+        self.running_search = None
+        status, result, end = self.search_result
+        self.stat_report.config(text='Processed: {0}'.format(search.processed_count))
+        if status == 'done':
+            self.show_search_result(search, result, end - self.search_start)
+            return
+        # inkrementalna pretraga prekinuta u toku nema ispravne tabele - sledeci put se pravi nova
+        self.searches.pop(search.__class__, None)
+        if status == 'cancelled':
+            print('-'*15, 'CANCELLED', '-'*15)
+        else:
+            print('-'*15, 'ERROR', '-'*15)
+            print('{0}: {1}'.format(type(result).__name__, result))
+
+    def cancel_search(self):
+        """
+        Prekid pretrage koja se izvrsava u pozadini - nit pretrage se zavrsava posle sledeceg stanja.
+        Prekida se i reprodukcija pretrage.
+        """
+        if self.replay is not None:
+            self.stop_replay()
+        elif self.worker is not None:
+            self.running_search.cancel()
+            self.stat_report.config(text='Cancelling...')
+
+    def show_search_result(self, search, result, duration):
+        """
+        Ispis i iscrtavanje rezultata zavrsene pretrage.
+        """
+        path, self.processed, states = result
         print(self.path)
         if path is not None:
             self.path = map(lambda x: x.position, path)
@@ -300,15 +423,19 @@ class RobotGame:
             self.path = []
 
         print('-'*15, 'DONE', '-'*15)
-        print('Time: {0} ms'.format(end - start))
+        print('Time: {0} ms'.format(duration * 1000))
         print('Processed nodes: {0}'.format(len(self.processed)))
         print('States left: {0}'.format(len(states)))
+        print('Cache: {0} hits, {1} misses'.format(self.path_cache.hits, self.path_cache.misses))
+        if hasattr(search, 'iterations'):
+            print('Iterations: {0}'.format(len(search.iterations)))
         if path is None:
             print('-'*15, 'NO SOLUTION', '-'*15)
         else:
             if len(path) != 0:
                 print('Total cost: {0}'.format(path[-1].get_current_cost()))
             # ako je bilo resenja, iscrtaj ga
+            self.path = list(self.path)
             for idx, p in enumerate(self.path):
                 text = self.board.text[p[0]][p[1]]
                 if len(text) == 0:
@@ -316,34 +443,104 @@ class RobotGame:
                 else:
                     text += ',' + str(idx)
                 self.board.text[p[0]][p[1]] = text
-                self.update_board(p[0], p[1])
-
-
-    # funkcija za debagovanje, u eksperimentalnoj fazi :)
-    def move_icon(self, from_position, to_position, has_box=None):
-        f = self.board.data[from_position[0]][from_position[1]]
-        t = self.board.data[to_position[0]][to_position[1]]
-        if ',' in f:
-            s = f.split(',')
-            f = s[0]
-            if has_box:
-                t = 'b,' + s[1]
-            else:
-                t += ',' + s[1]
-        else:
-            t += ',' + f
-            f = '.'
-        self.board.data[from_position[0]][from_position[1]] = f
-        self.update_board(from_position[0], from_position[1])
-        self.board.data[to_position[0]][to_position[1]] = t
-        self.update_board(to_position[0], to_position[1])
-        self.root.update()
+        self.result = result
+        self.result_search = search
+        self.show_overlay()
+
+    def show_overlay(self, *args):
+        """
+        Prikaz analize poslednje pretrage preko table: intenzitet obrade celija (redosled ili broj obrada,
+        videti analysis.get_expansion_heat), stanja koja su cekala na obradu i putanja.
+        Sve se racuna odjednom iz rezultata pretrage i iscrtava u jednom prolazu.
+        """
+        self.renderer.clear_marks()
+        self.renderer.set_heat(None)
+        if self.result is not None:
+            path, processed, states = self.result
+            mode = self.overlay_text.get()
+            if mode in HEAT_MODES and processed:
+                self.renderer.set_heat(get_expansion_heat(self.board, processed, mode))
+            self.renderer.mark(get_positions(states), MARK_FRONTIER)
+            if path:
+                self.renderer.mark(get_positions(path), MARK_PATH)
+        self.display_board()
 
 
+    # funkcija za debagovanje - reprodukcija toka pretrage
     def debug(self):
+        """
+        Reprodukcija pretrage - robot se pomera kroz procesirana stanja, redom obrade.
+        Koraci se zakazuju preko root.after (videti replay_step), pa prozor ostaje aktivan: brzina se menja
+        klizacem Speed, PAUSE zaustavlja i nastavlja reprodukciju, a klizacem Frame se ide na bilo koji frejm.
+        """
+        if self.is_searching():
+            return
         self.reset()
-        position = self.board.find_position('r')
-        for idx, p in enumerate(self.processed):
-            self.move_icon(position, p.position, hasattr(p, 'has_box') and p.has_box)
-            position = p.position
-            time.sleep(0.2)
+        search = self.get_search()
+        self.running_search = search
+        self.replay = Replay(search.iter_search(self.get_state_class()), speed=self.speed_scale.get())
+        self.replay_step()
+
+    def replay_step(self):
+        """
+        Jedan korak reprodukcije - svi frejmovi koji su od proslog koraka trebali biti prikazani
+        se iscrtavaju odjednom.
+        """
+        replay = self.replay
+        frames = replay.advance(REPLAY_BUDGET)
+        if frames:
+            self.draw_replay_frames(frames)
+        self.seek_scale.config(to=len(replay))
+        self.seek_scale.set(replay.index)
+        self.stat_report.config(text='Frame: {0}/{1}{2}'.format(
+            replay.index, len(replay), '' if replay.finished else '+'))
+        if replay.is_done():
+            print('-'*15, 'REPLAY DONE', '-'*15)
+            self.stop_replay()
+            return
+        self.replay_job = self.root.after(REPLAY_INTERVAL, self.replay_step)
+
+    def draw_replay_frames(self, frames):
+        """
+        Iscrtavanje vise frejmova odjednom: oznaka obidjenih celija i robot na poslednjoj poziciji.
+        """
+        self.renderer.mark(frames, MARK_VISITED)
+        self.renderer.agent = frames[-1]
+        self.schedule_redraw()
+
+    def stop_replay(self):
+        """
+        Kraj reprodukcije - brisanje oznaka i robota reprodukcije.
+        """
+        if self.replay_job is not None:
+            self.root.after_cancel(self.replay_job)
+            self.replay_job = None
+        if not self.replay.finished:
+            # inkrementalna pretraga prekinuta u toku nema ispravne tabele - sledeci put se pravi nova
+            self.searches.pop(self.running_search.__class__, None)
+        self.renderer.clear_marks(MARK_VISITED)
+        self.renderer.agent = None
+        self.schedule_redraw()
+        self.replay = None
+        self.running_search = None
+
+    def pause_replay(self):
+        if self.replay is not None:
+            self.replay.toggle_pause()
+
+    def set_replay_speed(self, value):
+        if self.replay is not None:
+            self.replay.speed = float(value)
+
+    def seek_replay(self, value):
+        """
+        Pomeranje reprodukcije na frejm sa klizaca Frame - oznake obidjenih celija se crtaju iznova.
+        """
+        replay = self.replay
+        if replay is None or int(value) == replay.index:
+            return
+        replay.seek(int(value), REPLAY_BUDGET)
+        self.renderer.clear_marks(MARK_VISITED)
+        # na frejmu 0 robot je na pocetnoj poziciji
+        frames = replay.frames[:replay.index] or [self.board.find_position('r')]
+        self.draw_replay_frames(frames)
@@ -0,0 +1,103 @@
+from array import array
+from functools import lru_cache
+import math
+
+try:
+    from .board import PADDING
+except ImportError:  # pokrenuto iz direktorijuma robot (python main.py)
+    from board import PADDING
+
+
+# Tabele heuristika: vrednost heuristike za svaku celiju table, izracunata unapred, jednim prolaskom kroz tablu.
+# Celija (row, col) je u tabeli na indeksu row * cols + col (videti Board.get_cell_index),
+# pa stanje h(n) dobija jednim citanjem iz niza, umesto da ga racuna za svaki cvor pretrage.
+# Tabele zavise samo od dimenzija table i ciljne pozicije, pa se dele izmedju svih stanja i pretraga.
+# Tabele se ne smeju menjati.
+
+METRICS = ('manhattan', 'diagonal', 'euclidian')
+
+
+@lru_cache(maxsize=128)
+def get_distance_table(metric, rows, cols, target, divisor=1):
+    """
+    Tabela udaljenosti svih celija table od ciljne pozicije.
+    Vrednost za celiju je distance / divisor.
+    :param metric: str - 'manhattan', 'diagonal' ili 'euclidian'.
+    :param rows: int - broj redova table.
+    :param cols: int - broj kolona table.
+    :param target: (int, int) - ciljna pozicija.
+    :param divisor: deljenik udaljenosti (npr. 3 za procenu broja skokova konja).
+    :returns: array('d')
+    """
+    if metric not in METRICS:
+        raise ValueError('Nepoznata metrika: {0}'.format(metric))
+    target_row, target_col = target
+    # udaljenosti po kolonama su iste za svaki red, pa se racunaju samo jednom
+    col_distances = [abs(col - target_col) for col in range(cols)]
+    table = array('d')
+    for row in range(rows):
+        d_row = abs(row - target_row)
+        if metric == 'manhattan':
+            distances = [d_row + d_col for d_col in col_distances]
+        elif metric == 'diagonal':
+            distances = [max(d_row, d_col) for d_col in col_distances]
+        else:
+            distances = [math.sqrt(d_row ** 2 + d_col ** 2) for d_col in col_distances]
+        if divisor != 1:
+            distances = [distance / divisor for distance in distances]
+        table.extend(distances)
+    return table
+
+
+def get_true_distance_table(board, target, actions):
+    """
+    Tabela tacnih udaljenosti (najmanjeg broja poteza) svih celija table do ciljne pozicije,
+    uzimajuci u obzir zidove. Racuna se jednom pretragom u sirinu unazad, od cilja, nad prevedenom tablom.
+    Tabele se pamte po sadrzaju prevedene table, pa se za istu tablu ne racunaju ponovo, a uz to i u samoj
+    tabli (Board.distance_fields), odakle se mogu snimiti u kes prevedene table (videti cache.save_compiled_board).
+    Za celije iz kojih se cilj ne moze dostici udaljenost je float('inf').
+    :param board: Board - tabla.
+    :param target: (int, int) - ciljna pozicija.
+    :param actions: tuple - skup akcija kojima se robot krece (npr. ACTIONS, KNIGHT_ACTIONS).
+    :returns: array('d') ili memoryview('d') (tabela ucitana iz kesa)
+    """
+    if board.passable is None:
+        board.compile()
+    table = board.distance_fields.get((target, actions))
+    if table is None:
+        table = compute_true_distance_table(bytes(board.passable), board.rows, board.cols, target, actions)
+        board.distance_fields[(target, actions)] = table
+    return table
+
+
+@lru_cache(maxsize=32)
+def compute_true_distance_table(passable, rows, cols, target, actions):
+    """
+    Pretraga u sirinu od ciljne pozicije nad prevedenom tablom (videti Board.compile).
+    :param passable: bytes - prevedena tabla sa okvirom od zidova.
+    :returns: array('d')
+    """
+    width = cols + 2 * PADDING
+    # robot do cilja dolazi akcijom (d_row, d_col), pa se od cilja ide suprotnim pomerajima
+    offsets = [-(d_row * width + d_col) for d_row, d_col in actions]
+    distances = array('d', [float('inf')]) * len(passable)
+    start = (target[0] + PADDING) * width + target[1] + PADDING
+    distances[start] = 0
+    layer = [start]
+    distance = 0
+    while layer:
+        distance += 1
+        next_layer = []
+        for index in layer:
+            for offset in offsets:
+                neighbor = index + offset
+                if passable[neighbor] and distances[neighbor] > distance:
+                    distances[neighbor] = distance
+                    next_layer.append(neighbor)
+        layer = next_layer
+    # izbacivanje okvira - tabela se indeksira kao i ostale tabele heuristika
+    table = array('d')
+    for row in range(rows):
+        start = (row + PADDING) * width + PADDING
+        table.extend(distances[start:start + cols])
+    return table
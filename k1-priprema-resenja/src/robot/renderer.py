@@ -0,0 +1,276 @@
+import os
+
+from PIL import Image, ImageChops, ImageDraw  # pip install --upgrade Pillow
+
+
+# mapiranje sadrzaja table na boju celije
+board_to_colors = {
+    '.': 'white',
+    'w': 'gray',
+    'g': 'orangered',
+    'b': 'blue',
+    'y': 'yellow'
+    }
+# mapiranje sadrzaja table na ikonicu
+board_to_icons = {
+    'r': 'robot.png',
+    'f': 'fire.png'
+}
+# direktorijum sa ikonicama
+ICONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'icons')
+
+# oznake celija preko sadrzaja table (videti BoardRenderer.mark) - kodovi koji se ne koriste kao elementi table,
+# pa se u paleti slike nalaze zajedno sa kodovima elemenata
+MARK_VISITED = 1  # celija obidjena u pretrazi
+MARK_PATH = 2  # celija na pronadjenoj putanji
+MARK_FRONTIER = 3  # celija sa stanjem koje je cekalo na obradu kada se pretraga zavrsila
+mark_to_colors = {
+    MARK_VISITED: 'lightgreen',
+    MARK_PATH: 'lightskyblue',
+    MARK_FRONTIER: 'violet',
+}
+# boje intenziteta obrade celija (videti analysis.get_expansion_heat) - od svetlo zute (1) do tamno crvene (255)
+HEAT_COLORS = ((255, 255, 178), (189, 0, 38))
+
+# tabela za Image.point: 255 za kod prazne celije, 0 za ostale
+EMPTY_MASK = [255 if code == ord('.') else 0 for code in range(256)]
+
+BACKGROUND = 'white'
+GRID_COLOR = 'gray'
+# najmanja velicina celije (u pikselima) od koje se crtaju linije mreze, ikonice i tekst
+GRID_MIN_SIZE = 6
+ICON_MIN_SIZE = 10
+TEXT_MIN_SIZE = 16
+# granice velicine celije pri zumiranju
+MIN_CELL_SIZE = 1
+MAX_CELL_SIZE = 80
+
+
+def get_palette():
+    """
+    Paleta slike table: boja za svaki kod elementa (ASCII) i za svaku oznaku, ostali kodovi su boje pozadine.
+    :returns: list(int) - 256 RGB trojki
+    """
+    colors = [BACKGROUND] * 256
+    for element, color in board_to_colors.items():
+        colors[ord(element)] = color
+    for mark, color in mark_to_colors.items():
+        colors[mark] = color
+    palette = []
+    for color in colors:
+        palette.extend(Image.new('RGB', (1, 1), color).getpixel((0, 0)))
+    return palette
+
+
+def get_heat_palette():
+    """
+    Paleta intenziteta obrade: linearni prelaz izmedju boja HEAT_COLORS za intenzitete 1-255.
+    :returns: list(int) - 256 RGB trojki
+    """
+    (r1, g1, b1), (r2, g2, b2) = HEAT_COLORS
+    palette = [0, 0, 0]
+    for level in range(1, 256):
+        t = (level - 1) / 254
+        palette.extend((int(r1 + (r2 - r1) * t), int(g1 + (g2 - g1) * t), int(b1 + (b2 - b1) * t)))
+    return palette
+
+
+class BoardRenderer(object):
+    """
+    Iscrtavanje table u jednu sliku (PIL), umesto posebnog elementa canvas-a za svaku celiju.
+    Slika pokriva samo vidljivi deo table (viewport): kodovi vidljivih celija se citaju direktno iz table
+    (Board.data, jedan bajt po celiji) kao slika sa paletom od jednog piksela po celiji, koja se zatim uvecava
+    na velicinu celije. Intenzitet obrade celija (heatmap) i oznake (obidjene celije, frontier, putanja) se cuvaju
+    kao nizovi bajtova iste velicine kao tabla i prenose preko slike odjednom. Linije mreze, ikonice i tekst se
+    crtaju samo za vidljive celije, i samo kada su celije dovoljno velike.
+    Prikaz se pomera (pan) i uvecava (zoom) promenom pomeraja i velicine celije.
+    """
+
+    def __init__(self, board, width, height, cell_size=40):
+        """
+        :param board: Board - tabla koja se iscrtava.
+        :param width: int - sirina prikaza u pikselima.
+        :param height: int - visina prikaza u pikselima.
+        :param cell_size: int - velicina celije u pikselima.
+        """
+        self.board = board
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.x = 0  # pomeraj prikaza u pikselima (gornji levi ugao prikaza u slici cele table)
+        self.y = 0
+        self.palette = get_palette()
+        self.heat_palette = get_heat_palette()
+        self.marks = bytearray(board.rows * board.cols)  # oznaka za svaku celiju (0 - bez oznake)
+        self.heat = None  # intenzitet obrade za svaku celiju (videti set_heat)
+        self.agent = None  # pozicija na kojoj se dodatno crta robot (npr. u reprodukciji pretrage)
+        self.icons = dict()  # (naziv fajla, velicina) -> ikonica
+
+    def set_viewport(self, width, height):
+        self.width = width
+        self.height = height
+        self.clamp()
+
+    def fit(self):
+        """
+        Velicina celije pri kojoj cela tabla staje u prikaz (najvise 40 piksela).
+        """
+        size = min(self.width // max(self.board.cols, 1), self.height // max(self.board.rows, 1))
+        self.cell_size = max(MIN_CELL_SIZE, min(40, size))
+        self.x = self.y = 0
+
+    def clamp(self):
+        """
+        Ogranicavanje pomeraja tako da prikaz ne izlazi van table.
+        """
+        self.x = max(0, min(self.x, self.board.cols * self.cell_size - self.width))
+        self.y = max(0, min(self.y, self.board.rows * self.cell_size - self.height))
+
+    def pan(self, dx, dy):
+        self.x += dx
+        self.y += dy
+        self.clamp()
+
+    def zoom(self, factor, x, y):
+        """
+        Promena velicine celije, tako da celija ispod tacke (x, y) prikaza ostane na istom mestu.
+        :param factor: float - faktor uvecanja (npr. 1.25 ili 0.8).
+        """
+        old_size = self.cell_size
+        size = int(round(old_size * factor))
+        if size == old_size:
+            size += 1 if factor > 1 else -1
+        self.cell_size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, size))
+        self.x = int((self.x + x) * self.cell_size / old_size) - x
+        self.y = int((self.y + y) * self.cell_size / old_size) - y
+        self.clamp()
+
+    def get_cell(self, x, y):
+        """
+        Celija table ispod tacke (x, y) prikaza.
+        :returns: (int, int) ili None ako tacka nije na tabli
+        """
+        row, col = (self.y + y) // self.cell_size, (self.x + x) // self.cell_size
+        if 0 <= row < self.board.rows and 0 <= col < self.board.cols:
+            return row, col
+        return None
+
+    def get_visible_cells(self):
+        """
+        Opseg vidljivih celija.
+        :returns: (int, int, int, int) - prvi red, prva kolona, red i kolona posle poslednje vidljive celije
+        """
+        size = self.cell_size
+        row0, col0 = max(0, self.y // size), max(0, self.x // size)
+        row1 = min(self.board.rows, -(-(self.y + self.height) // size))
+        col1 = min(self.board.cols, -(-(self.x + self.width) // size))
+        return row0, col0, row1, col1
+
+    def mark(self, positions, mark):
+        """
+        Oznacavanje celija (npr. MARK_VISITED, MARK_PATH).
+        :param positions: iterable((int, int)) - pozicije celija.
+        """
+        self.check_marks()
+        cols, marks = self.board.cols, self.marks
+        for row, col in positions:
+            marks[row * cols + col] = mark
+
+    def clear_marks(self, mark=None):
+        """
+        Brisanje oznaka - svih, ili samo zadate oznake.
+        """
+        if mark is None or len(self.marks) != self.board.rows * self.board.cols:
+            self.marks = bytearray(self.board.rows * self.board.cols)
+        else:
+            table = bytearray(range(256))
+            table[mark] = 0
+            self.marks = self.marks.translate(table)
+
+    def check_marks(self):
+        # posle ucitavanja table drugih dimenzija oznake se brisu
+        if len(self.marks) != self.board.rows * self.board.cols:
+            self.clear_marks()
+            self.heat = None
+
+    def set_heat(self, heat):
+        """
+        Intenzitet obrade celija koji se prikazuje ispod oznaka (None - bez prikaza).
+        :param heat: bytearray - vrednost 0-255 za svaku celiju (videti analysis.get_expansion_heat).
+        """
+        self.heat = heat
+
+    def get_icon(self, file_name, size):
+        """
+        Ikonica za iscrtavanje - ucitava se i prilagodjava velicini celije pri prvom koriscenju.
+        """
+        icon = self.icons.get((file_name, size))
+        if icon is None:
+            icon = Image.open(os.path.join(ICONS_DIR, file_name)).convert('RGBA')
+            icon = self.icons[(file_name, size)] = icon.resize((size, size), Image.LANCZOS)
+        return icon
+
+    def render(self):
+        """
+        Iscrtavanje vidljivog dela table.
+        :returns: PIL.Image ('RGB', velicine prikaza)
+        """
+        image = Image.new('RGB', (self.width, self.height), BACKGROUND)
+        row0, col0, row1, col1 = self.get_visible_cells()
+        if row0 >= row1 or col0 >= col1:
+            return image
+        self.check_marks()
+        size = self.cell_size
+        rows, cols = row1 - row0, col1 - col0
+        left, top = col0 * size - self.x, row0 * size - self.y
+
+        # slika vidljivih celija - jedan piksel po celiji, kod elementa kao indeks u paleti
+        data, board_cols = self.board.data, self.board.cols
+        codes = b''.join(bytes(data.get_row_bytes(row)[col0:col1]) for row in range(row0, row1))
+        cells = Image.frombytes('P', (cols, rows), codes)
+        cells.putpalette(self.palette)
+        cells = cells.convert('RGB')
+        # intenzitet obrade, pa oznake - prikazuju se samo na praznim celijama, da ne bi sakrili zidove,
+        # kutije i cilj
+        empty = Image.frombytes('L', (cols, rows), codes).point(EMPTY_MASK)
+        for layer, palette in ((self.heat, self.heat_palette), (self.marks, self.palette)):
+            if layer is None:
+                continue
+            values = b''.join(bytes(layer[row * board_cols + col0:row * board_cols + col1])
+                              for row in range(row0, row1))
+            if any(values):
+                mask = ImageChops.multiply(Image.frombytes('L', (cols, rows), values).point([0] + [255] * 255),
+                                           empty)
+                overlay = Image.frombytes('P', (cols, rows), values)
+                overlay.putpalette(palette)
+                cells.paste(overlay.convert('RGB'), mask=mask)
+        cells = cells.resize((cols * size, rows * size), Image.NEAREST)
+        image.paste(cells, (left, top))
+
+        draw = ImageDraw.Draw(image)
+        if size >= GRID_MIN_SIZE:
+            right, bottom = left + cols * size, top + rows * size
+            for col in range(cols + 1):
+                draw.line([(left + col * size, top), (left + col * size, bottom)], fill=GRID_COLOR)
+            for row in range(rows + 1):
+                draw.line([(left, top + row * size), (right, top + row * size)], fill=GRID_COLOR)
+        if size >= ICON_MIN_SIZE:
+            icons = [(position, file_name) for element, file_name in board_to_icons.items()
+                     for position in self.board.get_positions(element)]
+            if self.agent is not None:
+                icons.append((self.agent, board_to_icons['r']))
+            for (row, col), file_name in icons:
+                if row0 <= row < row1 and col0 <= col < col1:
+                    icon = self.get_icon(file_name, size - 2)
+                    image.paste(icon, (left + (col - col0) * size + 1, top + (row - row0) * size + 1), icon)
+        elif self.agent is not None:
+            row, col = self.agent
+            if row0 <= row < row1 and col0 <= col < col1:
+                x, y = left + (col - col0) * size, top + (row - row0) * size
+                draw.rectangle([x, y, x + size - 1, y + size - 1], fill='black')
+        if size >= TEXT_MIN_SIZE:
+            for row, col, text in self.board.text.get_texts():
+                if row0 <= row < row1 and col0 <= col < col1:
+                    x, y = left + (col - col0) * size + size // 2, top + (row - row0) * size + size // 2
+                    draw.text((x, y), text, fill='black', anchor='mm')
+        return image
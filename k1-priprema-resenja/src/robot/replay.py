@@ -0,0 +1,89 @@
+import time
+
+
+class Replay(object):
+    """
+    Reprodukcija toka pretrage (videti Search.iter_search) zadatom brzinom, nezavisno od prikaza.
+    Dogadjaji se citaju iz toka tek kada su potrebni, a citanje u jednom koraku je ograniceno vremenom,
+    pa korak reprodukcije ne blokira prikaz ni kada je pretraga velika.
+    Ako je prikaz u zaostatku, korak vraca sve frejmove koji su u medjuvremenu trebali biti prikazani,
+    pa ih prikaz iscrtava odjednom (preskakanje frejmova) umesto jedan po jedan.
+    Procitani frejmovi (pozicije procesiranih stanja) se pamte, pa se reprodukcija moze vratiti unazad (seek).
+    """
+
+    def __init__(self, events, speed=5.0, clock=time.perf_counter):
+        """
+        :param events: iterator SearchEvent-a (npr. search.iter_search(RobotState)).
+        :param speed: float - broj frejmova (procesiranih stanja) u sekundi.
+        :param clock: funkcija koja vraca trenutno vreme u sekundama.
+        """
+        self.events = iter(events)
+        self.frames = []  # pozicije procesiranih stanja, redom obrade
+        self.finished = False  # da li su procitani svi dogadjaji
+        self.index = 0  # broj prikazanih frejmova
+        self.position = 0.0  # broj frejmova koji je do sada trebao biti prikazan (sa delom frejma)
+        self.speed = speed
+        self.paused = False
+        self.clock = clock
+        self.last_time = None  # vreme poslednjeg koraka
+
+    def read(self, count, deadline):
+        """
+        Citanje dogadjaja dok se ne procita count frejmova ili ne istekne vreme.
+        :param count: int - zeljeni broj procitanih frejmova.
+        :param deadline: float - vreme (clock) do kog se cita.
+        """
+        frames = self.frames
+        while not self.finished and len(frames) < count:
+            event = next(self.events, None)
+            if event is None:
+                self.finished = True
+            else:
+                frames.append(event.state.position)
+                if self.clock() >= deadline:
+                    break
+
+    def advance(self, budget):
+        """
+        Korak reprodukcije - pomeranje do frejma koji je po proteklom vremenu i brzini trebao biti prikazan.
+        :param budget: float - najvise vremena (u sekundama) za citanje dogadjaja u ovom koraku.
+        :returns: list - pozicije frejmova koje treba iscrtati (prazna lista ako nema novih)
+        """
+        now = self.clock()
+        if not self.paused and self.last_time is not None:
+            self.position += (now - self.last_time) * self.speed
+        self.last_time = now
+        target = int(self.position)
+        if target > len(self.frames):
+            self.read(target, now + budget)
+        if self.position > len(self.frames):  # pretraga ne stize - zaostatak se ne gomila
+            self.position = len(self.frames)
+            target = len(self.frames)
+        frames = self.frames[self.index:target]
+        self.index = max(self.index, target)
+        return frames
+
+    def seek(self, index, budget=None):
+        """
+        Pomeranje reprodukcije na zadati frejm (unapred ili unazad).
+        :param index: int - broj prikazanih frejmova posle pomeranja.
+        :param budget: float - najvise vremena za citanje dogadjaja (podrazumevano bez ogranicenja).
+        :returns: int - broj prikazanih frejmova (manji od index ako pretraga ima manje stanja)
+        """
+        if index > len(self.frames):
+            self.read(index, float('inf') if budget is None else self.clock() + budget)
+        self.index = min(max(index, 0), len(self.frames))
+        self.position = float(self.index)
+        return self.index
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def is_done(self):
+        """
+        Da li su prikazani svi frejmovi.
+        """
+        return self.finished and self.index == len(self.frames)
+
+    def __len__(self):
+        return len(self.frames)
@@ -1,76 +1,381 @@
 from __future__ import print_function
 
+from array import array
 from collections import deque
 from abc import *
+import heapq
+import time
+
+try:
+    from .board import PADDING, ALL_ACTIONS
+    from .frontier import SelectFrontier, PriorityFrontier
+except ImportError:  # pokrenuto iz direktorijuma robot (python main.py)
+    from board import PADDING, ALL_ACTIONS
+    from frontier import SelectFrontier, PriorityFrontier
+
+
+class PredecessorMap(object):
+    """
+    Kompaktna evidencija predaka stanja, umesto roditeljskih referenci.
+    Svako prihvaceno stanje dobija redni broj (cvor), a za cvor se u nizovima pamte samo cvor roditelja,
+    redni broj polja i kod akcije. Stanja zato ne moraju da drze ceo lanac predaka u memoriji, a putanja
+    se na kraju pravi ponovnim izvrsavanjem akcija od pocetnog stanja.
+    Cvorovi se ne poistovecuju sa kljucem stanja, jer cena nastavka moze zavisiti od akcije
+    kojom se doslo u stanje - tako je ponovo napravljena putanja uvek ista kao pronadjena.
+    """
+
+    __slots__ = ('board', 'parents', 'cells', 'action_codes', 'actions', 'codes')
+
+    def __init__(self, board):
+        self.board = board
+        self.parents = array('i')  # cvor -> cvor roditelja (-1 za pocetno stanje)
+        self.cells = array('i')  # cvor -> redni broj polja stanja (videti Board.get_cell_index)
+        self.action_codes = array('B')  # cvor -> kod akcije koja je dovela do stanja
+        self.actions = [None]  # kod -> akcija
+        self.codes = {None: 0}  # akcija -> kod
+
+    def add(self, parent, state):
+        """
+        Dodavanje cvora za stanje.
+        :param parent: int - cvor roditeljskog stanja (-1 za pocetno stanje).
+        :return: int - cvor stanja
+        """
+        code = self.codes.get(state.action)
+        if code is None:
+            code = self.codes[state.action] = len(self.actions)
+            self.actions.append(state.action)
+        self.parents.append(parent)
+        self.cells.append(self.board.get_cell_index(*state.position))
+        self.action_codes.append(code)
+        return len(self.parents) - 1
+
+    def reconstruct_path(self, initial_state, node):
+        """
+        Putanja od pocetnog stanja do stanja zadatog cvora - stanja se prave ponovo, klasom pocetnog stanja.
+        :param initial_state: pocetno stanje (cvor 0).
+        :param node: int - cvor krajnjeg stanja.
+        :return: list
+        """
+        nodes = []
+        while self.parents[node] != -1:
+            nodes.append(node)
+            node = self.parents[node]
+        path = [initial_state]
+        for node in reversed(nodes):
+            state = path[-1]
+            position = divmod(self.cells[node], self.board.cols)
+            path.append(state.__class__(self.board, state, position, state.goal_position,
+                                        self.actions[self.action_codes[node]]))
+        return path
+
+    def __len__(self):
+        return len(self.parents)
+
+
+class SearchEvent(object):
+    """
+    Dogadjaj pretrage - obrada (prosirivanje) jednog stanja.
+    Cena g i procena h se racunaju tek kada se procitaju.
+    """
+
+    __slots__ = ('state', 'frontier_size')
+
+    def __init__(self, state, frontier_size):
+        self.state = state  # procesirano stanje
+        self.frontier_size = frontier_size  # broj stanja koja cekaju na obradu
+
+    @property
+    def g(self):
+        return self.state.get_current_cost()
+
+    @property
+    def h(self):
+        return self.state.get_cost_estimate()
+
+    def __repr__(self):
+        return 'SearchEvent(state={0}, frontier_size={1})'.format(self.state, self.frontier_size)
+
+
+class SearchCancelledException(Exception):
+    def __init__(self):
+        self.message = 'Pretraga je prekinuta.'
+        super().__init__(self.message)
+
+
+class UnsupportedStateException(Exception):
+    def __init__(self, search_class, state_class):
+        self.message = 'Pretraga {0} ne podrzava stanje {1} (videti Search.supports).'.format(
+            search_class.__name__, state_class.__name__)
+        super().__init__(self.message)
+
+
+class SearchBudget(object):
+    """
+    Ogranicenja pretrage (videti Search.search) - pretraga se zaustavlja cim se dostigne bilo koje od njih.
+    Ogranicenje koje je None se ne proverava.
+    """
+
+    def __init__(self, max_expansions=None, time_limit=None, max_frontier=None, max_closed=None):
+        """
+        :param max_expansions: int - najveci broj procesiranih stanja.
+        :param time_limit: float - najvise vremena (u sekundama) od pocetka pretrage.
+        :param max_frontier: int - najveci broj stanja koja cekaju na obradu.
+        :param max_closed: int - najveci broj zapamcenih obradjenih stanja.
+        """
+        self.max_expansions = max_expansions
+        self.time_limit = time_limit
+        self.max_frontier = max_frontier
+        self.max_closed = max_closed
+
+    def check(self, search, event, elapsed):
+        """
+        Provera ogranicenja posle procesiranog stanja.
+        :param search: Search - pretraga koja se izvrsava.
+        :param event: SearchEvent - poslednji dogadjaj pretrage.
+        :param elapsed: float - vreme (u sekundama) od pocetka pretrage.
+        :return: str - razlog zaustavljanja ili None ako pretraga moze da se nastavi
+        """
+        if self.max_expansions is not None and search.processed_count >= self.max_expansions:
+            return 'max_expansions'
+        if self.time_limit is not None and elapsed >= self.time_limit:
+            return 'time_limit'
+        if self.max_frontier is not None and event.frontier_size > self.max_frontier:
+            return 'max_frontier'
+        if self.max_closed is not None and search.get_closed_size() > self.max_closed:
+            return 'max_closed'
+        return None
+
+
+class SearchOutcome(object):
+    """
+    Ishod pretrage (videti Search.outcome) - zasto se pretraga zavrsila i sta je do tada pronadjeno.
+    Razlog (reason) je 'found' (pronadjeno resenje), 'exhausted' (nema vise stanja za obradu)
+    ili naziv ogranicenja iz SearchBudget ('max_expansions', 'time_limit', 'max_frontier', 'max_closed').
+    Najbolje stanje je procesirano stanje sa najmanjom procenom h (kod jednakih - sa manjom cenom g),
+    i prati se samo u pretrazi sa ogranicenjima, a kod pronadjenog resenja je to krajnje stanje.
+    """
+
+    def __init__(self, reason, best_state=None, best_path=None, stats=None):
+        self.reason = reason
+        self.best_state = best_state  # najbolje procesirano stanje ili None
+        self.best_path = best_path  # putanja do najboljeg stanja (None ako preci stanja nisu zapamceni)
+        self.stats = stats if stats is not None else dict()  # procesirano, frontier, closed, trajanje
+
+    @property
+    def found(self):
+        return self.reason == 'found'
+
+    def __repr__(self):
+        return 'SearchOutcome(reason={0!r}, best_state={1}, stats={2})'.format(
+            self.reason, self.best_state, self.stats)
 
 
 class Search(object):
     """
     Apstraktna klasa za pretragu.
+    Pretraga se izvrsava kao tok dogadjaja (iter_search) - za svako procesirano stanje dobija se SearchEvent.
+    Po zavrsetku toka rezultat je u atributima path, states_list, processed_count i processed_list.
+    Pretraga pokrenuta sa search() se moze prekinuti iz druge niti (videti cancel) i ograniciti (SearchBudget),
+    a ishod poslednje pretrage je u atributu outcome (SearchOutcome).
+    Sa compact_paths=True preci stanja se pamte u PredecessorMap, a stanja u pretrazi ne cuvaju roditelja
+    (parent je None), pa obradjena stanja koja vise nisu potrebna ne ostaju u memoriji (koristi se u
+    osnovnoj pretrazi - BFS, DFS, UCS, GS, A*).
     """
 
-    def __init__(self, board):
+    parent_paths = True  # da li se putanja do procesiranog stanja moze rekonstruisati preko roditelja
+
+    def __init__(self, board, reference=False, compact_paths=False):
         self.board = board
+        self.reference = reference  # ako je True, koristi se originalni (linearni) odabir stanja - za poredjenje
+        self.compact_paths = compact_paths  # ako je True, preci se pamte u PredecessorMap umesto u stanjima
+        self.predecessors = None  # PredecessorMap poslednje pretrage (samo sa compact_paths)
+        self.path = None  # putanja (lista stanja) ili None ako nema resenja
+        self.states_list = deque()  # stanja koja su cekala na obradu kada se pretraga zavrsila
+        self.processed_count = 0  # broj procesiranih stanja
+        self.processed_list = None  # procesirana stanja - samo ako se cuvaju (keep_processed)
+        self.cancelled = False  # zahtev za prekid pretrage (videti cancel)
+        self.closed = None  # zapamcena obradjena stanja (kolekcija iz iter_search), za SearchBudget.max_closed
+        self.outcome = None  # SearchOutcome poslednje pretrage pokrenute sa search()
+
+    def get_config(self):
+        """
+        Podesavanja pretrage koja uticu na rezultat (deo kljuca PathCache).
+        :return: tuple
+        """
+        return self.reference, self.compact_paths
+
+    @classmethod
+    def supports(cls, state_class):
+        """
+        Da li pretraga moze da radi sa zadatom klasom stanja - opste pretrage rade sa svakim stanjem.
+        :param state_class: klasa inicijalnog stanja.
+        :return: bool
+        """
+        return True
+
+    def create_frontier(self):
+        """
+        Pravljenje strukture u kojoj se cuvaju stanja koja cekaju na obradu.
+        Podrazumevano je to deque nad kojim se poziva select_state.
+        :return: Frontier
+        """
+        return SelectFrontier(self.select_state)
 
-    def search(self, initial_state):
+    def search(self, initial_state, budget=None):
         """
-        Implementirana pretraga.
+        Implementirana pretraga - prolazi kroz ceo tok dogadjaja (videti iter_search) i cuva procesirana stanja.
+        Sa ogranicenjima (budget) pretraga se zaustavlja kada se dostigne neko od njih - tada je path None,
+        a najbolje do tada procesirano stanje i razlog zaustavljanja su u outcome.
 
         :param initial_state: Inicijalno stanje. Tip: implementacija apstraktne klase State.
+        :param budget: SearchBudget - ogranicenja pretrage (podrazumevano bez ogranicenja).
         :return: path, processed_list, states_list
+        :raises SearchCancelledException: ako je pretraga prekinuta (videti cancel).
+        """
+        start = time.perf_counter()
+        reason = None
+        best_state, best_score = None, None
+        events = self.iter_search(initial_state, keep_processed=True)
+        try:
+            for event in events:
+                if self.cancelled:
+                    self.cancelled = False
+                    raise SearchCancelledException()
+                if budget is None:
+                    continue
+                state = event.state
+                score = (event.h, event.g)
+                if best_score is None or score < best_score:
+                    best_state, best_score = state, score
+                # posle krajnjeg stanja pretraga samo jos rekonstruise putanju
+                if not state.is_final_state():
+                    reason = budget.check(self, event, time.perf_counter() - start)
+                    if reason is not None:
+                        break
+        finally:
+            events.close()  # prekinut tok dogadjaja se zatvara odmah (npr. D* Lite tada odbacuje tabele)
+
+        if reason is None:
+            reason = 'found' if self.path is not None else 'exhausted'
+        best_path = None
+        if self.path:
+            best_state, best_path = self.path[-1], self.path
+        elif best_state is not None and self.parent_paths and not self.compact_paths:
+            best_path = Search.reconstruct_path(best_state)
+        stats = {'processed': self.processed_count, 'frontier': len(self.states_list),
+                 'closed': self.get_closed_size(), 'time': time.perf_counter() - start}
+        self.outcome = SearchOutcome(reason, best_state, best_path, stats)
+        return self.path, self.processed_list, self.states_list
+
+    def get_closed_size(self):
         """
+        Broj zapamcenih obradjenih stanja (ako pretraga ne pamti obradjena stanja, broj procesiranih stanja).
+        :return: int
+        """
+        return len(self.closed) if self.closed is not None else self.processed_count
+
+    def cancel(self):
+        """
+        Zahtev za prekid pretrage koja se izvrsava u drugoj niti - search() se prekida izuzetkom
+        SearchCancelledException posle sledeceg procesiranog stanja. Rezultat prekinute pretrage nije potpun.
+        """
+        self.cancelled = True
+
+    def iter_search(self, initial_state, keep_processed=False):
+        """
+        Pretraga kao generator dogadjaja - vraca (yield) SearchEvent za svako procesirano stanje, cim se obradi.
+        Procesirana stanja se podrazumevano ne cuvaju, pa se memorija stanja koja vise nisu potrebna oslobadja
+        tokom pretrage. Pretraga se moze prekinuti u bilo kom trenutku, prestankom citanja dogadjaja.
+
+        :param initial_state: Inicijalno stanje. Tip: implementacija apstraktne klase State.
+        :param keep_processed: bool - ako je True, procesirana stanja se cuvaju u processed_list.
+        """
+        self.start_search(keep_processed)
         # inicijalizacija pretrage
         initial_state = initial_state(self.board)  # pocetno stanje
-        states_list = deque([initial_state])  # deque - "brza" lista u Python-u
-        states_set = {initial_state.unique_hash()}  # set - za brzu pretragu stanja
-
-        processed_list = deque([])  # deque procesiranih stanja
-        processed_set = set()  # set procesiranih stanja
+        states_list = self.states_list = self.create_frontier()  # stanja koja cekaju na obradu
+        states_list.push(initial_state)
+        # recnik - za brzu pretragu stanja, kljuc stanja -> stanje koje ceka na obradu
+        states_map = {initial_state.get_state_key(): initial_state}
+        predecessors = None
+        if self.compact_paths:
+            predecessors = self.predecessors = PredecessorMap(self.board)
+            # recnik - kljuc stanja koje ceka na obradu -> cvor stanja u evidenciji predaka
+            nodes_map = {initial_state.get_state_key(): predecessors.add(-1, initial_state)}
+
+        # recnik procesiranih stanja, kljuc stanja -> najmanja cena sa kojom je stanje procesirano
+        # (cuva se samo cena, a ne i stanje, da procesirana stanja ne bi ostala u memoriji)
+        processed_costs = self.closed = dict()
 
         # pretraga
         while len(states_list) > 0:  # dok ima stanja za obradu
-            curr_state = self.select_state(states_list)  # preuzmi sledece stanje za obradu
-            states_set.remove(curr_state.unique_hash())  # izbaci stanja iz seta stanja
+            curr_state = states_list.pop()  # preuzmi sledece stanje za obradu
+            curr_key = curr_state.get_state_key()
+            del states_map[curr_key]  # izbaci stanje iz recnika stanja
+            curr_node = nodes_map.pop(curr_key) if predecessors is not None else None
 
-            processed_list.append(curr_state)  # ubaci stanje u listu procesiranih stanja
-            processed_set.add(curr_state.unique_hash())  # ubaci stanje u set procesiranih stanja
+            # ubaci stanje u recnik procesiranih stanja
+            # (ponovo otvoreno stanje uvek ima manju cenu od ranije procesiranog, pa ga zamenjuje)
+            processed_costs[curr_key] = curr_state.get_current_cost()
+            yield self.process_state(curr_state, len(states_list))
 
             if curr_state.is_final_state():  # ako je krajnje stanje
                 # rekonsturisi putanju
-                return Search.reconstruct_path(curr_state), processed_list, states_list
+                if predecessors is not None:
+                    self.path = predecessors.reconstruct_path(initial_state, curr_node)
+                else:
+                    self.path = Search.reconstruct_path(curr_state)
+                return
 
             # ako nije krajnje stanje
             # izgenerisi sledeca moguca stanja
             # iz liste sledecih mogucih stanja izbaci ona koja su vec u listi i koja su vec procesirana
             for new_state in curr_state.get_next_states():
+                new_key = new_state.get_state_key()
+
                 # Ako je stanje vidjeno, ali ne jos obradjeno
                 # Proveriti da li novo stanje ima manju cenu od starog
                 # Ako ima, zameniti staro novim
-                if new_state.unique_hash() in states_set:
-                    old_state = [x for x in states_list if x.unique_hash() == new_state.unique_hash()][0]
-                    if old_state.get_current_cost() > new_state.get_current_cost():
-                        states_list.remove(old_state)
-                        states_set.remove(old_state.unique_hash())
-                        states_list.append(new_state)
-                        states_set.add(new_state.unique_hash())
-                    continue
-                
-                # Ako je stanje vec obradjeno
-                # Proveriti da li novo stanje ima manju cenu
-                # Ako ima manju cenu, dadati novo stanje u kolekcije stanja
-                if new_state.unique_hash() in processed_set:
-                    old_state = [x for x in processed_list if x.unique_hash() == new_state.unique_hash()][0]
-                    if old_state.get_current_cost() > new_state.get_current_cost():
-                        states_list.append(new_state)
-                        states_set.add(new_state.unique_hash())
-                    continue
-                
-                # Ako je stanje novo, dodati ga u listu i set stanja
-                states_list.append(new_state)
-                states_set.add(new_state.unique_hash())
-                    
-
-        return None, processed_list, states_list
+                old_state = states_map.get(new_key)
+                if old_state is not None:
+                    if old_state.get_current_cost() <= new_state.get_current_cost():
+                        continue
+                    states_list.remove(old_state)
+                else:
+                    # Ako je stanje vec obradjeno
+                    # Proveriti da li novo stanje ima manju cenu
+                    # Ako ima manju cenu, dadati novo stanje u kolekcije stanja
+                    old_cost = processed_costs.get(new_key)
+                    if old_cost is not None and old_cost <= new_state.get_current_cost():
+                        continue
+
+                # Ako je stanje novo (ili jeftinije od ranije vidjenog), dodati ga u listu i recnik stanja
+                states_list.push(new_state)
+                states_map[new_key] = new_state
+                if predecessors is not None:
+                    nodes_map[new_key] = predecessors.add(curr_node, new_state)
+                    new_state.parent = None  # roditelj je zapamcen u evidenciji predaka
+
+    def start_search(self, keep_processed):
+        """
+        Postavljanje rezultata pretrage na pocetne vrednosti, pre pokretanja pretrage.
+        """
+        self.path = None
+        self.states_list = deque()
+        self.processed_count = 0
+        self.processed_list = deque() if keep_processed else None
+        self.predecessors = None
+        self.closed = None
+
+    def process_state(self, state, frontier_size):
+        """
+        Evidentiranje procesiranog stanja.
+        :return: SearchEvent
+        """
+        self.processed_count += 1
+        if self.processed_list is not None:
+            self.processed_list.append(state)
+        return SearchEvent(state, frontier_size)
 
     @staticmethod
     def reconstruct_path(final_state):
@@ -103,42 +408,158 @@ class DepthFirstSearch(Search):
         return states.pop()
 
 
-class MaxDepthException(Exception):
-    def __init__(self):
-        self.message = 'Nema vise stanja za obradu. Stigli smo do maksimalne definisane dubine.'
-        super().__init__(self.message)        
-
 class IterativeDepthFirstSearch(Search):
-    def __init__(self, board):
-        super().__init__(board)
+    """
+    Iterativna pretraga u dubinu (IDDFS).
+    Pretraga u dubinu se ponavlja sa granicom vecom u svakoj iteraciji, sve dok se ne pronadje resenje.
+    Umesto rekurzije koristi se eksplicitni stek (stanje, iterator sledecih stanja), pa se pamti samo
+    trenutna putanja - memorija je O(dubina), a dubina nije ogranicena dubinom rekurzije Python-a.
+    Stanja koja su vec na trenutnoj putanji se preskacu (ciklusi).
+    Sa transpositions=True pamti se i najmanja cena sa kojom je stanje dostignuto u trenutnoj iteraciji,
+    pa se ista stanja ne obradjuju ponovo kroz skuplje putanje - to trosi memoriju srazmernu broju stanja,
+    ali na tablama sprecava eksponencijalan broj putanja. Sa transpositions=False memorija je strogo O(dubina).
+    Statistika svake iteracije se cuva u listi iterations.
+    Parametar reference nema uticaja - originalna varijanta (rekurzivno pokretanje cele pretrage) je zamenjena.
+    """
+
+    def __init__(self, board, reference=False, transpositions=True):
+        super().__init__(board, reference)
         self.max_depth = 1
-    
-    def search(self, initial_state):
+        self.transpositions = transpositions
+        self.iterations = []  # statistika po iteracijama: granica, broj procesiranih stanja, trajanje
+
+    def get_config(self):
+        return super().get_config() + (self.transpositions,)
+
+    def iter_search(self, initial_state, keep_processed=False):
         ''' Override-ujemo podrazumevanu pretragu.
-        Pretragu pokrećemo iznova svaki put sa novom maksimalnom dubinom povećanom za 1 
-        (rekurzivno se poziva).'''
-        try:
-            return super().search(initial_state)
-        # u slučaju da smo stigli do maksimalne dubine i nismo pronašli rešenje, povećavamo dubinu pretrage i pokrećemo pretragu iznova
-        except MaxDepthException:
-            self.max_depth += 1
-            return self.search(initial_state)
-    
-    def select_state(self, states):
-        # pretražujemo sva stanja do određene dubine
-        # sva stanja koja su preduboka samo izbacujemo iz liste stanja
-        while states:
-            state = states.pop() # isto kao i DFS
-            if state.depth <= self.max_depth:
-                return state
+        Pretragu u dubinu pokrecemo iznova, u petlji, svaki put sa novom (vecom) granicom.
+        Dogadjaji se vracaju za sva procesirana stanja, iz svih iteracija, a u processed_list
+        (ako se cuva) ostaju samo stanja iz poslednje iteracije.'''
+        self.start_search(keep_processed)
+        initial_state = initial_state(self.board)  # pocetno stanje
+        self.iterations = []
+        limit = self.get_limit_value(initial_state)
+        while True:
+            self.max_depth = limit
+            if keep_processed:
+                self.processed_list = deque()
+            start = time.perf_counter()
+            processed_count = self.processed_count
+            final_state, next_limit = yield from self.limited_search(initial_state, limit)
+            self.iterations.append({'limit': limit, 'processed': self.processed_count - processed_count,
+                                    'time': time.perf_counter() - start})
+            if final_state is not None:
+                self.path = Search.reconstruct_path(final_state)
+                return
+            # ako nijedno stanje nije odbaceno zbog granice, nema vise stanja za obradu - nema resenja
+            if next_limit == float('inf'):
+                return
+            limit = next_limit
+
+    def limited_search(self, initial_state, limit):
+        """
+        Jedna iteracija - pretraga u dubinu do zadate granice.
+        Generator - vraca (yield) dogadjaje za procesirana stanja, a na kraju (return) rezultat iteracije.
+
+        :param initial_state: pocetno stanje
+        :param limit: granica - stanja cija je vrednost (get_limit_value) veca od granice se ne obradjuju
+        :return: krajnje stanje (ili None), najmanja vrednost veca od granice
+        """
+        next_limit = float('inf')  # granica za sledecu iteraciju
+        path_keys = {initial_state.get_state_key()}  # kljucevi stanja na trenutnoj putanji
+        best_costs = dict()  # (kljuc stanja, akcija) -> najmanja cena sa kojom je dostignuto (transpozicije)
+        stack = [[initial_state, None]]  # trenutna putanja: [stanje, iterator sledecih stanja]
+        while stack:
+            top = stack[-1]
+            curr_state, next_states = top
+            if next_states is None:  # stanje se obradjuje prvi put
+                yield self.process_state(curr_state, len(stack) - 1)
+                if curr_state.is_final_state():
+                    return curr_state, next_limit
+                next_states = top[1] = iter(curr_state.get_next_states())
+
+            new_state = next(next_states, None)
+            if new_state is None:  # obradjena su sva sledeca stanja - vracamo se nazad
+                stack.pop()
+                path_keys.discard(curr_state.get_state_key())
+                continue
+
+            new_key = new_state.get_state_key()
+            if new_key in path_keys:  # ciklus
+                continue
+            value = self.get_limit_value(new_state)
+            if value > limit:
+                next_limit = min(next_limit, value)
+                continue
+            if self.transpositions:
+                # cena narednih poteza moze zavisiti i od akcije kojom se doslo u stanje (npr. cena okreta),
+                # pa se putanje porede samo ako su dosle u stanje istom akcijom
+                transposition = (new_key, getattr(new_state, 'action', None))
+                cost = self.get_path_cost(new_state)
+                if best_costs.get(transposition, float('inf')) <= cost:
+                    continue
+                best_costs[transposition] = cost
+            path_keys.add(new_key)
+            stack.append([new_state, None])
+        return None, next_limit
+
+    def get_limit_value(self, state):
+        """
+        Vrednost stanja koja se poredi sa granicom iteracije - za IDDFS je to dubina.
+        :return: float
+        """
+        return state.depth
+
+    def get_path_cost(self, state):
+        """
+        Cena putanje do stanja, za poredjenje razlicitih putanja do istog stanja - za IDDFS je to dubina.
+        :return: float
+        """
+        return state.depth
 
-        # Ako nismo uspeli da nadjemo sledeće stanje u okviru definisane dubine `max_depth`, to znači da nema više stanja za obradu. 
-        # Kada se desi greška, znači da smo stigli do maksimalne dubine, a nismo pronašli rešenje.
-        raise MaxDepthException()
 
+class IterativeDeepeningAStarSearch(IterativeDepthFirstSearch):
+    """
+    IDA* - iterativna pretraga u dubinu gde je granica vrednost f = g + h (videti AStarSearch).
+    Prva granica je f pocetnog stanja, a svaka sledeca najmanja vrednost f koja je premasila prethodnu granicu.
+    """
+
+    def get_limit_value(self, state):
+        return state.get_current_cost() + state.get_cost_estimate()
 
+    def get_path_cost(self, state):
+        return state.get_current_cost()
+
+
+class PrioritySearch(Search):
+    """
+    Apstraktna klasa za vodjene pretrage (UCS, GS, A*).
+    Stanja se cuvaju u heap-u po prioritetu, pa je odabir sledeceg stanja O(log n).
+    Sa reference=True koristi se originalni linearni odabir preko select_state.
+    """
+
+    def create_frontier(self):
+        if self.reference:
+            return super().create_frontier()
+        return PriorityFrontier(self.get_priority)
+
+    @abstractmethod
+    def get_priority(self, state):
+        """
+        Apstraktna metoda koja vraca prioritet stanja - stanje sa najmanjim prioritetom se prvo obradjuje.
+        Mora odgovarati kriterijumu iz select_state.
+
+        :param state: stanje za koje se racuna prioritet
+        :return: float
+        """
+        pass
+
+
+class UniformCostSearch(PrioritySearch):
+    def get_priority(self, state):
+        return state.get_current_cost()
 
-class UniformCostSearch(Search):
     def select_state(self, states):
         min_cost = float('inf')
         min_cost_state = None
@@ -152,7 +573,10 @@ class UniformCostSearch(Search):
         return min_cost_state
 
 
-class GreedySearch(Search):
+class GreedySearch(PrioritySearch):
+    def get_priority(self, state):
+        return state.get_cost_estimate()
+
     def select_state(self, states):
         # TODO 4 - Implementirati pohlepnu pretragu (GS).
         min_cost = float('inf')
@@ -167,7 +591,10 @@ class GreedySearch(Search):
         return min_cost_state
 
 
-class AStarSearch(Search):
+class AStarSearch(PrioritySearch):
+    def get_priority(self, state):
+        return state.get_current_cost() + state.get_cost_estimate()
+
     def select_state(self, states):
         # TODO 5 - Implementirati A*
         min_cost = float('inf')
@@ -183,4 +610,382 @@ class AStarSearch(Search):
         states.remove(min_cost_state)
         return min_cost_state
 
-# napomena: traženje stanja sa najmanjim ključem može i kraće da se napiše koristeći min(states, key=) sintaksu.
\ No newline at end of file
+# napomena: traženje stanja sa najmanjim ključem može i kraće da se napiše koristeći min(states, key=) sintaksu.
+
+
+class JumpPointSearch(Search):
+    """
+    Jump Point Search (JPS) - A* nad tablom sa 8 smerova kretanja (ALL_ACTIONS), gde svaki potez ima istu cenu.
+    Iz stanja se ne generisu svi susedi, vec se u svakom smeru "skace" pravo preko table dok se ne naidje
+    na cilj ili na polje gde zid otvara novi najkraci put (jump point) - simetricne putanje iste duzine se
+    ne obradjuju, pa se obradi mnogo manje stanja nego kod AStarSearch, a putanja je i dalje najkraca.
+    Dijagonalni potez je dozvoljen i pored zida (isto kao Board.get_legal_moves).
+
+    Pretraga radi samo nad pozicijama (prevedena tabla, videti Board.compile) i ne gleda cene stanja, pa se
+    moze pokrenuti samo sa stanjem koje se krece sa ALL_ACTIONS, ciji je cilj samo pozicija i kod kog svaki
+    potez kosta isto (State.uniform_cost, videti supports, npr. PositionState) - za ostala stanja se podize
+    UnsupportedStateException, jer bi putanja mogla biti skuplja od one koju nadje UniformCostSearch.
+    Stanja na putanji se ipak prave klasom inicijalnog stanja, polje po polje, pa putanja, procesirana stanja
+    i cena izgledaju isto kao kod ostalih pretraga.
+    Parametar reference nema uticaja.
+    """
+
+    @classmethod
+    def supports(cls, state_class):
+        actions = state_class.actions
+        return (state_class.position_goal and state_class.uniform_cost
+                and actions is not None and set(actions) == set(ALL_ACTIONS))
+
+    def iter_search(self, initial_state, keep_processed=False):
+        if not self.supports(initial_state):
+            raise UnsupportedStateException(self.__class__, initial_state)
+        self.start_search(keep_processed)  # procesirana stanja su jump point-i
+        initial_state = initial_state(self.board)  # pocetno stanje
+        goal = initial_state.goal_position
+        if None in goal:  # na tabli nema cilja
+            return
+        if self.board.passable is None:
+            self.board.compile()
+
+        def position_key(state):
+            return self.board.get_cell_index(*state.position)
+
+        def priority(state):
+            # g - broj poteza do stanja, h - diagonal_distance do cilja (tacna udaljenost bez zidova)
+            row, col = state.position
+            return state.depth - 1 + max(abs(row - goal[0]), abs(col - goal[1]))
+
+        # jump point-i koji cekaju na obradu
+        states_list = self.states_list = PriorityFrontier(priority, position_key)
+        states_list.push(initial_state)
+        best_depths = {position_key(initial_state): initial_state.depth}  # kljuc pozicije -> najmanja dubina
+        processed_set = self.closed = set()  # kljucevi obradjenih pozicija
+
+        while len(states_list) > 0:
+            curr_state = states_list.pop()
+            processed_set.add(position_key(curr_state))
+            yield self.process_state(curr_state, len(states_list))
+            if curr_state.position == goal:
+                if curr_state.is_final_state():
+                    self.path = Search.reconstruct_path(curr_state)
+                return
+
+            row, col = curr_state.position
+            for d_row, d_col in self.get_directions(curr_state):
+                jump_point = self.jump(row, col, d_row, d_col, goal)
+                if jump_point is None:
+                    continue
+                key = self.board.get_cell_index(*jump_point)
+                depth = curr_state.depth + max(abs(jump_point[0] - row), abs(jump_point[1] - col))
+                if key in processed_set or best_depths.get(key, float('inf')) <= depth:
+                    continue
+                best_depths[key] = depth
+                # stanja za sva polja preko kojih se skace, da bi putanja i cena bile iste kao kod obicne pretrage
+                new_state = curr_state
+                while new_state.position != jump_point:
+                    position = (new_state.position[0] + d_row, new_state.position[1] + d_col)
+                    new_state = new_state.__class__(self.board, new_state, position, goal, (d_row, d_col))
+                states_list.push(new_state)  # menja eventualno losije stanje za istu poziciju
+
+    def is_passable(self, row, col):
+        """
+        Da li je polje prohodno - polja van table su zidovi okvira prevedene table.
+        """
+        return self.board.passable[(row + PADDING) * self.board.width + col + PADDING]
+
+    def get_directions(self, state):
+        """
+        Smerovi u kojima se skace iz stanja: prirodni smerovi nastavka kretanja i smerovi koje otvara zid (forced).
+        Iz pocetnog stanja se skace u svih 8 smerova.
+        :return: list((int, int))
+        """
+        if state.action is None:
+            return [(d_row, d_col) for d_row in (-1, 0, 1) for d_col in (-1, 0, 1) if d_row or d_col]
+        row, col = state.position
+        d_row, d_col = state.action
+        passable = self.is_passable
+        if d_row and d_col:  # dijagonalno kretanje
+            directions = [(d_row, 0), (0, d_col), (d_row, d_col)]
+            if not passable(row, col - d_col):
+                directions.append((d_row, -d_col))
+            if not passable(row - d_row, col):
+                directions.append((-d_row, d_col))
+        elif d_row:  # vertikalno kretanje
+            directions = [(d_row, 0)]
+            if not passable(row, col + 1):
+                directions.append((d_row, 1))
+            if not passable(row, col - 1):
+                directions.append((d_row, -1))
+        else:  # horizontalno kretanje
+            directions = [(0, d_col)]
+            if not passable(row + 1, col):
+                directions.append((1, d_col))
+            if not passable(row - 1, col):
+                directions.append((-1, d_col))
+        return directions
+
+    def jump(self, row, col, d_row, d_col, goal):
+        """
+        Skok iz polja (row, col) u smeru (d_row, d_col), dok se ne naidje na zid, cilj ili jump point.
+        :return: (int, int) - pozicija jump point-a ili None ako u tom smeru nema jump point-a
+        """
+        passable = self.is_passable
+        while True:
+            row += d_row
+            col += d_col
+            if not passable(row, col):
+                return None
+            if (row, col) == goal:
+                return row, col
+            # dijagonalno - jump point je i polje iz kog se horizontalno/vertikalno dolazi do jump point-a
+            if d_row and d_col:
+                if (passable(row + d_row, col - d_col) and not passable(row, col - d_col)) or \
+                        (passable(row - d_row, col + d_col) and not passable(row - d_row, col)):
+                    return row, col
+                if self.jump(row, col, d_row, 0, goal) is not None or self.jump(row, col, 0, d_col, goal) is not None:
+                    return row, col
+            elif d_row:  # vertikalno
+                if (passable(row + d_row, col + 1) and not passable(row, col + 1)) or \
+                        (passable(row + d_row, col - 1) and not passable(row, col - 1)):
+                    return row, col
+            else:  # horizontalno
+                if (passable(row + 1, col + d_col) and not passable(row + 1, col)) or \
+                        (passable(row - 1, col + d_col) and not passable(row - 1, col)):
+                    return row, col
+
+
+class DStarLiteSearch(Search):
+    """
+    D* Lite - inkrementalna pretraga koja cuva svoje tabele (g, rhs i red prioriteta) izmedju pokretanja.
+    Pretraga ide unazad, od cilja ka robotu, pa kada se robot pomeri ili se promene zidovi na tabli
+    (videti Board.take_wall_changes), ponovo se obradjuju samo celije na koje izmena utice, umesto cele
+    pretrage. Ako se cilj pomeri ili se tabla zameni u celini (ucitavanje, brisanje), tabele se prave iznova.
+
+    Kao i JumpPointSearch, pretraga radi samo nad pozicijama, sa jednakom cenom svakog poteza, pa se moze
+    pokrenuti samo sa stanjem koje ima stalan skup akcija, ciji je cilj samo pozicija i kod kog svaki potez
+    kosta isto (videti supports, npr. PositionState) - za ostala stanja se podize UnsupportedStateException.
+    Stanja na putanji se prave klasom inicijalnog stanja i putanja se vraca samo ako joj je poslednje stanje
+    krajnje. Procesirana stanja su celije ciji je g promenjen.
+    Da bi se tabele koristile ponovo, isti objekat pretrage treba pokretati nad istom tablom (igra posle
+    svake izmene table ponovo pokrece D* Lite, ako je on dao prikazanu putanju - videti RobotGame.replan).
+    Parametar reference nema uticaja.
+    """
+
+    incremental = True  # objekat pretrage treba cuvati izmedju pokretanja
+    parent_paths = False  # procesirana stanja su celije, a roditelj svake je pocetno stanje
+
+    def __init__(self, board, reference=False):
+        super().__init__(board, reference)
+        self.actions = ()  # akcije stanja (State.actions) za koje vaze tabele
+        self.plan = None  # (redni broj sadrzaja table, cilj, akcije) za koje vaze tabele
+        self.g = None  # celija -> cena puta do cilja (indeksi prevedene table, videti Board.compile)
+        self.rhs = None  # celija -> procena cene preko suseda (one-step lookahead)
+        self.queue = []  # heap: [k1, k2, celija]
+        self.queue_keys = dict()  # celija -> kljuc (k1, k2) vazeceg elementa heap-a
+        self.km = 0  # zbir pomeraja robota od pravljenja tabela
+        self.start = None  # celija robota u prethodnom pokretanju
+        self.goal = None  # celija cilja
+        self.change_index = 0  # broj izmena zidova koje su vec obradjene (videti Board.take_wall_changes)
+        self.offsets = ()  # pomeraji akcija u prevedenoj tabli
+        self.max_step = (1, 1)  # najveci pomeraj jednog poteza po osi i po zbiru osa (za heuristiku)
+
+    @classmethod
+    def supports(cls, state_class):
+        return state_class.position_goal and state_class.uniform_cost and state_class.actions is not None
+
+    def iter_search(self, initial_state, keep_processed=False):
+        if not self.supports(initial_state):
+            raise UnsupportedStateException(self.__class__, initial_state)
+        self.start_search(keep_processed)
+        actions = tuple(initial_state.actions)
+        initial_state = initial_state(self.board)  # pocetno stanje
+        goal_position = initial_state.goal_position
+        if None in goal_position:  # na tabli nema cilja
+            return
+        board = self.board
+        if board.passable is None:
+            board.compile()
+        start = self.get_index(initial_state.position)
+        board.track_wall_changes = True
+        changes, self.change_index = board.take_wall_changes(self.change_index)
+        if self.plan != (board.generation, goal_position, actions) or changes is None:
+            self.actions = actions
+            self.initialize(self.get_index(goal_position), start)
+            self.plan = (board.generation, goal_position, actions)
+        else:
+            # robot se pomerio - kljucevi u redu se ne preracunavaju, vec se uvecava km
+            self.km += self.heuristic(self.start, start)
+            self.start = start
+            # celije kojima se promenila prohodnost, i njihovi prethodnici
+            for row, col in changes:
+                cell = self.get_index((row, col))
+                self.update_vertex(cell)
+                for offset in self.offsets:
+                    self.update_vertex(cell - offset)
+
+        try:
+            for cell in self.compute_shortest_path():
+                state = initial_state.__class__(board, initial_state, self.get_position(cell), goal_position, None)
+                yield self.process_state(state, len(self.queue_keys))
+        except GeneratorExit:
+            # tok je prekinut usred obrade celije - tabele nisu ispravne i prave se iznova sledeci put
+            self.plan = None
+            raise
+
+        # putanja - od robota se ide na suseda sa najmanjom cenom do cilja
+        # (g robota moze ostati neazuran, ali rhs je tacan kada se pretraga zavrsi)
+        if self.rhs[start] == float('inf'):
+            return
+        path = [initial_state]
+        cell = start
+        while cell != self.goal:
+            offset, action = self.get_best_move(cell)
+            cell += offset
+            state = path[-1]
+            path.append(state.__class__(board, state, self.get_position(cell), goal_position, action))
+        if path[-1].is_final_state():
+            self.path = path
+
+    def initialize(self, goal, start):
+        """
+        Pravljenje novih tabela, za novi cilj ili novi sadrzaj table.
+        """
+        size = len(self.board.passable)
+        self.offsets = tuple(d_row * self.board.width + d_col for d_row, d_col in self.actions)
+        # heuristika mora biti dopustiva za skup akcija (videti heuristic)
+        self.max_step = (max(max(abs(d_row), abs(d_col)) for d_row, d_col in self.actions),
+                         max(abs(d_row) + abs(d_col) for d_row, d_col in self.actions))
+        self.g = [float('inf')] * size
+        self.rhs = [float('inf')] * size
+        self.queue = []
+        self.queue_keys = dict()
+        self.km = 0
+        self.start = start
+        self.goal = goal
+        self.rhs[goal] = 0
+        self.push(goal, self.calculate_key(goal))
+
+    def compute_shortest_path(self):
+        """
+        Obrada celija iz reda dok stanje robota ne postane konzistentno.
+        Generator - vraca (yield) svaku celiju kojoj se menja g.
+        """
+        g, rhs, start = self.g, self.rhs, self.start
+        while True:
+            top_key = self.top_key()
+            if top_key is None:
+                return
+            if not (top_key < self.calculate_key(start) or rhs[start] > g[start]):
+                return
+            cell = heapq.heappop(self.queue)[2]
+            del self.queue_keys[cell]
+            new_key = self.calculate_key(cell)
+            if top_key < new_key:  # kljuc je zastareo (robot se pomerio) - vraca se u red sa novim kljucem
+                self.push(cell, new_key)
+                continue
+            yield cell
+            if g[cell] > rhs[cell]:  # celija je postala jeftinija
+                g[cell] = rhs[cell]
+            else:  # celija je postala skuplja
+                g[cell] = float('inf')
+                self.update_vertex(cell)
+            for offset in self.offsets:
+                self.update_vertex(cell - offset)
+
+    def update_vertex(self, cell):
+        """
+        Ponovno racunanje rhs celije i njeno (ne)postavljanje u red, u zavisnosti od toga da li je konzistentna.
+        """
+        if cell != self.goal:
+            passable, g = self.board.passable, self.g
+            best = float('inf')
+            if passable[cell]:
+                for offset in self.offsets:
+                    neighbor = cell + offset
+                    if passable[neighbor] and g[neighbor] + 1 < best:
+                        best = g[neighbor] + 1
+            self.rhs[cell] = best
+        self.queue_keys.pop(cell, None)  # stari element heap-a vise ne vazi
+        if self.g[cell] != self.rhs[cell]:
+            self.push(cell, self.calculate_key(cell))
+
+    def get_best_move(self, cell):
+        """
+        Potez iz celije ka susedu sa najmanjom cenom do cilja.
+        :return: (offset, akcija)
+        """
+        passable = self.board.passable
+        best, best_move = float('inf'), None
+        for offset, action in zip(self.offsets, self.actions):
+            neighbor = cell + offset
+            if passable[neighbor] and self.g[neighbor] < best:
+                best, best_move = self.g[neighbor], (offset, action)
+        return best_move
+
+    def calculate_key(self, cell):
+        value = min(self.g[cell], self.rhs[cell])
+        return value + self.heuristic(self.start, cell) + self.km, value
+
+    def push(self, cell, key):
+        self.queue_keys[cell] = key
+        heapq.heappush(self.queue, [key[0], key[1], cell])
+
+    def top_key(self):
+        """
+        Kljuc prve vazece celije u redu (zastareli elementi heap-a se izbacuju), ili None ako je red prazan.
+        """
+        queue = self.queue
+        while queue:
+            k1, k2, cell = queue[0]
+            if self.queue_keys.get(cell) == (k1, k2):
+                return k1, k2
+            heapq.heappop(queue)
+        return None
+
+    def heuristic(self, cell_a, cell_b):
+        """
+        Najmanji broj poteza izmedju celija bez zidova: jedan potez smanjuje diagonal_distance najvise za
+        najveci pomeraj po osi, a manhattan_distance najvise za najveci zbir pomeraja, pa je procena dopustiva
+        za svaki skup akcija - manhattan za ACTIONS, diagonal za ALL_ACTIONS, a za skokove konja
+        max(diagonal / 2, manhattan / 3), zaokruzeno navise.
+        """
+        row_a, col_a = divmod(cell_a, self.board.width)
+        row_b, col_b = divmod(cell_b, self.board.width)
+        d_row, d_col = abs(row_a - row_b), abs(col_a - col_b)
+        axis_step, sum_step = self.max_step
+        return max(-(-max(d_row, d_col) // axis_step), -(-(d_row + d_col) // sum_step))
+
+    def get_index(self, position):
+        """
+        Indeks pozicije u prevedenoj tabli.
+        """
+        return (position[0] + PADDING) * self.board.width + position[1] + PADDING
+
+    def get_position(self, cell):
+        row, col = divmod(cell, self.board.width)
+        return row - PADDING, col - PADDING
+
+
+# mapiranje naziva pretrage na klasu pretrage
+# JPS i D* Lite rade samo sa nekim stanjima (videti Search.supports i get_search_class_map)
+search_class_map = {
+    "BFS": BreadthFirstSearch,
+    "DFS": DepthFirstSearch,
+    "IDFS": IterativeDepthFirstSearch,
+    "IDA*": IterativeDeepeningAStarSearch,
+    "UCS": UniformCostSearch,
+    "GS": GreedySearch,
+    "A*": AStarSearch,
+    "JPS": JumpPointSearch,
+    "D* Lite": DStarLiteSearch
+}
+
+
+def get_search_class_map(state_class=None):
+    """
+    Pretrage koje se mogu pokrenuti sa zadatom klasom stanja (koriste ga igra, batch.py i benchmark.py).
+    :param state_class: klasa inicijalnog stanja, ili None - sve pretrage.
+    :return: dict - naziv pretrage -> klasa pretrage
+    """
+    return {name: search_class for name, search_class in search_class_map.items()
+            if state_class is None or search_class.supports(state_class)}
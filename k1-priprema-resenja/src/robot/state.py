@@ -1,5 +1,10 @@
 from abc import *
-from board import Board
+try:
+    from .board import Board, ACTIONS, ALL_ACTIONS, KNIGHT_ACTIONS
+    from .heuristics import get_distance_table, get_true_distance_table
+except ImportError:  # pokrenuto iz direktorijuma robot (python main.py)
+    from board import Board, ACTIONS, ALL_ACTIONS, KNIGHT_ACTIONS
+    from heuristics import get_distance_table, get_true_distance_table
 import math
 
 
@@ -8,6 +13,18 @@ class State(object):
     Apstraktna klasa koja opisuje stanje pretrage.
     """
 
+    # stanja se prave za svaki generisani cvor pretrage, pa umesto __dict__-a koriste __slots__
+    __slots__ = ('board', 'parent', 'action', 'position', 'goal_position',
+                 'checkpoints', 'teleports', 'teleport', 'fire', 'depth')
+
+    # opis stanja za pretrage koje rade samo nad pozicijama (videti Search.supports):
+    # skup akcija ako je isti u svim stanjima (None - zavisi od stanja, npr. od pokupljenih kutija)
+    actions = None
+    # da li je krajnje stanje odredjeno samo pozicijom cilja (is_final_state je position == goal_position)
+    position_goal = False
+    # da li svaki potez kosta isto (1), pa je cena putanje broj poteza - npr. cena vatre ili okreta to narusava
+    uniform_cost = False
+
     @abstractmethod
     def __init__(self, board: Board, parent=None, position=None, goal_position=None, action=None):
         """
@@ -90,6 +107,23 @@ class State(object):
         """
         pass
     
+    @classmethod
+    def get_config(cls):
+        """
+        Podesavanja klase stanja koja uticu na rezultat pretrage (deo kljuca PathCache), npr. true_distance.
+        :return: tuple
+        """
+        return ()
+
+    def get_state_key(self):
+        """
+        Kljuc stanja koji pretraga koristi u setovima i recnicima stanja.
+        Mora biti jedinstven za stanje, isto kao i unique_hash. Podrazumevano je to sam unique_hash,
+        a konkretna stanja mogu vratiti kompaktan ceo broj koji se izracuna jednom, u konstruktoru.
+        :return: int ili str
+        """
+        return self.unique_hash()
+
     @abstractmethod
     def get_cost_estimate(self):
         """
@@ -111,6 +145,16 @@ class State(object):
 
 
 class RobotState(State):
+    __slots__ = ('cost', 'right_checkpoint', 'left_checkpoint', 'has_right_checkpoint', 'has_left_checkpoint', 'key',
+                 'heuristic_tables')
+
+    # ako je True, heuristika umesto Manhattan udaljenosti koristi tacne udaljenosti na tabli, sa zidovima
+    # (videti heuristics.get_true_distance_table) - mnogo bolja procena na tablama nalik lavirintu
+    true_distance = False
+
+    @classmethod
+    def get_config(cls):
+        return (cls.true_distance,)
 
     def __init__(self, board: Board, parent: State=None, position: tuple=None, goal_position: tuple=None, action: tuple=None):
         super().__init__(board, parent, position, goal_position, action)
@@ -121,9 +165,11 @@ class RobotState(State):
             self.has_left_checkpoint = False
             self.right_checkpoint = max(self.checkpoints, key=lambda x: x[1])
             self.left_checkpoint = min(self.checkpoints, key=lambda x: x[1])
+            self.heuristic_tables = self.get_heuristic_tables()
         else: 
             self.right_checkpoint = self.parent.right_checkpoint
             self.left_checkpoint = self.parent.left_checkpoint
+            self.heuristic_tables = self.parent.heuristic_tables
             self.has_right_checkpoint = self.parent.has_right_checkpoint
             self.has_left_checkpoint = self.parent.has_left_checkpoint
 
@@ -135,6 +181,10 @@ class RobotState(State):
 
         if self.position == self.left_checkpoint:
             self.has_left_checkpoint = True
+
+        # kompaktan kljuc stanja: redni broj polja, a iznad njega bitovi za pokupljene kutije
+        flags = self.has_left_checkpoint | self.has_right_checkpoint << 1
+        self.key = self.board.get_cell_index(*self.position) | flags << self.board.get_index_bits()
         
 
     def get_legal_positions(self):
@@ -144,43 +194,66 @@ class RobotState(State):
         if self.has_left_checkpoint and not self.has_right_checkpoint:
             return []
         
-        actions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        # akcije sahovskoh konja
-        knight_actions = [(1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1)]
-
+        actions = ACTIONS
         if self.has_right_checkpoint and not self.has_left_checkpoint:
-            actions = knight_actions
+            actions = KNIGHT_ACTIONS  # akcije sahovskog konja
 
-        row, col = self.position 
-        new_positions = []
-        for d_row, d_col in actions: 
-            new_row = row + d_row
-            new_col = col + d_col 
-
-            if not self.board.is_out_of_bounds(new_row, new_col) and not self.board.hits_wall(new_row, new_col):
-                new_positions.append(((new_row, new_col), (d_row, d_col)))
-        return new_positions
+        # legalni potezi se citaju iz prevedene table (videti Board.get_legal_moves)
+        return self.board.get_legal_moves(self.position, actions)
 
     def is_final_state(self):
         return self.position == self.goal_position and self.has_left_checkpoint and self.has_right_checkpoint
 
     def unique_hash(self):
         return str(self.position) + str(self.has_left_checkpoint) + str(self.has_right_checkpoint)
+
+    def get_state_key(self):
+        return self.key
     
     def get_cost_estimate(self):
-        h = 0
+        # deo heuristike koji zavisi samo od pozicije cita se iz tabele za trenutnu fazu
+        # (videti get_heuristic_tables), a dodaje se samo deo koji zavisi od akcije
+        index = self.board.get_cell_index(*self.position)
         if not self.has_right_checkpoint:
-            h += self.adjusted_distance(self.position, self.right_checkpoint)
-            h += self.knight_distance(self.right_checkpoint, self.left_checkpoint)
-            h += self.manhattan_distance(self.left_checkpoint, self.goal_position) + 2 # nisu poravnati pa je potreban barem jedan okret
+            table, rest = self.heuristic_tables[0]
+            return table[index] + rest + self.get_momentum_penalty()
         elif not self.has_left_checkpoint:
-            h += self.knight_distance(self.position, self.left_checkpoint)
-            h += self.manhattan_distance(self.left_checkpoint, self.goal_position) + 2 # nisu poravnati pa je potreban barem jedan okret
+            table, rest = self.heuristic_tables[1]
+            return table[index] + rest
         else:
-            h += self.adjusted_distance(self.position, self.goal_position)
+            table, rest = self.heuristic_tables[2]
+            return table[index] + rest + self.get_momentum_penalty()
+
+    def get_heuristic_tables(self):
+        """
+        Tabele heuristike za celu tablu, po jedna za svaku fazu: pre desne kutije, izmedju kutija i posle obe kutije.
+        Uz svaku tabelu ide i procena preostalog dela puta posle cilja te faze.
+        Racunaju se jednom, za inicijalno stanje, a ostala stanja ih preuzimaju od roditelja.
+        :return: tuple((array, float), (array, float), (array, float))
+        """
+        if None in self.goal_position:  # na tabli nema cilja
+            return None
+        rows, cols = self.board.rows, self.board.cols
+        if self.true_distance:
+            to_right = get_true_distance_table(self.board, self.right_checkpoint, ACTIONS)
+            to_left = get_true_distance_table(self.board, self.left_checkpoint, KNIGHT_ACTIONS)
+            to_goal = get_true_distance_table(self.board, self.goal_position, ACTIONS)
+            left_to_goal = to_goal[self.board.get_cell_index(*self.left_checkpoint)]
+            right_to_left = to_left[self.board.get_cell_index(*self.right_checkpoint)]
+        else:
+            to_right = get_distance_table('manhattan', rows, cols, self.right_checkpoint)
+            to_left = get_distance_table('manhattan', rows, cols, self.left_checkpoint, divisor=3)  # knight_distance
+            to_goal = get_distance_table('manhattan', rows, cols, self.goal_position)
+            left_to_goal = self.manhattan_distance(self.left_checkpoint, self.goal_position)
+            right_to_left = self.knight_distance(self.right_checkpoint, self.left_checkpoint)
+        # od leve kutije do cilja - nisu poravnati pa je potreban barem jedan okret
+        rest = left_to_goal + 2
+        return (
+            (to_right, right_to_left + rest),  # adjusted_distance do desne kutije, skokovi konja do leve, ostatak
+            (to_left, rest),  # skokovi konja do leve kutije, ostatak
+            (to_goal, 0)  # adjusted_distance do cilja
+        )
 
-        return h
-        
     def get_current_cost(self):
         return self.cost
     
@@ -193,13 +266,18 @@ class RobotState(State):
         # if pointA[0] != pointB[0] and pointA[1] != pointB[1]: 
         #     distance += 2
         # heuristika 2 - ako bi nastavljanjem u istom pravcu robot udario u zid, mora promeniti pravac barem jednom
+        distance += self.get_momentum_penalty()
+        return distance
+
+    def get_momentum_penalty(self):
+        # ako bi nastavljanjem u istom pravcu robot udario u zid, mora promeniti pravac barem jednom
         if self.action != None: # ako bi nastavljanjem 
             momentum_row, momentum_col = self.position
             momentum_row += self.action[0]
             momentum_col += self.action[1]
             if not self.board.is_out_of_bounds(momentum_row, momentum_col) and self.board.hits_wall(momentum_row, momentum_col):
-                distance += 2
-        return distance
+                return 2
+        return 0
     
     def manhattan_distance(self, pointA, pointB):
         return abs(pointA[0] - pointB[0]) + abs(pointA[1] - pointB[1])
@@ -213,4 +291,58 @@ class RobotState(State):
 
     # dodajemo da lakse debagujemo
     def __repr__(self):
-        return f'RobotState(pos={self.position}, depth={self.depth})'
\ No newline at end of file
+        return f'RobotState(pos={self.position}, depth={self.depth})'
+
+
+class PositionState(State):
+    """
+    Robot koji se krece u 8 smerova (ALL_ACTIONS) pravo do cilja, bez kutija, vatre i cene okreta - svaki potez
+    kosta 1. Krajnje stanje je odredjeno samo pozicijom, pa sa ovim stanjem rade i pretrage koje rade samo
+    nad pozicijama (JumpPointSearch, DStarLiteSearch, videti Search.supports).
+    """
+    __slots__ = ('cost', 'key', 'heuristic_table')
+
+    actions = ALL_ACTIONS
+    position_goal = True
+    uniform_cost = True
+
+    def __init__(self, board: Board, parent: State=None, position: tuple=None, goal_position: tuple=None, action: tuple=None):
+        super().__init__(board, parent, position, goal_position, action)
+        if parent is None:
+            self.cost = 0
+            self.heuristic_table = None
+            if None not in self.goal_position:  # ako na tabli ima cilja
+                self.heuristic_table = get_distance_table('diagonal', board.rows, board.cols, self.goal_position)
+        else:
+            self.cost = self.parent.cost + 1
+            self.heuristic_table = self.parent.heuristic_table
+        self.key = self.board.get_cell_index(*self.position)
+
+    def get_legal_positions(self):
+        return self.board.get_legal_moves(self.position, self.actions)
+
+    def is_final_state(self):
+        return self.position == self.goal_position
+
+    def unique_hash(self):
+        return str(self.position)
+
+    def get_state_key(self):
+        return self.key
+
+    def get_cost_estimate(self):
+        # diagonal_distance do cilja, procitana iz tabele - tacna udaljenost kada nema zidova
+        return self.heuristic_table[self.key]
+
+    def get_current_cost(self):
+        return self.cost
+
+    def __repr__(self):
+        return f'PositionState(pos={self.position}, depth={self.depth})'
+
+
+# mapiranje naziva stanja na klasu stanja (koriste ga igra, batch.py i benchmark.py)
+state_class_map = {
+    "Robot": RobotState,
+    "Position": PositionState
+}
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# paket robot je u direktorijumu src (kao kod pokretanja python -m robot.batch iz src)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from robot.benchmark import generate_board
+from robot.board import Board
+from robot.search import AStarSearch
+from robot.state import RobotState
+
+
+def get_cells(board):
+    return [[board.data[row][col] for col in range(board.cols)] for row in range(board.rows)]
+
+
+@pytest.mark.parametrize('rows, cols', [(12, 12), (7, 19)])
+def test_binary_board_round_trip(tmp_path, rows, cols):
+    board = generate_board('open', rows, cols, 0.2, 0)
+    file_path = str(tmp_path / 'board.brdb')
+    board.save_to_file(file_path)
+    board.save_to_file(file_path)  # snimanje preko postojeceg fajla
+    assert os.listdir(str(tmp_path)) == ['board.brdb']
+
+    loaded = Board()
+    loaded.load_from_file(file_path)
+    assert (loaded.rows, loaded.cols) == (rows, cols)
+    assert get_cells(loaded) == get_cells(board)
+    path = AStarSearch(board).search(RobotState)[0]
+    loaded_path = AStarSearch(loaded).search(RobotState)[0]
+    assert [state.position for state in loaded_path] == [state.position for state in path]
+
+
+def test_binary_board_is_writable_after_load(tmp_path):
+    board = generate_board('maze', 11, 11, 0.3, 0)
+    file_path = str(tmp_path / 'board.brdb')
+    board.save_to_file(file_path)
+    loaded = Board()
+    loaded.load_from_file(file_path)  # tabla se cita iz fajla (mmap) do prve izmene
+    loaded.set_cell(0, 0, 'w')
+    loaded.save_to_file(file_path)
+    reloaded = Board()
+    reloaded.load_from_file(file_path)
+    assert reloaded.data[0][0] == 'w'
+    assert get_cells(reloaded)[1:] == get_cells(board)[1:]
+
+
+def test_text_and_binary_boards_match(tmp_path):
+    board = generate_board('maze', 9, 13, 0.3, 2)
+    text_path, binary_path = str(tmp_path / 'board.brd'), str(tmp_path / 'board.brdb')
+    board.save_to_file(text_path)
+    board.save_to_file(binary_path)
+    from_text, from_binary = Board(), Board()
+    from_text.load_from_file(text_path)
+    from_binary.load_from_file(binary_path)
+    assert get_cells(from_text) == get_cells(from_binary) == get_cells(board)
+    assert from_text.get_fingerprint() == from_binary.get_fingerprint()
+
+
+@pytest.mark.parametrize('size', [0, 4, 20])
+def test_truncated_binary_board_is_rejected(tmp_path, size):
+    board = generate_board('open', 12, 12, 0.2, 0)
+    file_path = str(tmp_path / 'board.brdb')
+    board.save_to_file(file_path)
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    with open(file_path, 'wb') as f:
+        f.write(data[:size])
+    with pytest.raises(ValueError):
+        Board().load_from_file(file_path)
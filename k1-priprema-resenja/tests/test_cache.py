@@ -0,0 +1,148 @@
+import os
+import re
+
+import pytest
+
+from robot.benchmark import generate_board
+from robot.board import Board
+from robot.cache import PathCache, get_compiled_path, save_compiled_board, load_compiled_board, load_board
+from robot.search import BreadthFirstSearch, IterativeDepthFirstSearch, UniformCostSearch, AStarSearch
+from robot.state import RobotState
+
+
+@pytest.fixture
+def board():
+    return generate_board('open', 12, 12, 0.2, 0)
+
+
+@pytest.fixture
+def board_file(tmp_path):
+    file_path = str(tmp_path / 'board.brd')
+    generate_board('maze', 15, 15, 0.3, 0).save_to_file(file_path)
+    return file_path
+
+
+def test_path_cache_hit_restores_search(board):
+    cache = PathCache()
+    expected = AStarSearch(board).search(RobotState)
+    first = cache.search(AStarSearch(board), RobotState)
+    search = AStarSearch(board)
+    second = cache.search(search, RobotState)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second is first
+    assert isinstance(second[0], tuple) and isinstance(second[1], tuple)
+    assert [state.position for state in second[0]] == [state.position for state in expected[0]]
+    assert len(second[1]) == len(expected[1])
+    # objekat pretrage izgleda isto kao da je pretraga izvrsena
+    assert search.path is second[0]
+    assert search.processed_list is second[1]
+    assert search.processed_count == len(expected[1])
+    assert search.outcome.reason == 'found'
+
+
+def test_path_cache_hit_restores_iterations(board):
+    cache = PathCache()
+    first = IterativeDepthFirstSearch(board)
+    cache.search(first, RobotState)
+    second = IterativeDepthFirstSearch(board)
+    cache.search(second, RobotState)
+    assert cache.hits == 1
+    assert second.iterations == first.iterations
+    assert second.processed_count == first.processed_count
+
+
+def test_path_cache_misses(board, monkeypatch):
+    cache = PathCache()
+    cache.search(AStarSearch(board), RobotState)
+    cache.search(UniformCostSearch(board), RobotState)  # druga pretraga
+    cache.search(AStarSearch(board, reference=True), RobotState)  # druga podesavanja pretrage
+    monkeypatch.setattr(RobotState, 'true_distance', True)
+    cache.search(AStarSearch(board), RobotState)  # druga podesavanja stanja
+    monkeypatch.undo()
+    row, col = next((row, col) for row in range(board.rows) for col in range(board.cols)
+                    if board.data[row][col] == '.')
+    board.set_cell(row, col, 'w')
+    cache.search(AStarSearch(board), RobotState)  # drugi sadrzaj table
+    assert (cache.hits, cache.misses) == (0, 5)
+    board.set_cell(row, col, '.')
+    cache.search(AStarSearch(board), RobotState)  # isti sadrzaj kao na pocetku
+    assert (cache.hits, cache.misses) == (1, 5)
+
+
+def test_path_cache_evicts_least_recently_used(board):
+    cache = PathCache(maxsize=2)
+    for search_class in (BreadthFirstSearch, UniformCostSearch, BreadthFirstSearch, AStarSearch):
+        cache.search(search_class(board), RobotState)
+    assert len(cache) == 2
+    cache.search(BreadthFirstSearch(board), RobotState)
+    cache.search(UniformCostSearch(board), RobotState)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_compiled_board_round_trip(board_file):
+    board = load_board(board_file)  # prevodi tablu i snima kes
+    assert os.path.exists(get_compiled_path(board_file))
+    expected = bytes(board.passable)
+    path = AStarSearch(board).search(RobotState)[0]
+
+    loaded = Board()
+    loaded.load_from_file(board_file)
+    assert load_compiled_board(loaded, get_compiled_path(board_file))
+    assert bytes(loaded.passable) == expected
+    assert loaded.find_position('g') == board.find_position('g')
+    loaded_path = AStarSearch(loaded).search(RobotState)[0]
+    assert [state.position for state in loaded_path] == [state.position for state in path]
+
+
+def test_compiled_board_rejects_other_board(board_file):
+    load_board(board_file)
+    other = generate_board('maze', 15, 15, 0.3, 1)
+    assert not load_compiled_board(other, get_compiled_path(board_file))
+
+
+def corrupt_truncate(data):
+    return data[:len(data) // 2]
+
+
+def corrupt_header(data):
+    return data[:10]
+
+
+def corrupt_section(data):
+    # duzina prevedene table u opisu, bez promene velicine opisa
+    start = data.index(b'"passable": [')
+    end = data.index(b']', start)
+    return data[:start] + re.sub(rb'\d+$', lambda m: b'9' * len(m.group()), data[start:end]) + data[end:]
+
+
+def corrupt_json(data):
+    start = data.index(b'{')
+    return data[:start] + b'[' + data[start + 1:]
+
+
+@pytest.mark.parametrize('corrupt', [corrupt_truncate, corrupt_header, corrupt_section, corrupt_json])
+def test_corrupt_compiled_board_is_rejected(board_file, corrupt):
+    board = load_board(board_file)
+    expected = bytes(board.passable)
+    compiled_path = get_compiled_path(board_file)
+    with open(compiled_path, 'rb') as f:
+        data = f.read()
+    with open(compiled_path, 'wb') as f:
+        f.write(corrupt(data))
+
+    loaded = Board()
+    loaded.load_from_file(board_file)
+    assert not load_compiled_board(loaded, compiled_path)
+    # load_board prevodi tablu iznova i snima ispravan kes
+    loaded = load_board(board_file)
+    assert bytes(loaded.passable) == expected
+    fresh = Board()
+    fresh.load_from_file(board_file)
+    assert load_compiled_board(fresh, compiled_path)
+
+
+def test_save_compiled_board_leaves_no_temp_files(board, tmp_path):
+    compiled_path = str(tmp_path / 'board.brd.cache')
+    save_compiled_board(board, compiled_path)
+    save_compiled_board(board, compiled_path)
+    assert os.listdir(str(tmp_path)) == ['board.brd.cache']
@@ -0,0 +1,75 @@
+from collections import deque
+
+import pytest
+
+from robot.benchmark import generate_board
+from robot.frontier import SelectFrontier, PriorityFrontier
+from robot.search import BreadthFirstSearch, DepthFirstSearch, UniformCostSearch, GreedySearch, AStarSearch
+from robot.state import RobotState, PositionState
+
+
+class Item(object):
+    """
+    Stanje za proveru frontier-a - samo kljuc i prioritet.
+    """
+
+    def __init__(self, key, priority=0):
+        self.key = key
+        self.priority = priority
+
+    def get_state_key(self):
+        return self.key
+
+
+def test_select_frontier_remove_is_lazy():
+    frontier = SelectFrontier(deque.popleft)
+    items = [Item(key) for key in range(5)]
+    for item in items:
+        frontier.push(item)
+    frontier.remove(items[0])
+    frontier.remove(items[3])
+    assert len(frontier) == 3
+    assert [item.key for item in frontier] == [1, 2, 4]
+    assert [frontier.pop().key for _ in range(3)] == [1, 2, 4]
+    assert len(frontier) == 0
+    assert not frontier.removed
+
+
+def test_priority_frontier_order():
+    frontier = PriorityFrontier(lambda item: item.priority)
+    for key, priority in ((0, 3), (1, 1), (2, 3), (3, 1), (4, 2)):
+        frontier.push(Item(key, priority))
+    frontier.remove(Item(3))
+    assert len(frontier) == 4
+    assert frontier.peek_priority() == 1
+    # jednaki prioriteti - prednost ima ranije dodato stanje
+    assert [frontier.pop().key for _ in range(4)] == [1, 4, 0, 2]
+    assert frontier.peek_priority() == float('inf')
+    with pytest.raises(KeyError):
+        frontier.pop()
+
+
+def test_priority_frontier_push_replaces_same_key():
+    frontier = PriorityFrontier(lambda item: item.priority)
+    frontier.push(Item('a', 5))
+    frontier.push(Item('b', 3))
+    frontier.push(Item('a', 1))
+    assert len(frontier) == 2
+    assert [(item.key, item.priority) for item in (frontier.pop(), frontier.pop())] == [('a', 1), ('b', 3)]
+
+
+BOARDS = [(kind, seed) for kind in ('open', 'maze', 'checkpoint') for seed in range(4)]
+
+
+@pytest.mark.parametrize('kind, seed', BOARDS)
+@pytest.mark.parametrize('state_class', [RobotState, PositionState])
+@pytest.mark.parametrize('search_class', [BreadthFirstSearch, DepthFirstSearch, UniformCostSearch, GreedySearch,
+                                          AStarSearch])
+def test_heap_frontier_matches_reference(kind, seed, state_class, search_class):
+    board = generate_board(kind, 12, 12, 0.2, seed)
+    results = []
+    for reference in (True, False):
+        path, processed, states = search_class(board, reference=reference).search(state_class)
+        results.append(([state.position for state in path], path[-1].get_current_cost(),
+                        [state.position for state in processed]))
+    assert results[0] == results[1]
@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from robot.benchmark import generate_board
+from robot.board import ACTIONS, ALL_ACTIONS, KNIGHT_ACTIONS
+from robot.search import (BreadthFirstSearch, UniformCostSearch, AStarSearch, JumpPointSearch, DStarLiteSearch,
+                          UnsupportedStateException, get_search_class_map)
+from robot.state import RobotState, PositionState
+
+
+BOARDS = [(kind, density, seed) for kind in ('open', 'maze') for density in (0.1, 0.3) for seed in range(5)]
+
+
+def check_path(board, path, actions):
+    """
+    Putanja pocinje od robota, zavrsava se krajnjim stanjem, a svaki korak je legalan potez.
+    """
+    assert path[0].position == board.find_position('r')
+    assert path[-1].is_final_state()
+    for state, next_state in zip(path, path[1:]):
+        move = (next_state.position[0] - state.position[0], next_state.position[1] - state.position[1])
+        assert move in actions
+        assert board.data[next_state.position[0]][next_state.position[1]] != 'w'
+
+
+def get_cost(search_class, board, state_class):
+    path = search_class(board).search(state_class)[0]
+    return None if path is None else path[-1].get_current_cost()
+
+
+@pytest.mark.parametrize('kind, density, seed', BOARDS)
+def test_robot_state_searches_find_valid_paths(kind, density, seed):
+    board = generate_board(kind, 15, 15, density, seed)
+    ucs_path = UniformCostSearch(board).search(RobotState)[0]
+    bfs_path = BreadthFirstSearch(board).search(RobotState)[0]
+    astar_path = AStarSearch(board).search(RobotState)[0]
+    for path in (ucs_path, bfs_path, astar_path):
+        check_path(board, path, ACTIONS + KNIGHT_ACTIONS)
+    # heuristika RobotState (kazna za okret) nije dopustiva, pa se cena A* ne poredi sa UCS
+    assert len(bfs_path) <= min(len(ucs_path), len(astar_path))  # BFS nalazi putanju sa najmanje poteza
+
+
+@pytest.mark.parametrize('kind, density, seed', BOARDS)
+@pytest.mark.parametrize('search_class', [JumpPointSearch, DStarLiteSearch, AStarSearch])
+def test_position_searches_match_ucs(kind, density, seed, search_class):
+    board = generate_board(kind, 15, 15, density, seed)
+    path = search_class(board).search(PositionState)[0]
+    ucs_path = UniformCostSearch(board).search(PositionState)[0]
+    bfs_path = BreadthFirstSearch(board).search(PositionState)[0]
+    check_path(board, path, ALL_ACTIONS)
+    assert path[-1].get_current_cost() == ucs_path[-1].get_current_cost() == len(bfs_path) - 1
+
+
+def test_position_searches_without_solution():
+    board = generate_board('open', 10, 10, 0.0, 0)
+    goal = board.find_position('g')
+    for row in range(goal[0] - 1, goal[0] + 2):  # cilj okruzen zidovima
+        for col in range(goal[1] - 1, goal[1] + 2):
+            if 0 <= row < board.rows and 0 <= col < board.cols and board.data[row][col] == '.':
+                board.set_cell(row, col, 'w')
+    for search_class in (JumpPointSearch, DStarLiteSearch, UniformCostSearch):
+        assert search_class(board).search(PositionState)[0] is None
+
+
+@pytest.mark.parametrize('search_class', [JumpPointSearch, DStarLiteSearch])
+def test_position_searches_reject_robot_state(search_class):
+    board = generate_board('open', 10, 10, 0.1, 0)
+    assert not search_class.supports(RobotState)
+    assert search_class.supports(PositionState)
+    assert search_class not in get_search_class_map(RobotState).values()
+    with pytest.raises(UnsupportedStateException):
+        search_class(board).search(RobotState)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_dstar_lite_replans_after_wall_changes(seed):
+    board = generate_board('open', 15, 15, 0.2, seed)
+    planners = (DStarLiteSearch(board), DStarLiteSearch(board))  # dve pretrage nad istom tablom
+    rng = random.Random(seed)
+    for step in range(20):
+        for _ in range(rng.randint(1, 3)):
+            row, col = rng.randrange(board.rows), rng.randrange(board.cols)
+            if board.data[row][col] in ('.', 'w'):
+                board.set_cell(row, col, 'w' if board.data[row][col] == '.' else '.')
+        expected = get_cost(UniformCostSearch, board, PositionState)
+        for planner in planners[:1 + step % 2]:
+            path = planner.search(PositionState)[0]
+            assert (None if path is None else path[-1].get_current_cost()) == expected
+        assert board.wall_changes == []  # izmene su preuzete, evidencija ne raste
+
+
+def test_dstar_lite_follows_robot():
+    board = generate_board('maze', 15, 15, 0.3, 1)
+    planner = DStarLiteSearch(board)
+    path = planner.search(PositionState)[0]
+    while len(path) > 2:  # robot ide putanjom (do polja pre cilja), a posle svakog koraka se pretraga pokrece ponovo
+        (row, col), (next_row, next_col) = path[0].position, path[1].position
+        board.set_cell(row, col, '.')
+        board.set_cell(next_row, next_col, 'r')
+        path = planner.search(PositionState)[0]
+        assert path[-1].get_current_cost() == get_cost(UniformCostSearch, board, PositionState)
+        assert planner.processed_count <= len(path)  # ponovo se obradjuju samo celije koje su se promenile
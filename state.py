@@ -1,13 +1,70 @@
 from abc import *
-from board import Board
+from array import array
+from board import Board, ALL_ACTIONS
 import math
 
 
+# Tabele udaljenosti za celu tablu: vrednost za celiju (row, col) je na indeksu row * cols + col
+# (videti Board.get_cell_index). Racunaju se jednom, za inicijalno stanje, a ostala stanja ih samo citaju.
+
+def get_distance_table(metric, rows, cols, target):
+    """
+    Tabela udaljenosti svih celija table od ciljne pozicije, bez zidova.
+    :param metric: str - 'diagonal' ili 'euclidian'.
+    :returns: array('d')
+    """
+    target_row, target_col = target
+    table = array('d')
+    for row in range(rows):
+        d_row = abs(row - target_row)
+        if metric == 'diagonal':
+            table.extend(max(d_row, abs(col - target_col)) for col in range(cols))
+        else:
+            table.extend(math.sqrt(d_row ** 2 + (col - target_col) ** 2) for col in range(cols))
+    return table
+
+
+def get_true_distance_table(board, target, actions):
+    """
+    Tabela tacnih udaljenosti (najmanjeg broja poteza) svih celija do ciljne pozicije, sa zidovima - pretraga
+    u sirinu od cilja. Skup akcija mora biti simetrican (npr. ALL_ACTIONS), jer se od cilja ide istim potezima.
+    Za celije iz kojih se cilj ne moze dostici udaljenost je float('inf').
+    :returns: array('d')
+    """
+    table = array('d', [float('inf')]) * (board.rows * board.cols)
+    table[board.get_cell_index(*target)] = 0
+    layer = [target]
+    distance = 0
+    while layer:
+        distance += 1
+        next_layer = []
+        for position in layer:
+            for new_position, _ in board.get_legal_moves(position, actions):
+                index = board.get_cell_index(*new_position)
+                if table[index] > distance:
+                    table[index] = distance
+                    next_layer.append(new_position)
+        layer = next_layer
+    return table
+
+
 class State(object):
     """
     Apstraktna klasa koja opisuje stanje pretrage.
     """
 
+    # stanja se prave za svaki generisani cvor pretrage, pa umesto __dict__-a koriste __slots__
+    __slots__ = ('board', 'parent', 'action', 'position', 'goal_position',
+                 'checkpoints', 'teleports', 'teleport', 'fire', 'depth')
+
+    # opis stanja za pretrage koje rade samo nad pozicijama (videti Search.supports):
+    # skup akcija ako je isti u svim stanjima (None - zavisi od stanja, npr. od pokupljenih kutija)
+    actions = None
+    # da li je krajnje stanje odredjeno samo pozicijom cilja (is_final_state je position == goal_position)
+    position_goal = False
+    # da li svaki potez kosta isto (1), pa je cena putanje broj poteza - npr. cena vatre ili okreta to narusava
+    uniform_cost = False
+
     @abstractmethod
     def __init__(self, board: Board, parent=None, position=None, goal_position=None, action=None):
         """
@@ -90,6 +147,23 @@ class State(object):
         """
         pass
     
+    @classmethod
+    def get_config(cls):
+        """
+        Podesavanja klase stanja koja uticu na rezultat pretrage (deo kljuca PathCache), npr. true_distance.
+        :return: tuple
+        """
+        return ()
+
+    def get_state_key(self):
+        """
+        Kljuc stanja koji pretraga koristi u setovima i recnicima stanja.
+        Mora biti jedinstven za stanje, isto kao i unique_hash. Podrazumevano je to sam unique_hash,
+        a konkretna stanja mogu vratiti kompaktan ceo broj koji se izracuna jednom, u konstruktoru.
+        :return: int ili str
+        """
+        return self.unique_hash()
+
     @abstractmethod
     def get_cost_estimate(self):
         """
@@ -111,12 +185,36 @@ class State(object):
 
 
 class RobotState(State):
+    __slots__ = ('cost', 'key', 'fire_table', 'heuristic_table')
+
+    actions = ALL_ACTIONS  # moguci smerovi kretanja robota - dijagonalni, pa (desno, levo, dole, gore)
+    position_goal = True
+
+    # ako je True, heuristika umesto diagonal_distance koristi tacne udaljenosti na tabli, sa zidovima
+    # (videti get_true_distance_table) - mnogo bolja procena na tablama nalik lavirintu
+    true_distance = False
+
+    @classmethod
+    def get_config(cls):
+        return (cls.true_distance,)
 
     def __init__(self, board: Board, parent: State=None, position: tuple=None, goal_position: tuple=None, action: tuple=None):
         super().__init__(board, parent, position, goal_position, action)
         # posle pozivanja super konstruktora, mogu se dodavati "custom" stvari vezani za stanje
-        if parent is None: self.cost = 0
+        if parent is None:
+            self.cost = 0
+            # tabele udaljenosti za celu tablu se racunaju jednom, za inicijalno stanje
+            rows, cols = self.board.rows, self.board.cols
+            self.fire_table = get_distance_table('euclidian', rows, cols, self.fire)
+            self.heuristic_table = None
+            if None not in self.goal_position and self.true_distance:
+                self.heuristic_table = get_true_distance_table(self.board, self.goal_position, ALL_ACTIONS)
+            elif None not in self.goal_position:  # ako na tabli ima cilja
+                self.heuristic_table = get_distance_table('diagonal', rows, cols, self.goal_position)
         else: 
+            self.fire_table = self.parent.fire_table
+            self.heuristic_table = self.parent.heuristic_table
+
             action_cost = 1
             # Zadatak 2
             # Opcija 1
@@ -129,34 +227,28 @@ class RobotState(State):
 
             self.cost = self.parent.cost + action_cost
 
+        # kompaktan kljuc stanja - redni broj polja
+        self.key = self.board.get_cell_index(*self.position)
+
         # Zadatak 1
-        # cena udaljenosti od vatre
-        self.cost += 100/(self.euclidian_distance(self.position, self.fire) + 1)**2
+        # cena udaljenosti od vatre - euclidian_distance do vatre se cita iz tabele
+        self.cost += 100/(self.fire_table[self.key] + 1)**2
 
         
         
 
     def get_legal_positions(self):
-        # moguci smerovi kretanja robota (desno, levo, dole, gore)
-        actions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        # dijagonalne akcije
-        diagonal_actions = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
-
-        row, col = self.position  # trenutno pozicija
-        new_positions = []
-        for d_row, d_col in diagonal_actions + actions: # spojene akcije
-            new_row = row + d_row  # nova pozicija po redu
-            new_col = col + d_col  # nova pozicija po koloni
-            # ako nova pozicija nije van table i ako nije zid ('w'), ubaci u listu legalnih pozicija
-            if not self.board.is_out_of_bounds(new_row, new_col) and not self.board.hits_wall(new_row, new_col):
-                new_positions.append(((new_row, new_col), (d_row, d_col))) # vracamo novi polozaj i akciju
-        return new_positions
+        # legalni potezi se citaju iz prevedene table (videti Board.get_legal_moves)
+        return self.board.get_legal_moves(self.position, self.actions)  # vracamo nove polozaje i akcije
 
     def is_final_state(self):
         return self.position == self.goal_position
 
     def unique_hash(self):
         return str(self.position)
+
+    def get_state_key(self):
+        return self.key
     
     def get_cost_estimate(self):
         # Opcija 1
@@ -170,7 +262,12 @@ class RobotState(State):
 
         # Opcija 3
         # Podrazumeva da je cena dijagonalne akcije 1
-        return self.diagonal_distance(self.position, self.goal_position)
+        # return self.diagonal_distance(self.position, self.goal_position)
+
+        # Opcija 3, procitana iz tabele izracunate unapred za celu tablu
+        # (za opcije 1 i 2 tabela se pravi sa metrikom 'manhattan', odnosno 'euclidian',
+        # a sa true_distance = True u tabeli su tacne udaljenosti do cilja)
+        return self.heuristic_table[self.key]
 
     
         